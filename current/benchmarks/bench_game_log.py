@@ -0,0 +1,68 @@
+"""Cost of the game log view as the session grows.
+
+Fills a GameLogView with --entries synthetic DM responses, then times
+adding one message, streaming tokens into the newest entry and scrolling
+the whole window, and reports peak memory at each size.
+
+    QT_QPA_PLATFORM=offscreen python current/benchmarks/bench_game_log.py --entries 1000 10000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import resource
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt5.QtWidgets import QApplication
+
+WORDS = ("goblin tavern forest sword shadow bridge river dragon torch cellar merchant "
+         "guard ruins altar lantern wolf storm tower gate crypt ale map coin mist").split()
+
+
+def response(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 200)))
+
+
+def timed(app, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, nargs='+', default=[1000, 10000])
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    from ui.game_log import GameLogView
+
+    rng = random.Random(0)
+    for entries in args.entries:
+        view = GameLogView()
+        view.resize(800, 600)
+        view.log_delegate.set_entry_style('dm', '#203D72', '#334970', '#ECF0F1', 'MedievalSharp', 18)
+        view.log_delegate.set_action("Generate Scene Image", "Generating image...")
+        view.show()
+        app.processEvents()
+        model = view.log_model
+
+        transcript = [response(rng) for _ in range(entries)]
+        load_ms = timed(app, lambda: model.extend(transcript, is_dm=True))
+        append_ms = timed(app, lambda: model.append("Player: I open the door."))
+        record = model.append("", is_dm=True)
+        stream_ms = timed(app, lambda: [(model.append_text(record, "word "), app.processEvents()) for _ in range(100)]) / 100
+
+        bar = view.verticalScrollBar()
+        scroll_ms = timed(app, lambda: [(bar.setValue(bar.maximum() * step // 100), app.processEvents())
+                                        for step in range(100, -1, -1)])
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"{entries:6d} entries: load {load_ms:7.1f} ms, append {append_ms:6.1f} ms, "
+              f"stream token {stream_ms:5.2f} ms, scroll window {scroll_ms:7.1f} ms, peak RSS {peak_mb:.0f} MB")
+        view.deleteLater()
+
+
+if __name__ == '__main__':
+    main()
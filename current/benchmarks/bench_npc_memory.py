@@ -0,0 +1,95 @@
+"""Search latency of NPCMemoryStore at scale.
+
+Fills a throwaway store with random normalized vectors (no embedding model
+needed), then times batched top-k searches and checks their recall against
+an exact full matmul.
+
+    python current/benchmarks/bench_npc_memory.py --memories 100000 --dim 384
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from npc_memory import NPCMemoryStore
+
+
+class FixedEmbedder:
+    """Stand-in embedder; the benchmark writes vectors directly"""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.name = f"bench-{dim}"
+
+    def encode(self, texts):
+        raise Exception("The benchmark does not embed text")
+
+
+def build_store(path: str, count: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    # Clustered vectors, closer to real embeddings than uniform noise
+    centers = rng.standard_normal((max(1, count // 200), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), count)] + 0.7 * rng.standard_normal((count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, 'log.jsonl'), 'w', encoding='utf-8') as f:
+        for i in range(count):
+            f.write(json.dumps({'id': i, 'timestamp': '', 'type': 'event', 'text': f"memory {i}",
+                                'turn': i, 'content': None}) + '\n')
+    vectors.astype(np.float32).tofile(os.path.join(path, 'vectors.f32'))
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({'embedder': f"bench-{dim}", 'dim': dim}, f)
+    return vectors, centers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--memories', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--batch', type=int, default=2, help="Query texts per search (action + last response)")
+    parser.add_argument('-k', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    path = tempfile.mkdtemp(prefix='npc_memory_bench_')
+    try:
+        vectors, centers = build_store(path, args.memories, args.dim, rng)
+        store = NPCMemoryStore(path, FixedEmbedder(args.dim))
+
+        start = time.perf_counter()
+        store.all()
+        print(f"open        : {(time.perf_counter() - start) * 1000:8.1f} ms ({args.memories} memories)")
+
+        batches = []
+        for _ in range(args.queries):
+            queries = centers[rng.integers(0, len(centers), args.batch)] + \
+                0.7 * rng.standard_normal((args.batch, args.dim)).astype(np.float32)
+            batches.append((queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32))
+
+        store.search(batches[0], args.k)
+        start = time.perf_counter()
+        results = [store.search(queries, args.k) for queries in batches]
+        elapsed = (time.perf_counter() - start) / len(batches)
+        print(f"search      : {elapsed * 1000:8.2f} ms per batch of {args.batch} (k={args.k})")
+
+        start = time.perf_counter()
+        hits = 0
+        for queries, found in zip(batches, results):
+            exact = np.argsort(-(vectors @ queries.T).max(axis=1))[:args.k]
+            hits += len(set(int(i) for i in exact) & {entry['id'] for _, entry in found})
+        exact_time = (time.perf_counter() - start) / len(batches)
+        print(f"exact matmul: {exact_time * 1000:8.2f} ms per batch")
+        print(f"recall@{args.k}   : {hits / (args.k * len(batches)):.3f}")
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark the single-pass ResponseMatcher against the old multi-scan detection.
+
+Runs both over every DM response in saved_games/ and reports time per response
+and how often the two agree.
+
+    python current/benchmarks/bench_response_matcher.py [--repeat 200]
+"""
+import os
+import sys
+import json
+import glob
+import re
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_matcher import ResponseMatcher
+from character import parse_party
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DAMAGE_TYPES = ['fire', 'cold', 'lightning', 'poison', 'acid', 'force', 'psychic', 'necrotic',
+                'radiant', 'thunder', 'bludgeoning', 'piercing', 'slashing', 'magical']
+DAMAGE_INDICATORS = ['hits', 'strikes', 'blast', 'attack hits', 'slashes',
+                     'pierces', 'smashes', 'wounds', 'damage']
+ROLL_PATTERNS = ["roll a d20", "make a check", "ability check", "skill check", "saving throw",
+                 "roll for initiative", "attack roll", "dc ", "difficulty class",
+                 "make a strength check", "make a dexterity check", "make a constitution check",
+                 "make a intelligence check", "make a wisdom check", "make a charisma check"]
+CASUAL_ROLL_PHRASES = ["ready to roll", "roll with it", "on a roll", "let's roll", "roll out", "roll along"]
+
+
+def legacy_detect(text, player_name, npc_names):
+    """The detection process_player_action, check_for_roll_request and _parse_dc used to do"""
+    damage = any(indicator in text.lower() for indicator in DAMAGE_INDICATORS)
+    damage_type = 'magical'
+    target = None
+    if damage:
+        desc_lower = text.lower()
+        for dmg_type in DAMAGE_TYPES:
+            if dmg_type in desc_lower:
+                damage_type = dmg_type
+                break
+        if (f"hits {player_name}" in text.lower() or f"strikes {player_name}" in text.lower()
+                or "hitting you" in text.lower() or "strikes you" in text.lower()):
+            target = player_name
+        else:
+            for npc_name in npc_names:
+                if npc_name.lower() in text.lower():
+                    target = npc_name
+                    break
+
+    roll = False
+    if "?" not in text:
+        response_lower = text.lower()
+        if not any(phrase in response_lower for phrase in CASUAL_ROLL_PHRASES):
+            roll = any(pattern in response_lower for pattern in ROLL_PATTERNS)
+    match = re.search(r'\bDC\s*:?\s*(\d+)', text)
+    dc = int(match.group(1)) if match else None
+    return damage, damage_type, target, roll, dc
+
+
+def matcher_detect(matcher, text):
+    analysis = matcher.analyze(text)
+    damage_type = matcher.damage_type(analysis)
+    target = matcher.target(analysis) if analysis.damage else None
+    return analysis.damage, damage_type, target, analysis.roll_requested, analysis.dc
+
+
+def load_transcripts():
+    """(player_name, npc_names, [responses]) for every save"""
+    transcripts = []
+    for path in sorted(glob.glob(os.path.join(BASE_PATH, 'saved_games', '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            save = json.load(f)
+        state = save.get('game_state') or {}
+        party = parse_party(save.get('party') or state.get('party_members'))
+        player_name = (save.get('player_character') or {}).get('name', '')
+        npc_names = [name for name in party if name != player_name]
+        texts = list(state.get('story_progression', [])) + list(state.get('responses', []))
+        transcripts.append((player_name, npc_names, [t for t in texts if isinstance(t, str)]))
+    return transcripts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200, help="Passes over the transcripts")
+    args = parser.parse_args()
+
+    transcripts = load_transcripts()
+    total = sum(len(texts) for _, _, texts in transcripts)
+    if not total:
+        print("No saved transcripts found in saved_games/")
+        return
+
+    matchers = [ResponseMatcher(DAMAGE_TYPES, player, npcs) for player, npcs, _ in transcripts]
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for player, npcs, texts in transcripts:
+            for text in texts:
+                legacy_detect(text, player, npcs)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for matcher, (_, _, texts) in zip(matchers, transcripts):
+            for text in texts:
+                matcher_detect(matcher, text)
+    matcher_time = time.perf_counter() - start
+
+    fields = ('damage', 'damage_type', 'target', 'roll', 'dc')
+    disagreements = {field: 0 for field in fields}
+    for matcher, (player, npcs, texts) in zip(matchers, transcripts):
+        for text in texts:
+            old = legacy_detect(text, player, npcs)
+            new = matcher_detect(matcher, text)
+            for field, a, b in zip(fields, old, new):
+                if a != b:
+                    disagreements[field] += 1
+
+    runs = total * args.repeat
+    print(f"{total} responses from {len(transcripts)} saves, {args.repeat} passes")
+    print(f"legacy : {legacy_time / runs * 1e6:8.1f} us/response")
+    print(f"matcher: {matcher_time / runs * 1e6:8.1f} us/response ({legacy_time / matcher_time:.1f}x)")
+    print("disagreements: " + ", ".join(f"{field}={count}" for field, count in disagreements.items()))
+
+
+if __name__ == '__main__':
+    main()
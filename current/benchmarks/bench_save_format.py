@@ -0,0 +1,87 @@
+"""Size and load time of a long save as pretty JSON vs the packed format.
+
+Builds a synthetic save with --turns turns, writes it both ways, then
+times json.load against the packed header, recent() and load().
+
+    python current/benchmarks/bench_save_format.py --turns 2000
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import save_format
+
+WORDS = ("goblin tavern forest sword shadow bridge river dragon torch cellar merchant guard ruins altar "
+         "lantern wolf storm tower gate crypt ale map coin mist the a of and you your party").split()
+
+
+def build_save(turns: int, rng: random.Random) -> dict:
+    text = lambda n: " ".join(rng.choice(WORDS) for _ in range(n))
+    sheet = lambda name: {'name': name, 'race': 'Elf', 'class': 'Wizard', 'hp': 20, 'max_hp': 20, 'ac': 12,
+                          'equipment': ['staff', 'robe'], 'backstory': text(120), 'personality': text(20)}
+    party = {name: sheet(name) for name in ('Aria', 'Borin', 'Cass', 'Dain')}
+    responses = [text(180) for _ in range(turns)]
+    return {
+        'game_state': {
+            'turn': turns,
+            'actions': [{'player': 'Aria', 'action': text(15)} for _ in range(turns)],
+            'responses': responses,
+            'story_progression': [text(300)],
+            'history': [{'role': 'assistant', 'content': response} for response in responses[-6:]],
+            'combat_log': [{'target': 'Aria', 'damage': 4, 'attack': text(30), 'new_hp': 16, 'turn': t}
+                           for t in range(0, turns, 4)],
+            'party_members': party
+        },
+        'party': party,
+        'player_character': party['Aria'],
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def timed(fn, repeat: int):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--turns', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+    if not save_format.available():
+        sys.exit("Needs msgpack and zstandard")
+
+    path = tempfile.mkdtemp(prefix='save_format_bench_')
+    try:
+        save_data = build_save(args.turns, random.Random(0))
+        json_path = os.path.join(path, 'bench.json')
+        packed_path = os.path.join(path, 'bench' + save_format.EXTENSION)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(save_data, f, indent=2)
+        write_ms = timed(lambda: save_format.write_packed(packed_path, save_data), args.repeat)
+
+        def load_json():
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        print(f"json size     : {os.path.getsize(json_path) / 1024:9.1f} KB")
+        print(f"packed size   : {os.path.getsize(packed_path) / 1024:9.1f} KB (write {write_ms:.1f} ms)")
+        print(f"json.load     : {timed(load_json, args.repeat):9.2f} ms")
+        print(f"packed header : {timed(lambda: save_format.PackedSave(packed_path), args.repeat):9.2f} ms")
+        print(f"packed recent : {timed(lambda: save_format.PackedSave(packed_path).recent(), args.repeat):9.2f} ms")
+        print(f"packed load   : {timed(lambda: save_format.PackedSave(packed_path).load(), args.repeat):9.2f} ms")
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Indexing and query latency of SaveIndex over many saved games.
+
+Writes synthetic saves (actions, responses, story and combat log) to a
+throwaway directory, indexes them with sync(), then times searches.
+
+    python current/benchmarks/bench_save_index.py --saves 2000 --turns 60
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from save_index import SaveIndex
+
+WORDS = ("goblin tavern forest sword shadow bridge river dragon torch cellar merchant "
+         "guard ruins altar lantern wolf storm tower gate crypt ale map coin mist").split()
+QUERIES = ["hooded figure windmill", "dragon bridge", "merchant coin", "crypt altar lantern", "goblin"]
+
+
+def sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 40))) + "."
+
+
+def write_saves(path: str, count: int, turns: int, rng: random.Random):
+    for i in range(count):
+        responses = [" ".join(sentence(rng) for _ in range(4)) for _ in range(turns)]
+        if i == count // 2:
+            responses[turns // 2] += " A hooded figure waits by the old windmill."
+        save_data = {
+            'game_state': {
+                'actions': [{'player': 'Aria', 'action': sentence(rng)} for _ in range(turns)],
+                'responses': responses,
+                'story_progression': [sentence(rng)],
+                'combat_log': [{'target': 'Aria', 'damage': rng.randint(1, 12), 'attack': sentence(rng), 'turn': t}
+                               for t in range(0, turns, 5)]
+            },
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        with open(os.path.join(path, f"save{i}_{1700000000 + i}.json"), 'w', encoding='utf-8') as f:
+            json.dump(save_data, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--saves', type=int, default=2000)
+    parser.add_argument('--turns', type=int, default=60)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    path = tempfile.mkdtemp(prefix='save_index_bench_')
+    try:
+        saves_dir = os.path.join(path, 'saved_games')
+        os.makedirs(saves_dir)
+        write_saves(saves_dir, args.saves, args.turns, rng)
+        index = SaveIndex(os.path.join(path, 'cache', 'save_index.sqlite'))
+
+        start = time.perf_counter()
+        indexed = index.sync(saves_dir)
+        print(f"initial sync : {time.perf_counter() - start:8.2f} s ({indexed} saves)")
+
+        start = time.perf_counter()
+        index.sync(saves_dir)
+        print(f"no-op sync   : {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        for query in QUERIES:
+            index.search(query)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                hits = index.search(query)
+            elapsed = (time.perf_counter() - start) / args.repeat
+            top = hits[0]['snippet'][:60] if hits else '-'
+            print(f"{query:26s}: {elapsed * 1000:6.2f} ms, {len(hits)} hits, top: {top}")
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
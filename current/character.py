@@ -0,0 +1,276 @@
+import re
+from typing import Dict, List, Optional, Union
+
+
+ABILITIES = ('STR', 'DEX', 'CON', 'INT', 'WIS', 'CHA')
+
+# Header spellings the LLMs actually produce, mapped to Character fields
+_KEYS = {
+    'name': 'name',
+    'race': 'race',
+    'class': 'char_class',
+    'level': 'level',
+    'background': 'background',
+    'alignment': 'alignment',
+    'hp': 'hp',
+    'hit points': 'hp',
+    'max hp': 'max_hp',
+    'ac': 'ac',
+    'armor class': 'ac',
+    'ability scores': 'ability_scores',
+    'personality': 'personality',
+    'equipment': 'equipment',
+    'backstory': 'backstory',
+    'str': 'STR', 'strength': 'STR',
+    'dex': 'DEX', 'dexterity': 'DEX',
+    'con': 'CON', 'constitution': 'CON',
+    'int': 'INT', 'intelligence': 'INT',
+    'wis': 'WIS', 'wisdom': 'WIS',
+    'cha': 'CHA', 'charisma': 'CHA'
+}
+_SECTIONS = ('personality', 'equipment', 'backstory')
+_KEY_LINE = re.compile(r'^[-•\s]*([A-Za-z][A-Za-z ]{0,20}?)\s*:\s*(.*)$')
+_NUMBER = re.compile(r'-?\d+')
+_BULLET = re.compile(r'^[-•]\s*')
+
+
+def _first_int(value, default: Optional[int]) -> Optional[int]:
+    """First integer in value ("16 (10 + 3 DEX + 3 shield)" -> 16)"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _NUMBER.search(str(value or ''))
+    return int(match.group()) if match else default
+
+
+def _parse_hp(value, default: int = 30):
+    """Current and max HP from "25/30", "38 (5d8 + 14)" or a bare number"""
+    if isinstance(value, (int, float)):
+        return int(value), None
+    text = str(value or '').split('(')[0]
+    if '/' in text:
+        current, maximum = text.split('/', 1)
+        return _first_int(current, default), _first_int(maximum, None)
+    return _first_int(text, default), None
+
+
+class Character:
+    """A party member parsed once from the LLM character sheet (or the player dict).
+
+    to_string() writes the same sheet format the rest of the app and old saves
+    use, so parties can still be stored and shown as text.
+    """
+    __slots__ = ('name', 'race', 'char_class', 'level', 'background', 'alignment',
+                 'ability_scores', 'hp', 'max_hp', 'ac', 'personality', 'equipment',
+                 'backstory', 'image_path')
+
+    def __init__(self, name: str, race: str = 'Unknown', char_class: str = 'Unknown',
+                 level: Optional[int] = None, background: str = 'Unknown',
+                 alignment: str = 'Unknown', ability_scores: Optional[Dict[str, int]] = None,
+                 hp: int = 30, max_hp: Optional[int] = None, ac: int = 10,
+                 personality: str = '', equipment: Optional[List[str]] = None,
+                 backstory: str = '', image_path: Optional[str] = None):
+        self.name = name
+        self.race = race
+        self.char_class = char_class
+        self.level = level
+        self.background = background
+        self.alignment = alignment
+        self.ability_scores = {a: 10 for a in ABILITIES}
+        self.ability_scores.update(ability_scores or {})
+        self.hp = hp
+        self.max_hp = max_hp if max_hp is not None else hp
+        self.ac = ac
+        self.personality = personality
+        self.equipment = equipment if equipment else ['Basic adventuring gear']
+        self.backstory = backstory
+        self.image_path = image_path
+
+    @classmethod
+    def from_string(cls, text: str, fallback_name: Optional[str] = None) -> 'Character':
+        """Parse a character sheet in the generate_character format.
+
+        Tolerates markdown, bullets, inline or multi-line sections, "HP: 25/30"
+        and annotated numbers like "AC: 16 (leather + DEX)".
+        """
+        fields = {}
+        sections = {key: [] for key in _SECTIONS}
+        inline_equipment = []
+        current = None
+
+        for raw_line in (text or '').splitlines():
+            line = raw_line.replace('*', '').strip()
+            if not line:
+                continue
+            match = _KEY_LINE.match(line)
+            key = _KEYS.get(match.group(1).strip().lower()) if match else None
+            if key is None:
+                if current:
+                    sections[current].append(_BULLET.sub('', line))
+                continue
+
+            value = match.group(2).strip()
+            if key in _SECTIONS:
+                current = key
+                if value and key == 'equipment':
+                    inline_equipment.extend(item.strip() for item in value.split(','))
+                elif value:
+                    sections[key].append(value)
+            else:
+                current = None
+                if key != 'ability_scores':
+                    fields[key] = value
+
+        hp, max_hp = _parse_hp(fields.get('hp'))
+        if 'max_hp' in fields:
+            max_hp = _first_int(fields['max_hp'], max_hp)
+
+        return cls(
+            name=fields.get('name') or fallback_name or 'Unknown',
+            race=fields.get('race') or 'Unknown',
+            char_class=fields.get('char_class') or 'Unknown',
+            level=_first_int(fields.get('level'), None),
+            background=fields.get('background') or 'Unknown',
+            alignment=fields.get('alignment') or 'Unknown',
+            ability_scores={a: _first_int(fields.get(a), 10) for a in ABILITIES},
+            hp=hp,
+            max_hp=max_hp,
+            ac=_first_int(fields.get('ac'), 10),
+            personality=' '.join(sections['personality']),
+            equipment=[item for item in inline_equipment + sections['equipment'] if item],
+            backstory=' '.join(sections['backstory'])
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Character':
+        """Build from the player character dict used by CharacterTab and saves"""
+        equipment = data.get('equipment')
+        if isinstance(equipment, str):
+            equipment = [item.strip() for item in equipment.split(',')]
+        hp, max_hp = _parse_hp(data.get('hp', 30))
+        if data.get('max_hp') is not None:
+            max_hp = _first_int(data['max_hp'], max_hp)
+        scores = data.get('ability_scores') or {}
+
+        return cls(
+            name=data.get('name', 'Unknown'),
+            race=data.get('race', 'Unknown'),
+            char_class=data.get('class', 'Unknown'),
+            level=_first_int(data.get('level'), None),
+            background=data.get('background', 'Unknown'),
+            alignment=data.get('alignment', 'Unknown'),
+            ability_scores={a: _first_int(scores.get(a), 10) for a in ABILITIES},
+            hp=hp,
+            max_hp=max_hp,
+            ac=_first_int(data.get('ac'), 10),
+            personality=data.get('personality', ''),
+            equipment=[item for item in (equipment or []) if item and item.strip()],
+            backstory=data.get('backstory', ''),
+            image_path=data.get('image_path')
+        )
+
+    @classmethod
+    def from_any(cls, data: Union['Character', Dict, str], fallback_name: Optional[str] = None) -> 'Character':
+        if isinstance(data, Character):
+            return data
+        if isinstance(data, dict):
+            return cls.from_dict(data)
+        return cls.from_string(data, fallback_name=fallback_name)
+
+    def to_string(self) -> str:
+        """Character sheet text in the format generate_character asks for"""
+        level = f"\nLevel: {self.level}" if self.level is not None else ""
+        hp = f"{self.hp}/{self.max_hp}" if self.hp != self.max_hp else f"{self.hp}"
+        scores = '\n'.join(f"{a}: {self.ability_scores[a]}" for a in ABILITIES)
+        equipment = '\n'.join(f"- {item}" for item in self.equipment)
+        return f"""Name: {self.name}
+Race: {self.race}
+Class: {self.char_class}{level}
+Background: {self.background}
+Alignment: {self.alignment}
+
+Ability Scores:
+{scores}
+
+HP: {hp}
+AC: {self.ac}
+
+Personality: {self.personality}
+
+Equipment:
+{equipment}
+
+Backstory: {self.backstory}"""
+
+    def to_dict(self) -> Dict:
+        """Dict in the player character layout the UI cards read"""
+        data = {
+            'name': self.name,
+            'race': self.race,
+            'class': self.char_class,
+            'background': self.background,
+            'alignment': self.alignment,
+            'ability_scores': dict(self.ability_scores),
+            'hp': self.hp,
+            'max_hp': self.max_hp,
+            'ac': self.ac,
+            'personality': self.personality,
+            'equipment': list(self.equipment),
+            'backstory': self.backstory
+        }
+        if self.level is not None:
+            data['level'] = self.level
+        if self.image_path:
+            data['image_path'] = self.image_path
+        return data
+
+    def apply_damage(self, amount: int) -> int:
+        """Subtract damage (never below 0) and return the new HP"""
+        self.hp = max(0, self.hp - amount)
+        return self.hp
+
+    def summary(self) -> str:
+        """One-paragraph description for the adventure intro prompt"""
+        return (
+            f"{self.name} - {self.race} {self.char_class}, {self.background}, "
+            f"Personality: {self.personality}. "
+            f"Equipment: {', '.join(self.equipment)}. "
+            f"Backstory: {self.backstory}"
+        )
+
+    def profile_line(self) -> str:
+        """Static description for the cached DM prompt prefix (no current HP)"""
+        return (
+            f"{self.name}: {self.race} {self.char_class} | Max HP {self.max_hp} | "
+            f"AC {self.ac} | Equipment: {', '.join(self.equipment)}"
+        )
+
+    def status_line(self) -> str:
+        """Current HP for the per-turn part of the DM prompt"""
+        return f"{self.name}: HP {self.hp}/{self.max_hp}"
+
+    def profile_key(self) -> tuple:
+        """Everything profile_line depends on"""
+        return (self.name, self.race, self.char_class, self.max_hp, self.ac, tuple(self.equipment))
+
+    def __str__(self) -> str:
+        return self.to_string()
+
+    def __repr__(self) -> str:
+        return f"Character({self.name!r}, {self.race} {self.char_class}, HP {self.hp}/{self.max_hp})"
+
+
+def parse_party(data: Optional[Dict]) -> Dict[str, Character]:
+    """Party dict as stored in saves (sheet strings or dicts) -> Characters"""
+    return {name: Character.from_any(value, fallback_name=name) for name, value in (data or {}).items()}
+
+
+def serialize_party(party: Optional[Dict[str, Character]]) -> Dict[str, Union[str, Dict]]:
+    """Characters -> the formats saves have always used.
+
+    Sheet strings, except members with a portrait, which are stored as dicts
+    (as the portrait button used to do) so the image path survives.
+    """
+    return {
+        name: character.to_dict() if character.image_path else str(character)
+        for name, character in (party or {}).items()
+    }
@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 from ui.utils import aigirl_generator
 from dotenv import load_dotenv
+from character import Character
 
 class CharacterImageHandler:
     def __init__(self, game_manager):
@@ -13,101 +14,25 @@ class CharacterImageHandler:
             print("Warning: OPENROUTER_API_KEY not found in environment variables")
 
     def parse_character_data(self, char_data) -> dict:
-        """Parse character data from either dictionary or string format"""
-        print("\n=== Character Data Debugging ===")
-        print(f"Input data type: {type(char_data)}")
-        print("Raw character data:")
-        print(char_data)
+        """Name, race, class, backstory and equipment from a Character, dict or sheet string"""
+        if isinstance(char_data, dict) and not char_data.get('backstory') and char_data.get('name'):
+            # Cards for NPCs may carry a trimmed dict; the party member has the full sheet
+            party_member = (self.game_manager.party or {}).get(char_data['name'])
+            if party_member:
+                char_data = party_member
         
-        if isinstance(char_data, dict):
-            # Try to find backstory in multiple possible locations
-            backstory = ""
-            
-            # Check if this is a character from party data
-            if isinstance(char_data, str) or (not char_data.get('backstory') and char_data.get('name')):
-                # Try to find the character in the party data
-                party_members = self.game_manager.party or {}
-                for member_data in party_members.values():
-                    if isinstance(member_data, str):
-                        if char_data.get('name', '') in member_data:
-                            # Found the character in party data, extract backstory
-                            lines = member_data.split('\n')
-                            collecting_backstory = False
-                            for line in lines:
-                                if 'Backstory:' in line:
-                                    collecting_backstory = True
-                                    backstory += line.split('Backstory:', 1)[1].strip() + " "
-                                elif collecting_backstory and line.strip() and not any(key in line for key in ['Equipment:', 'Personality:', 'Name:']):
-                                    backstory += line.strip() + " "
-                                elif collecting_backstory and any(key in line for key in ['Equipment:', 'Personality:', 'Name:']):
-                                    collecting_backstory = False
-                            break
-            
-            # If no backstory found in party data, check direct backstory field
-            if not backstory and char_data.get('backstory'):
-                backstory = char_data['backstory']
-            
-            print(f"\nExtracted backstory: {backstory}")
-            
-            parsed_data = {
-                'name': char_data.get('name', ''),
-                'race': char_data.get('race', ''),
-                'class': char_data.get('class', ''),
-                'backstory': backstory.strip(),
-                'equipment': char_data.get('equipment', [])
-            }
-            
-            print("\nParsed Data:")
-            print(f"Name: {parsed_data['name']}")
-            print(f"Race: {parsed_data['race']}")
-            print(f"Class: {parsed_data['class']}")
-            print(f"Backstory: {parsed_data['backstory']}")
-            
-            return parsed_data
-            
-        elif isinstance(char_data, str):
-            # Handle string format with better debugging
-            print("\nParsing string format:")
-            lines = char_data.split('\n')
-            parsed_data = {
-                'name': '',
-                'race': '',
-                'class': '',
-                'backstory': '',
-                'equipment': []
-            }
-            
-            in_backstory = False
-            backstory_lines = []
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                if 'Backstory:' in line:
-                    in_backstory = True
-                    backstory_lines.append(line.split('Backstory:', 1)[1].strip())
-                elif in_backstory and not any(key in line for key in ['Name:', 'Race:', 'Class:', 'Equipment:']):
-                    backstory_lines.append(line)
-                elif 'Name:' in line:
-                    parsed_data['name'] = line.split('Name:', 1)[1].strip()
-                elif 'Race:' in line:
-                    parsed_data['race'] = line.split('Race:', 1)[1].strip()
-                elif 'Class:' in line:
-                    parsed_data['class'] = line.split('Class:', 1)[1].strip()
-            
-            parsed_data['backstory'] = ' '.join(backstory_lines)
-            
-            print("\nParsed string data:")
-            print(f"Name: {parsed_data['name']}")
-            print(f"Race: {parsed_data['race']}")
-            print(f"Class: {parsed_data['class']}")
-            print(f"Backstory: {parsed_data['backstory'][:200]}...")
-            
-            return parsed_data
+        character = Character.from_any(char_data)
+        parsed_data = {
+            'name': character.name,
+            'race': character.race,
+            'class': character.char_class,
+            'backstory': character.backstory.strip(),
+            'equipment': list(character.equipment)
+        }
         
-        return char_data
+        print(f"Parsed character for portrait: {parsed_data['name']} "
+              f"({parsed_data['race']} {parsed_data['class']})")
+        return parsed_data
 
     def determine_gender(self, char_data: dict) -> str:
         """Determine gender from character data"""
@@ -374,7 +299,10 @@ class CharacterImageHandler:
             from ui.utils.aigirl_generator import generate_image
             
             # Generate image using the imported function
-            result_path = generate_image(image_prompt, image_path)
+            with self.game_manager.metrics.call('image', 'portrait') as record:
+                result_path = generate_image(image_prompt, image_path)
+                if not result_path:
+                    record.outcome = 'failed'
             
             if result_path and os.path.exists(result_path):
                 print(f"Image successfully generated at: {result_path}")
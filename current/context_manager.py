@@ -0,0 +1,145 @@
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to a character-based estimate
+    tiktoken = None
+
+
+class TokenCounter:
+    """Per-model token counts.
+
+    Uses tiktoken when it is installed (o200k for newer OpenAI models,
+    cl100k for everything else, which is close enough for Llama/Qwen/Claude
+    budgeting), otherwise ~4 characters per token. Counts are memoized since
+    the same history messages are measured every turn.
+    """
+
+    CHARS_PER_TOKEN = 4
+    MESSAGE_OVERHEAD = 4  # role and separators per chat message
+    CACHE_SIZE = 2048
+
+    def __init__(self):
+        self._encodings = {}
+        self._cache = OrderedDict()
+
+    @staticmethod
+    def encoding_name(model: str) -> str:
+        model = (model or '').lower()
+        if re.search(r'gpt-4o|gpt-4\.1|gpt-5|o1|o3|o4', model):
+            return 'o200k_base'
+        return 'cl100k_base'
+
+    def _encoding(self, name: str):
+        if name not in self._encodings:
+            self._encodings[name] = tiktoken.get_encoding(name) if tiktoken else None
+        return self._encodings[name]
+
+    def count(self, text: str, model: str = '') -> int:
+        text = text or ''
+        name = self.encoding_name(model)
+        key = (name, text)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        encoding = self._encoding(name)
+        if encoding is not None:
+            tokens = len(encoding.encode(text, disallowed_special=()))
+        else:
+            tokens = (len(text) + self.CHARS_PER_TOKEN - 1) // self.CHARS_PER_TOKEN
+
+        self._cache[key] = tokens
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return tokens
+
+    def count_message(self, message: Dict, model: str = '') -> int:
+        content = message.get('content') or ''
+        if isinstance(content, list):
+            content = ''.join(part.get('text', '') for part in content)
+        return self.count(content, model) + self.MESSAGE_OVERHEAD
+
+    def count_messages(self, messages: List[Dict], model: str = '') -> int:
+        return sum(self.count_message(message, model) for message in messages)
+
+
+class ContextManager:
+    """Fits a DM request into a token budget, however long the session runs.
+
+    Priority: the cached prefix and this turn's message always go in, then
+    the story summary, the newest min_recent_messages of history, retrieved
+    facts, and finally as much further history as still fits. Older history
+    is dropped here; GameManager folds it into the rolling summary.
+    """
+
+    DEFAULT_BUDGET = 3000
+    DEFAULT_MIN_RECENT = 2
+
+    def __init__(self, config: Optional[dict] = None, counter: Optional[TokenCounter] = None,
+                 model_catalog=None):
+        config = config or {}
+        self.budget_tokens = int(config.get('budget_tokens', self.DEFAULT_BUDGET))
+        self.min_recent_messages = int(config.get('min_recent_messages', self.DEFAULT_MIN_RECENT))
+        self.counter = counter or TokenCounter()
+        self.model_catalog = model_catalog
+
+    def budget_for(self, model: str, reply_tokens: int = 1000) -> int:
+        """Configured budget, capped by the model's context window less the reply"""
+        budget = self.budget_tokens
+        entry = self.model_catalog.get(model) if self.model_catalog else None
+        context_length = entry.get('context_length') if entry else None
+        if context_length:
+            budget = min(budget, int(context_length) - reply_tokens)
+        return max(budget, 0)
+
+    def build(self, prefix: List[Dict], user_message: Dict, history: List[Dict],
+              summary: Optional[str] = None, facts: Optional[List[str]] = None,
+              model: str = '', reply_tokens: int = 1000) -> List[Dict]:
+        budget = self.budget_for(model, reply_tokens)
+        count = lambda message: self.counter.count_message(message, model)
+
+        used = self.counter.count_messages(prefix, model) + count(user_message)
+        if used > budget:
+            print(f"DM prompt prefix alone ({used} tokens) exceeds the {budget} token budget")
+
+        summary_messages = []
+        if summary:
+            message = {"role": "system", "content": f"Story so far:\n{summary}"}
+            if used + count(message) <= budget:
+                summary_messages.append(message)
+                used += count(message)
+
+        # Newest history first; the first min_recent_messages take priority over facts
+        recent = []
+        remaining = list(reversed(history))
+        while remaining and len(recent) < self.min_recent_messages:
+            message = remaining[0]
+            if used + count(message) > budget:
+                break
+            recent.append(remaining.pop(0))
+            used += count(message)
+
+        fact_messages = []
+        if facts:
+            lines = []
+            for fact in facts:
+                line = f"- {fact}"
+                tokens = self.counter.count(line, model) + 1
+                if used + tokens + TokenCounter.MESSAGE_OVERHEAD > budget:
+                    break
+                lines.append(line)
+                used += tokens
+            if lines:
+                fact_messages.append({"role": "system", "content": "Relevant earlier events:\n" + "\n".join(lines)})
+                used += TokenCounter.MESSAGE_OVERHEAD
+
+        for message in remaining:
+            if used + count(message) > budget:
+                break
+            recent.append(message)
+            used += count(message)
+
+        return prefix + summary_messages + list(reversed(recent)) + fact_messages + [user_message]
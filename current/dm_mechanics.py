@@ -0,0 +1,228 @@
+import re
+import json
+from typing import Dict, Iterable, List, Optional
+
+
+MECHANICS_INSTRUCTIONS = """
+
+Reply with a JSON object only:
+- "narrative": everything you say to the players, as plain text
+- "damage": one entry per hit that actually lands this turn, with "target" (a party member's name), "amount" (hit points lost) and "type"
+- "roll_request": {"skill": ..., "dc": ...} when you ask the player for a check or saving throw, otherwise null
+- "npc_actions": one entry per party NPC that acts this turn, with "npc" and "action"
+"""
+
+_NARRATIVE_START = re.compile(r'"narrative"\s*:\s*"')
+_FENCE = re.compile(r'^```[a-zA-Z]*\s*|\s*```$')
+
+
+def response_format(damage_types: Iterable[str], strict: bool = True) -> Dict:
+    """OpenRouter response_format for a DM turn.
+
+    strict=False asks for plain JSON mode, for models that support
+    response_format but not JSON schemas.
+    """
+    if not strict:
+        return {"type": "json_object"}
+
+    def entry(properties: Dict) -> Dict:
+        return {
+            "type": "object",
+            "properties": properties,
+            "required": list(properties),
+            "additionalProperties": False
+        }
+
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "dm_turn",
+            "strict": True,
+            # narrative first so it is the first thing the stream parser sees
+            "schema": entry({
+                "narrative": {"type": "string"},
+                "damage": {"type": "array", "items": entry({
+                    "target": {"type": "string"},
+                    "amount": {"type": "integer"},
+                    "type": {"type": "string", "enum": list(damage_types)}
+                })},
+                "roll_request": {
+                    "anyOf": [
+                        entry({"skill": {"type": "string"}, "dc": {"type": "integer"}}),
+                        {"type": "null"}
+                    ]
+                },
+                "npc_actions": {"type": "array", "items": entry({
+                    "npc": {"type": "string"},
+                    "action": {"type": "string"}
+                })}
+            })
+        }
+    }
+
+
+def _as_int(value) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class DamageEvent:
+    __slots__ = ('target', 'amount', 'type')
+
+    def __init__(self, target: str, amount: int, type: str):
+        self.target = target
+        self.amount = amount
+        self.type = type
+
+    def __repr__(self) -> str:
+        return f"DamageEvent({self.target!r}, {self.amount}, {self.type!r})"
+
+
+class DMTurn:
+    """A DM response: the narrative shown to the player plus its mechanics.
+
+    structured is False when the model answered in prose (no JSON support,
+    or it ignored the schema); callers then fall back to the keyword
+    heuristics on narrative.
+    """
+    __slots__ = ('narrative', 'damage', 'roll_request', 'npc_actions', 'structured')
+
+    def __init__(self, narrative: str, damage: Optional[List[DamageEvent]] = None,
+                 roll_request: Optional[Dict] = None, npc_actions: Optional[List[Dict]] = None,
+                 structured: bool = False):
+        self.narrative = narrative
+        self.damage = damage or []
+        self.roll_request = roll_request
+        self.npc_actions = npc_actions or []
+        self.structured = structured
+
+    @property
+    def dc(self) -> Optional[int]:
+        return self.roll_request['dc'] if self.roll_request else None
+
+    @classmethod
+    def parse(cls, text: str) -> 'DMTurn':
+        """Tolerant parse of a DM reply.
+
+        Accepts bare JSON, JSON in a code fence or surrounded by chatter, and
+        truncated JSON (the narrative streamed so far is kept). Anything else
+        is treated as a prose reply.
+        """
+        text = (text or '').strip()
+        data = None
+        candidate = _FENCE.sub('', text)
+        start, end = candidate.find('{'), candidate.rfind('}')
+        for attempt in (candidate, candidate[start:end + 1] if 0 <= start < end else None):
+            if not attempt:
+                continue
+            try:
+                data = json.loads(attempt)
+                break
+            except ValueError:
+                continue
+
+        if not isinstance(data, dict) or not isinstance(data.get('narrative'), str):
+            if start != -1:
+                # Cut off mid-object (e.g. max_tokens): salvage the narrative
+                parser = NarrativeStreamParser()
+                narrative = parser.feed(candidate)
+                if parser.found:
+                    return cls(narrative)
+            return cls(text)
+
+        damage = []
+        for hit in data.get('damage') or []:
+            if not isinstance(hit, dict):
+                continue
+            amount = _as_int(hit.get('amount'))
+            if hit.get('target') and amount is not None and amount > 0:
+                damage.append(DamageEvent(str(hit['target']), amount, str(hit.get('type') or '').lower()))
+
+        roll_request = None
+        roll = data.get('roll_request')
+        if isinstance(roll, dict) and _as_int(roll.get('dc')) is not None:
+            roll_request = {'skill': str(roll.get('skill') or ''), 'dc': _as_int(roll['dc'])}
+
+        npc_actions = []
+        for entry in data.get('npc_actions') or []:
+            if isinstance(entry, dict) and entry.get('npc') and entry.get('action'):
+                npc_actions.append({'npc': str(entry['npc']), 'action': str(entry['action'])})
+
+        return cls(data['narrative'], damage, roll_request, npc_actions, structured=True)
+
+
+class NarrativeStreamParser:
+    """Pulls the "narrative" string out of a streamed JSON reply as it arrives.
+
+    feed() takes raw content deltas and returns the newly decoded narrative
+    text, so the UI can show the story while the mechanics are still
+    streaming. A reply that does not start with "{" is passed through as
+    prose.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.mode = None  # None until decided, then 'json' or 'prose'
+        self.found = False
+        self.done = False
+        self.pos = 0
+
+    def feed(self, delta: str) -> str:
+        self.buffer += delta
+        if self.mode is None:
+            head = _FENCE.sub('', self.buffer.lstrip())
+            if not head or head.startswith('`'):
+                return ''
+            self.mode = 'json' if head.startswith('{') else 'prose'
+            if self.mode == 'prose':
+                return self.buffer
+        elif self.mode == 'prose':
+            return delta
+
+        if self.done:
+            return ''
+        if not self.found:
+            match = _NARRATIVE_START.search(self.buffer)
+            if not match:
+                return ''
+            self.found = True
+            self.pos = match.end()
+        return self._decode()
+
+    def _decode(self) -> str:
+        """Decode the narrative up to the last complete escape sequence"""
+        buffer = self.buffer
+        i = self.pos
+        end = len(buffer)
+        safe = i
+        while i < end:
+            char = buffer[i]
+            if char == '"':
+                self.done = True
+                break
+            if char != '\\':
+                i += 1
+                safe = i
+                continue
+            if i + 1 >= end:
+                break
+            if buffer[i + 1] != 'u':
+                i += 2
+                safe = i
+                continue
+            if i + 6 > end:
+                break
+            # A high surrogate needs its low half before it can be decoded
+            if buffer[i + 2:i + 4].lower() in ('d8', 'd9', 'da', 'db'):
+                if i + 12 > end:
+                    break
+                i += 12
+            else:
+                i += 6
+            safe = i
+
+        raw = buffer[self.pos:safe]
+        self.pos = safe + (1 if self.done else 0)
+        return json.loads(f'"{raw}"') if raw else ''
@@ -0,0 +1,159 @@
+import re
+import json
+import random
+from typing import Callable, Dict, Iterable, List, Optional
+
+from dm_mechanics import DamageEvent
+
+
+def _function(name: str, description: str, properties: Dict, required: List[str]) -> Dict:
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {"type": "object", "properties": properties, "required": required}
+        }
+    }
+
+
+DM_TOOLS = [
+    _function(
+        "roll",
+        "Roll dice for NPC attacks, checks and damage instead of inventing numbers.",
+        {"dice_expr": {"type": "string", "description": 'Dice expression such as "1d20+5" or "2d6+3"'}},
+        ["dice_expr"]
+    ),
+    _function(
+        "apply_damage",
+        "Deal damage to a party member. Call once per hit that lands.",
+        {
+            "target": {"type": "string", "description": "Party member name"},
+            "amount": {"type": "integer", "description": "Hit points lost"},
+            "type": {"type": "string", "description": "Damage type, e.g. fire or slashing"}
+        },
+        ["target", "amount"]
+    ),
+    _function(
+        "get_party_status",
+        "Current HP, AC and equipment of every party member.",
+        {},
+        []
+    )
+]
+
+MAX_DICE = 100
+MAX_SIDES = 1000
+_DICE_EXPR = re.compile(r'[+-]?(\d*d\d+|\d+)([+-](\d*d\d+|\d+))*')
+_DICE_TERM = re.compile(r'([+-]?)(?:(\d*)d(\d+)|(\d+))')
+
+
+def roll_dice(expr: str, rng: random.Random = random) -> Dict:
+    """Roll a dice expression like "2d6+3" or "d20 - 1"; raises ValueError if malformed"""
+    text = str(expr or '').replace(' ', '').lower()
+    if not _DICE_EXPR.fullmatch(text):
+        raise ValueError(f"Bad dice expression {expr!r}, expected something like 2d6+3")
+
+    total = 0
+    rolls = []
+    for sign, count, sides, constant in _DICE_TERM.findall(text):
+        factor = -1 if sign == '-' else 1
+        if constant:
+            total += factor * int(constant)
+            continue
+        count = int(count or 1)
+        sides = int(sides)
+        if not 1 <= count <= MAX_DICE or not 1 <= sides <= MAX_SIDES:
+            raise ValueError(f"Dice out of range in {expr!r}")
+        results = [rng.randint(1, sides) for _ in range(count)]
+        rolls.extend(factor * r for r in results)
+        total += factor * sum(results)
+    return {'expr': text, 'rolls': rolls, 'total': total}
+
+
+class DMToolbox:
+    """Runs the DM's tool calls for one turn against the party.
+
+    Damage is staged rather than applied, so a cancelled or speculative turn
+    leaves the party untouched; GameManager applies it when the turn is
+    committed. get_party_status already reflects the staged damage.
+    """
+
+    def __init__(self, party: Dict, resolve_target: Callable[[str], Optional[str]],
+                 damage_types: Iterable[str], metrics, player_name: Optional[str] = None,
+                 rng: random.Random = random):
+        self.party = party
+        self.resolve_target = resolve_target
+        self.damage_types = set(damage_types)
+        self.metrics = metrics
+        self.player_name = player_name
+        self.rng = rng
+        self.damage: List[DamageEvent] = []
+        self.rolls: List[Dict] = []
+        self.handlers = {
+            'roll': self.roll,
+            'apply_damage': self.apply_damage,
+            'get_party_status': self.get_party_status
+        }
+
+    def execute(self, name: str, arguments) -> str:
+        """Run one tool call and return its JSON result for the tool message.
+
+        Bad calls are reported back to the model as {"error": ...} so it can
+        correct itself on the next round.
+        """
+        with self.metrics.call('tool', name or 'unknown') as record:
+            handler = self.handlers.get(name)
+            if handler is None:
+                record.outcome = 'unknown_tool'
+                return json.dumps({'error': f"Unknown tool {name}"})
+            try:
+                kwargs = json.loads(arguments or '{}') if isinstance(arguments, str) else dict(arguments or {})
+                result = handler(**kwargs)
+            except (TypeError, ValueError) as e:
+                record.outcome = 'bad_arguments'
+                return json.dumps({'error': str(e)})
+            return json.dumps(result)
+
+    def current_hp(self, name: str) -> int:
+        staged = sum(event.amount for event in self.damage if event.target == name)
+        return max(0, self.party[name].hp - staged)
+
+    def roll(self, dice_expr: str) -> Dict:
+        result = roll_dice(dice_expr, self.rng)
+        self.rolls.append(result)
+        return result
+
+    def apply_damage(self, target: str, amount, type: str = 'magical') -> Dict:
+        target_name = self.resolve_target(str(target))
+        if not target_name:
+            raise ValueError(f"Unknown target {target!r}; party members are {', '.join(self.party)}")
+        amount = int(amount)
+        if amount < 0:
+            raise ValueError("Damage amount must not be negative")
+        damage_type = str(type or '').lower()
+        if damage_type not in self.damage_types:
+            damage_type = 'magical'
+        self.damage.append(DamageEvent(target_name, amount, damage_type))
+        return {
+            'target': target_name,
+            'damage': amount,
+            'type': damage_type,
+            'hp': self.current_hp(target_name),
+            'max_hp': self.party[target_name].max_hp
+        }
+
+    def get_party_status(self) -> Dict:
+        return {'party': [
+            {
+                'name': name,
+                'player': name == self.player_name,
+                'race': character.race,
+                'class': character.char_class,
+                'hp': self.current_hp(name),
+                'max_hp': character.max_hp,
+                'ac': character.ac,
+                'equipment': list(character.equipment)
+            }
+            for name, character in self.party.items()
+        ]}
@@ -0,0 +1,249 @@
+import os
+import copy
+import json
+import threading
+from typing import Dict, List, Optional
+
+import save_format
+
+
+class GameJournal:
+    """Append-only journal of one adventure, with periodic snapshots.
+
+    The journaled state is {'game_state', 'party', 'player_character'}
+    (party as Character.to_dict() dicts, no party_members duplicate).
+    record() diffs the state against what was last journaled and appends
+    one JSON line per change to journal.jsonl:
+
+        append  a new item on a game_state list (action, response, combat
+                log entry, history message, ...)
+        trim    items dropped from the front of a list (capped history)
+        set/del any other game_state value that changed
+        hp      a party member's HP changed
+        member  a party member added, replaced or (data null) removed
+        player  the player character changed
+
+    Every snapshot_every records the whole state is written compactly to
+    snapshot_<seq>.json along with the journal byte offset it covers.
+    restore(seq) loads the newest snapshot at or before seq and replays
+    the tail, so a save is just (journal, seq) and a crash loses at most
+    the turn in progress.
+    """
+
+    LOG_FILENAME = 'journal.jsonl'
+    DEFAULT_SNAPSHOT_EVERY = 200
+
+    def __init__(self, path: str, snapshot_every: int = DEFAULT_SNAPSHOT_EVERY):
+        self.path = path
+        self.id = os.path.basename(path)
+        self.log_path = os.path.join(path, self.LOG_FILENAME)
+        self.snapshot_every = max(1, int(snapshot_every))
+        self.lock = threading.Lock()
+        self.seq = 0
+        self._offset = 0
+        self._last = None
+        self._since_snapshot = 0
+
+    @classmethod
+    def create(cls, path: str, state: Dict, snapshot_every: int = DEFAULT_SNAPSHOT_EVERY) -> 'GameJournal':
+        """New journal whose first snapshot is state"""
+        os.makedirs(path, exist_ok=True)
+        journal = cls(path, snapshot_every)
+        open(journal.log_path, 'wb').close()
+        journal._write_snapshot(state)
+        journal._last = cls._baseline(state)
+        return journal
+
+    @classmethod
+    def open(cls, path: str, snapshot_every: int = DEFAULT_SNAPSHOT_EVERY) -> 'GameJournal':
+        """Reopen a journal for appending, positioned after its last complete record"""
+        journal = cls(path, snapshot_every)
+        state, seq, offset, snapshot_seq = journal._replay(None, repair=True)
+        journal.seq = seq
+        journal._offset = offset
+        journal._since_snapshot = seq - snapshot_seq
+        journal._last = cls._baseline(state)
+        return journal
+
+    # Snapshots and replay
+
+    def _snapshots(self) -> List[int]:
+        return sorted(
+            int(name[len('snapshot_'):-len('.json')])
+            for name in os.listdir(self.path)
+            if name.startswith('snapshot_') and name.endswith('.json')
+        )
+
+    def _write_snapshot(self, state: Dict):
+        path = os.path.join(self.path, f"snapshot_{self.seq:08d}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'seq': self.seq, 'offset': self._offset, 'state': state}, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        self._since_snapshot = 0
+
+    def _replay(self, seq: Optional[int], repair: bool = False):
+        """State at seq (None = latest) -> (state, seq reached, log offset, snapshot seq)"""
+        candidates = [s for s in self._snapshots() if seq is None or s <= seq]
+        if not candidates:
+            raise Exception(f"Journal {self.id} has no snapshot at or before record {seq}")
+        with open(os.path.join(self.path, f"snapshot_{candidates[-1]:08d}.json"), 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+
+        state = snapshot['state']
+        reached = snapshot['seq']
+        offset = snapshot['offset']
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    if repair:
+                        # A torn final line from a crash: cut it so the next append starts clean
+                        with open(self.log_path, 'r+b') as log:
+                            log.truncate(offset)
+                    break
+                if seq is not None and record['seq'] > seq:
+                    break
+                self._apply(state, record)
+                reached = record['seq']
+                offset += len(line)
+        return state, reached, offset, snapshot['seq']
+
+    def restore(self, seq: Optional[int] = None) -> Dict:
+        """State as of record seq (None = the latest record)"""
+        with self.lock:
+            state, reached, _, _ = self._replay(seq)
+        if seq is not None and reached != seq:
+            raise Exception(f"Journal {self.id} ends at record {reached}, before {seq}")
+        return state
+
+    @staticmethod
+    def _apply(state: Dict, record: Dict):
+        op = record['op']
+        game_state = state['game_state']
+        if op == 'append':
+            game_state.setdefault(record['key'], []).append(record['value'])
+        elif op == 'trim':
+            del game_state[record['key']][:record['count']]
+        elif op == 'set':
+            game_state[record['key']] = record['value']
+        elif op == 'del':
+            game_state.pop(record['key'], None)
+        elif op == 'hp':
+            state['party'][record['name']]['hp'] = record['hp']
+        elif op == 'member':
+            if record['data'] is None:
+                state['party'].pop(record['name'], None)
+            else:
+                state['party'][record['name']] = record['data']
+        elif op == 'player':
+            state['player_character'] = record['data']
+        else:
+            raise Exception(f"Unknown journal record {op}")
+
+    # Recording
+
+    @staticmethod
+    def _baseline(state: Dict) -> Dict:
+        """Copy of state to diff the next record() against.
+
+        Lists are copied shallowly (their items are not edited once
+        appended), so comparing them is mostly identity checks.
+        """
+        game_state = {
+            key: list(value) if isinstance(value, list) else copy.deepcopy(value)
+            for key, value in state['game_state'].items()
+        }
+        return {
+            'game_state': game_state,
+            'party': copy.deepcopy(state['party']),
+            'player_character': copy.deepcopy(state['player_character'])
+        }
+
+    @staticmethod
+    def _list_delta(key: str, old: List, new: List) -> List[Dict]:
+        if new[:len(old)] == old:
+            return [{'op': 'append', 'key': key, 'value': value} for value in new[len(old):]]
+        # Dropped from the front, then maybe appended to
+        if old and new and new[0] in old:
+            trimmed = old.index(new[0])
+            kept = len(old) - trimmed
+            if new[:kept] == old[trimmed:]:
+                return [{'op': 'trim', 'key': key, 'count': trimmed}] + \
+                    [{'op': 'append', 'key': key, 'value': value} for value in new[kept:]]
+        return [{'op': 'set', 'key': key, 'value': new}]
+
+    def _diff(self, state: Dict) -> List[Dict]:
+        old, records = self._last, []
+        old_game, game = old['game_state'], state['game_state']
+        for key, value in game.items():
+            if key not in old_game:
+                records.append({'op': 'set', 'key': key, 'value': value})
+            elif isinstance(value, list) and isinstance(old_game[key], list):
+                records.extend(self._list_delta(key, old_game[key], value))
+            elif value != old_game[key]:
+                records.append({'op': 'set', 'key': key, 'value': value})
+        records.extend({'op': 'del', 'key': key} for key in old_game if key not in game)
+
+        for name, data in state['party'].items():
+            previous = old['party'].get(name)
+            if previous == data:
+                continue
+            if previous is not None and dict(previous, hp=data.get('hp')) == data:
+                records.append({'op': 'hp', 'name': name, 'hp': data.get('hp')})
+            else:
+                records.append({'op': 'member', 'name': name, 'data': data})
+        records.extend({'op': 'member', 'name': name, 'data': None} for name in old['party'] if name not in state['party'])
+
+        if state['player_character'] != old['player_character']:
+            records.append({'op': 'player', 'data': state['player_character']})
+        return records
+
+    def record(self, state: Dict) -> int:
+        """Append whatever changed since the last record(); returns the journal's seq"""
+        with self.lock:
+            records = self._diff(state)
+            if not records:
+                return self.seq
+            lines = []
+            for record in records:
+                self.seq += 1
+                lines.append(json.dumps(dict(record, seq=self.seq), separators=(',', ':')) + '\n')
+            data = ''.join(lines).encode('utf-8')
+            with open(self.log_path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._offset += len(data)
+            self._since_snapshot += len(records)
+            if self._since_snapshot >= self.snapshot_every:
+                self._write_snapshot(state)
+            self._last = self._baseline(state)
+            return self.seq
+
+
+def load_save_data(filepath: str) -> Dict:
+    """A save file as the classic save dict: full JSON, packed, or a journal save.
+
+    Journal saves are {"format": "journal", "journal": <id>, "seq": N, ...}
+    pointing into saved_games/journals/<id>.
+    """
+    if filepath.endswith(save_format.EXTENSION):
+        return save_format.PackedSave(filepath).load()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        save_data = json.load(f)
+    if save_data.get('format') != 'journal':
+        return save_data
+
+    journal_path = os.path.join(os.path.dirname(filepath), 'journals', save_data['journal'])
+    state = GameJournal(journal_path).restore(save_data.get('seq'))
+    return {
+        'game_state': state['game_state'],
+        'party': state['party'],
+        'player_character': state['player_character'],
+        'timestamp': save_data.get('timestamp', ''),
+        'journal': save_data['journal'],
+        'seq': save_data.get('seq')
+    }
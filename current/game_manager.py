@@ -1,13 +1,33 @@
 import os
+import re
 import json
-import requests
 import time  # Add this import
-from typing import Dict, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from npc_manager import NPCManager
+from openrouter_client import OpenRouterClient
+from response_cache import ResponseCache
+import save_format
+from game_journal import GameJournal, load_save_data
+from save_catalog import SaveCatalog
+from save_index import SaveIndex
+from resilience import ModelHealth, is_model_failure
+from metrics import MetricsRecorder, note_queue_wait
+from model_catalog import ModelCatalog
+from character import Character, parse_party, serialize_party
+from response_matcher import ResponseAnalysis, ResponseMatcher
+from dm_mechanics import MECHANICS_INSTRUCTIONS, DMTurn, NarrativeStreamParser, response_format
+from dm_tools import DM_TOOLS, DMToolbox
+from context_manager import ContextManager
 from fantasy_names import get_random_name
 import random
 from tts_manager import TTSManager  # Add this import
 
+class TurnCancelled(Exception):
+    """Raised inside a turn when the player cancels it before the DM replies"""
+
+
 class GameManager:
     # Add D&D constants
     DND_RACES = ["Human", "Elf", "Dwarf", "Halfling", "Gnome", "Half-Elf", "Half-Orc", "Dragonborn", "Tiefling"]
@@ -33,17 +53,43 @@ class GameManager:
         'magical': (6, 12)      # d6 to d12 damage
     }
 
+    # The one autosave slot in saved_games; it follows whichever adventure is being played
+    AUTOSAVE_FILENAME = 'Autosave_latest.json'
+
+    DM_SYSTEM_PROMPT = """You are the Dungeon Master for D&D 5e.
+You are controlling the NPCs in the party. The player is controlling only their character.
+Your response must not contain any asterisks, markdown, or special formatting.
+Write naturally as if speaking to the players.
+
+1. Acknowledge the player's action
+2. If the action requires a check or roll, specify:
+   "Suggest a [skill] check - DC [number]" or
+   "Suggest a [type] saving throw - DC [number]" or
+   "Suggest an attack roll" but do not force the player to roll.
+3. Only describe the outcome after a roll is made
+4. Use game mechanics properly (skill checks, saving throws, etc.)
+5. End with a prompt for the next action. Do not ask the NPCs what they want to do. You are controlling them.
+6. Do not ask the player to roll for NPC checks. Perform NPC rolls yourself automatically.
+
+Keep response under 250 words. Make sure to include a roll at least every 3 turns."""
+
+    # Providers that only cache up to an explicit cache_control breakpoint
+    CACHE_CONTROL_MODELS = ('anthropic/', 'google/gemini')
+
     def __init__(self):
         self.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.characters_dir = os.path.join(self.base_path, 'saved_characters')
         self.npcs_dir = os.path.join(self.base_path, 'npc_portraits')  # Add this line
         self.parties_dir = os.path.join(self.base_path, 'saved_parties')  # Add this line
         self.config_file = os.path.join(self.base_path, 'config.json')
-        self.npc_manager = NPCManager(self.base_path)
         
         self.game_state = None
         self.party = None
         self.player_character = None
+        # Called as listener(name, field, value) when a party member's 'hp' ((hp, max_hp)),
+        # 'ac', 'equipment' or 'portrait' changes, and as listener(None, 'party', None) when
+        # the roster is replaced. Listeners may be called from worker threads.
+        self.party_listeners: List[Callable[[Optional[str], str, object], None]] = []
         
         # Create directories if they don't exist
         os.makedirs(self.characters_dir, exist_ok=True)
@@ -53,11 +99,79 @@ class GameManager:
         # Load config first
         self.load_config()
         
+        # NPC model preferences and embedding-backed NPC memories
+        npc_memory_config = self.config.get('npc_memory', {})
+        self.npc_manager = NPCManager(self.base_path, npc_memory_config)
+        self.npc_memory_enabled = npc_memory_config.get('enabled', True)
+        self.npc_memory_k = int(npc_memory_config.get('top_k', 3))
+        self._memory_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='npc-memory')
+        if self.npc_memory_enabled:
+            # Loading the embedding model takes seconds; do it before the first turn needs it
+            self._memory_executor.submit(self.npc_manager.get_embedder().warm_up)
+        
         # Now we can initialize dm_model from config
         self.dm_model = self.config.get('last_dm_model', '')
+
+        # Per-call latency/token metrics for LLM, image and TTS calls
+        self.metrics = MetricsRecorder(
+            os.path.join(self.base_path, 'metrics'),
+            self.config.get('metrics', {})
+        )
+        
+        # Shared pooled client for all OpenRouter traffic, backed by the response cache
+        self.response_cache = ResponseCache(
+            os.path.join(self.base_path, 'cache'),
+            self.config.get('response_cache', {})
+        )
+        self.api_client = OpenRouterClient(self.config, cache=self.response_cache, metrics=self.metrics)
+        
+        # Circuit breakers survive restarts so a dead model isn't tried first
+        self.model_health = ModelHealth(
+            os.path.join(self.base_path, 'cache', 'model_health.json'),
+            self.config.get('openrouter', {})
+        )
+        
+        # Last known /models listing; tabs read it instantly and refresh it off-thread
+        self.model_catalog = ModelCatalog(
+            os.path.join(self.base_path, 'cache', 'model_catalog.json'),
+            self.api_client,
+            self.config.get('model_catalog', {})
+        )
+        self.stream_responses = self.config.get('openrouter', {}).get('stream', True)
+        self._turn_cancelled = threading.Event()
+        
+        # Both outcomes of a pending check are generated while the player rolls
+        self.speculative_rolls = self.config.get('openrouter', {}).get('speculative_rolls', True)
+        self._speculation_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='roll-outcome')
+        self._speculation = None
+        
+        # DM replies as JSON (narrative + mechanics) where the model supports it
+        self.structured_mechanics = self.config.get('openrouter', {}).get('structured_mechanics', False)
+        
+        # Or let the DM roll dice and deal damage through local tool calls
+        self.tool_calling = self.config.get('openrouter', {}).get('tool_calling', False)
+        self.max_tool_rounds = int(self.config.get('openrouter', {}).get('max_tool_rounds', 4))
+        
+        # Stable system/party prefix for DM calls
+        self._dm_prefix_messages = None
+        self._dm_prefix_key = None
+        
+        # Token budget for DM prompts; older turns are folded into a rolling summary
+        context_config = self.config.get('context', {})
+        self.context = ContextManager(context_config, model_catalog=self.model_catalog)
+        self.summary_every_turns = int(context_config.get('summary_every_turns', 4))
+        self.keep_recent_messages = int(context_config.get('keep_recent_messages', 6))
+        self.max_summary_chunks = int(context_config.get('max_summary_chunks', 4))
+        self.max_facts = int(context_config.get('max_facts', 3))
+        self._summary_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='story-summary')
+        self._summary_job = None
+        
+        # Compiled keyword matcher for DM responses; rebuilt when the party changes
+        self._matcher = None
+        self._matcher_key = None
         
         # Initialize TTS manager last
-        self.tts_manager = TTSManager(self.config)
+        self.tts_manager = TTSManager(self.config, metrics=self.metrics)
 
         # Initialize settings
         self.settings = {
@@ -68,6 +182,29 @@ class GameManager:
 
         self.saves_dir = os.path.join(self.base_path, 'saved_games')
         os.makedirs(self.saves_dir, exist_ok=True)
+        self.save_catalog = SaveCatalog(self.saves_dir)
+
+        # Each adventure appends its turns to a journal; saves point into it
+        journal_config = self.config.get('journal', {})
+        self.journal_enabled = journal_config.get('enabled', True)
+        self.autosave = journal_config.get('autosave', True)
+        self.journal_snapshot_every = int(journal_config.get('snapshot_every', GameJournal.DEFAULT_SNAPSHOT_EVERY))
+        self.journals_dir = os.path.join(self.saves_dir, 'journals')
+        self.journal = None
+
+        # Full saves (journal disabled) are JSON, or "packed" (msgpack + zstd) when installed
+        self.full_save_format = self.config.get('saves', {}).get('format', 'json')
+        if self.full_save_format == 'packed' and not save_format.available():
+            print("msgpack/zstandard not installed; full saves fall back to JSON")
+            self.full_save_format = 'json'
+        # A packed save loads its recent turns first; the older history is merged in here
+        self._history_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='save-history')
+        self._full_history = None
+
+        # Full-text index over every save; new saves are added as they are written
+        self.save_index = SaveIndex(os.path.join(self.base_path, 'cache', 'save_index.sqlite'))
+        self._index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='save-index')
+        self._index_executor.submit(self._sync_save_index)
 
     def get_setting(self, key: str, default=None):
         """Get a setting value with a default fallback"""
@@ -106,6 +243,7 @@ class GameManager:
             self.config = {
                 "last_dm_model": "",
                 "npc_models": {},
+                "fallback_models": {},
                 "saved_characters": {}
             }
             self.save_config()
@@ -160,6 +298,49 @@ class GameManager:
     def get_npc_model(self, slot: int) -> str:
         return self.config['npc_models'].get(f'npc_{slot}', '')
 
+    def model_chain(self, role: Optional[str], primary: str) -> List[str]:
+        """Primary model plus the role's configured fallbacks, healthiest first"""
+        chain = [primary] if primary else []
+        if role:
+            for model in self.config.get('fallback_models', {}).get(role, []):
+                if model and model not in chain:
+                    chain.append(model)
+        return self.model_health.order(chain)
+
+    def _call_with_fallback(self, role: Optional[str], primary: str, call: Callable[[str], object]):
+        """Run call(model) down the role's fallback chain, feeding the circuit breakers.
+
+        Only failures that say the model is unavailable (rate limits, 5xx,
+        timeouts) move on to the next model; anything else is raised at once.
+        Models with an open breaker are skipped, and a half-open one takes a
+        single probe call at a time. Only when no model could be called at
+        all does each open breaker get one early probe.
+        """
+        chain = self.model_chain(role, primary)
+        if not chain:
+            raise Exception("No model configured")
+        
+        last_error = None
+        for force in (False, True):
+            for model in chain:
+                if not self.model_health.acquire(model, force=force):
+                    continue
+                try:
+                    result = call(model)
+                except Exception as e:
+                    if not is_model_failure(e):
+                        self.model_health.release(model)
+                        raise
+                    self.model_health.record_failure(model)
+                    print(f"Model {model} unavailable ({str(e)[:120]}), trying next in chain")
+                    last_error = e
+                    continue
+                self.model_health.record_success(model)
+                return result
+            if last_error:
+                raise last_error
+        raise Exception("Every model in the chain is being probed after repeated failures; try again shortly")
+
     def has_api_key(self) -> bool:
         return bool(os.getenv('OPENROUTER_API_KEY'))
         
@@ -167,26 +348,39 @@ class GameManager:
         return bool(self.config.get('last_dm_model')) and bool(self.config.get('npc_models'))
         
     def list_available_models(self) -> list:
+        """Model ids from the on-disk catalog; never blocks on the network.
+        
+        Before the first successful refresh this falls back to the models named
+        in config so the combos are never empty.
+        """
+        models = self.model_catalog.ids()
+        if models:
+            return models
+        configured = [self.get_dm_model()] + list(self.config.get('npc_models', {}).values())
+        for chain in self.config.get('fallback_models', {}).values():
+            configured.extend(chain)
+        return sorted({model for model in configured if model})
+    
+    def refresh_model_catalog(self, force: bool = False) -> bool:
+        """Fetch /models if the catalog is stale; True if the list changed. Blocking."""
         try:
-            headers = {
-                "Authorization": f"Bearer {os.getenv('OPENROUTER_API_KEY')}",
-                "HTTP-Referer": "https://github.com/your-repo",
-                "X-Title": "TD-LLM-DND"
-            }
-            response = requests.get(
-                "https://openrouter.ai/api/v1/models",
-                headers=headers
-            )
-            if response.status_code == 200:
-                models = response.json()
-                return [model['id'] for model in models['data']]
-            return []
-        except:
-            return []
+            return self.model_catalog.refresh(force=force)
+        except Exception as e:
+            print(f"Error refreshing model catalog: {e}")
+            return False
+    
+    def filter_models(self, text: str, free_only: bool = False) -> list:
+        if not self.model_catalog.ids():
+            terms = text.lower().split()
+            return [m for m in self.list_available_models() if all(t in m.lower() for t in terms)]
+        return self.model_catalog.filter(text, free_only=free_only)
             
     def reset_game(self):
+        self._discard_roll_speculation()
         self.game_state = None
         self.party = None
+        self.journal = None
+        self._notify_party(None, 'party')
         
     def process_turn(self, action: str) -> str:
         if not self.game_state:
@@ -195,41 +389,69 @@ class GameManager:
         # Record the action in the game state
         self.game_state['actions'].append(action)
 
-        # Build updated prompt
-        prompt = self._build_dm_prompt()
-
-        # Get DM response using the new prompt
-        response = self.get_dm_response_from_api(prompt)
+        # Get DM response for the action on top of the cached prefix and history
+        response = self.get_dm_response_from_api(self._dm_messages(f"{self._party_status()}\n\n{action}"))
         self.game_state['responses'].append(response)
+        self._append_history(action, response)
+        self._journal_turn()
 
         return response
 
-    def generate_party(self) -> Dict[str, str]:
+    def generate_party(self) -> Dict[str, Character]:
         """Generate exactly 3 NPC characters using their pre-selected models"""
         self.party = {}
+        for name, character in self._generate_npc_slots():
+            self.party[name] = character
+        self._notify_party(None, 'party')
+        return self.party
+
+    def _generate_npc_slots(self, slots: int = 3) -> List[Tuple[str, Character]]:
+        """Generate one NPC per slot concurrently, each with its own slot model.
+
+        Results come back in slot order. A slot whose call fails or overruns the
+        party deadline gets a fallback character instead.
+        """
+        models = [self.config['npc_models'].get(f"npc_{i}", self.dm_model) for i in range(slots)]
+        deadline = time.monotonic() + float(
+            self.config.get('openrouter', {}).get('party_timeout', self.api_client.timeout[1])
+        )
+
+        executor = ThreadPoolExecutor(max_workers=slots, thread_name_prefix='npc-slot')
+        submitted_at = time.perf_counter()
         
-        for i in range(3):
-            try:
-                # Get the specific model for this NPC slot
-                model = self.config['npc_models'].get(f"npc_{i}", self.dm_model)
-                character = self.generate_character(model)
-                
-                # Extract name from the generated character
-                name_lines = [line for line in character.split('\n') if line.startswith('Name:')]
-                if name_lines:
-                    name = name_lines[0].split('Name:')[1].strip()
-                else:
-                    name = f"Adventurer {i + 1}"
-                    
-                # Store the character and save model preference
-                self.party[name] = character
-                self.npc_manager.save_npc_model(name, model)
-                
-            except Exception as e:
-                name = f"Adventurer {i + 1}"
-                self.party[name] = self.generate_fallback_character(name)
+        def run_slot(model: str, role: str) -> str:
+            note_queue_wait(time.perf_counter() - submitted_at)
+            return self.generate_character(model, role)
         
-        return self.party
+        futures = [
+            executor.submit(run_slot, model, f"npc_{i}")
+            for i, model in enumerate(models)
+        ]
+        results = []
+        try:
+            for i, (model, future) in enumerate(zip(models, futures)):
+                try:
+                    character = Character.from_string(
+                        future.result(timeout=max(0.0, deadline - time.monotonic())),
+                        fallback_name=f"Adventurer {i + 1}"
+                    )
+                    name = character.name
+                    
+                    # Save model preference for this NPC
+                    self.npc_manager.save_npc_model(name, model)
+                except FutureTimeoutError:
+                    print(f"NPC slot {i} timed out, using fallback")
+                    name = f"Adventurer {i + 1}"
+                    character = Character.from_string(self.generate_fallback_character(name))
+                except Exception as e:
+                    print(f"Error generating NPC: {str(e)}")
+                    name = f"Adventurer {i + 1}"
+                    character = Character.from_string(self.generate_fallback_character(name))
+                results.append((name, character))
+        finally:
+            # Don't block on stragglers that already missed the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
 
     def start_new_adventure(self) -> Tuple[Dict, str]:
         """Create a new adventure with the current party"""
@@ -237,38 +459,7 @@ class GameManager:
             raise Exception("No party available")
 
         # Create detailed party information
-        party_details = []
-        for name, char_data in self.party.items():
-            if isinstance(char_data, str):
-                # Parse string character data into meaningful sections
-                sections = {}
-                current_section = None
-                for line in char_data.split('\n'):
-                    if ':' in line:
-                        key = line.split(':', 1)[0].strip()
-                        value = line.split(':', 1)[1].strip()
-                        if key in ['Name', 'Race', 'Class', 'Background', 'Alignment']:
-                            sections[key] = value
-                        elif key == 'Personality':
-                            current_section = 'Personality'
-                            sections[current_section] = []
-                        elif key == 'Equipment':
-                            current_section = 'Equipment'
-                            sections[current_section] = []
-                        elif key == 'Backstory':
-                            current_section = 'Backstory'
-                            sections[current_section] = []
-                    elif current_section and line.strip():
-                        sections[current_section].append(line.strip())
-                
-                char_summary = (
-                    f"{sections.get('Name', name)} - {sections.get('Race', 'Unknown')} "
-                    f"{sections.get('Class', 'Unknown')}, {sections.get('Background', 'Unknown')}, "
-                    f"Personality: {' '.join(sections.get('Personality', []))}. "
-                    f"Equipment: {', '.join(sections.get('Equipment', []))}. "
-                    f"Backstory: {' '.join(sections.get('Backstory', []))}"
-                )
-                party_details.append(char_summary)
+        party_details = [character.summary() for character in self.party.values()]
 
         intro_prompt = f"""You are the Dungeon Master for a D&D 5e game.
 You are to create an exciting D&D adventure introduction.
@@ -304,44 +495,37 @@ End with a clear question or choice for the party.
 """
 
         try:
-            headers = {
-                "Authorization": f"Bearer {os.getenv('OPENROUTER_API_KEY')}",
-                "HTTP-Referer": "https://github.com/your-repo",
-                "X-Title": "TD-LLM-DND"
-            }
-            
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                json={
-                    "model": self.dm_model,
-                    "messages": [{"role": "user", "content": intro_prompt}],
-                    "max_tokens": 2000,  # Increased to 2000
-                    "temperature": 0.7
-                }
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"API error: {response.status_code} - {response.text}")
-                
-            dm_intro = response.json()['choices'][0]['message']['content']
+            json_response = self._call_with_fallback('dm', self.dm_model, lambda model: self.api_client.chat_completion(
+                model,
+                [{"role": "user", "content": intro_prompt}],
+                max_tokens=2000,  # Increased to 2000
+                temperature=0.7
+            ))
+            dm_intro = self.api_client.message_content(json_response)
             
             self.game_state = {
                 "turn": 1,
                 "actions": [],
                 "responses": [],
                 "story_progression": [dm_intro],
+                "history": [],
                 "turn_participation": {name: False for name in self.party},
                 "party_members": self.party
             }
+            self._warm_npc_memories()
+            self._start_journal()
             
             return self.game_state, dm_intro
             
         except Exception as e:
             raise Exception(f"Failed to start adventure: {str(e)}")
 
-    def generate_character(self, model: str) -> str:
-        """Generate a single character using the specified model"""
+    def generate_character(self, model: str, role: Optional[str] = None) -> str:
+        """Generate a single character using the specified model.
+
+        With a role (e.g. "npc_0") the role's fallback chain is tried before
+        giving up and returning a fallback character.
+        """
         race = random.choice(self.DND_RACES)
         name = get_random_name(race)
         
@@ -379,33 +563,19 @@ Backstory:
 [3-4 sentences, be specific and concise]"""
 
         try:
-            headers = {
-                "Authorization": f"Bearer {os.getenv('OPENROUTER_API_KEY')}",
-                "HTTP-Referer": "https://github.com/your-repo",
-                "X-Title": "TD-LLM-DND"
-            }
-            
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                json={
-                    "model": model,
-                    "messages": [
-                        {"role": "system", "content": "You are a D&D character creator. Generate characters following the EXACT format provided. Do not add ANY additional commentary."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": 1000,
-                    "temperature": 0.7,
-                    "presence_penalty": 0.6,
-                    "frequency_penalty": 0.3
-                }
-            )
-            
-            if response.status_code != 200:
-                print(f"API Error: {response.status_code}")  # Debug print
-                return self.generate_fallback_character(name)
+            json_response = self._call_with_fallback(role, model, lambda slot_model: self.api_client.chat_completion(
+                slot_model,
+                [
+                    {"role": "system", "content": "You are a D&D character creator. Generate characters following the EXACT format provided. Do not add ANY additional commentary."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=1000,
+                temperature=0.7,
+                presence_penalty=0.6,
+                frequency_penalty=0.3
+            ))
                 
-            content = response.json()['choices'][0]['message']['content'].strip()
+            content = self.api_client.message_content(json_response).strip()
             
             # Validate response has required fields
             required_fields = ["Name:", "Race:", "Class:", "Level:", "Ability Scores:", "HP:", "AC:", "Background:", "Alignment:", "Personality:", "Equipment:", "Backstory:"]
@@ -451,37 +621,7 @@ Equipment:
 Backstory: A simple warrior seeking adventure."""
 
     def format_character_string(self, character: Dict) -> str:
-        hp = character.get('hp', 30)
-        ac = character.get('ac', 10)
-        eq = character.get('equipment')
-        if isinstance(eq, list):
-            eq_str = '\n'.join(f"- {item}" for item in eq if item.strip())
-        else:
-            eq_str = eq or "Basic adventuring gear"
-        formatted = f"""Name: {character['name']}
-Race: {character['race']}
-Class: {character['class']}
-Background: {character['background']}
-Alignment: {character['alignment']}
-
-Ability Scores:
-STR: {character['ability_scores']['STR']}
-DEX: {character['ability_scores']['DEX']}
-CON: {character['ability_scores']['CON']}
-INT: {character['ability_scores']['INT']}
-WIS: {character['ability_scores']['WIS']}
-CHA: {character['ability_scores']['CHA']}
-
-HP: {hp}
-AC: {ac}
-
-Personality: {character['personality']}
-
-Equipment:
-{eq_str}
-
-Backstory: {character['backstory']}"""
-        return formatted.replace('*', '')
+        return Character.from_dict(character).to_string().replace('*', '')
 
     def get_player_character(self) -> Dict:
         """Get the current player character"""
@@ -520,28 +660,19 @@ Backstory: {character['backstory']}"""
         self.player_character = character
         print(f"Set player character: {character['name']}")  # Debug print
         
-    def generate_party_with_player(self, player_character: Dict) -> Dict[str, str]:
+    def generate_party_with_player(self, player_character: Dict) -> Dict[str, Character]:
         """Generate party including the player character"""
         if not player_character:
             raise Exception("No player character available!")
             
         self.party = {}
-        self.party[player_character['name']] = self.format_character_string(player_character)
+        self.party[player_character['name']] = Character.from_dict(player_character)
         print(f"Added player to party: {player_character['name']}")  # Debug print
         
-        # Generate NPCs
-        for i in range(3):
-            try:
-                model = self.config['npc_models'].get(f"npc_{i}", self.dm_model)
-                character = self.generate_character(model)
-                name_lines = [line for line in character.split('\n') if line.startswith('Name:')]
-                name = name_lines[0].split('Name:')[1].strip() if name_lines else f"Adventurer {i + 1}"
-                self.party[name] = character
-                self.npc_manager.save_npc_model(name, model)
-            except Exception as e:
-                print(f"Error generating NPC: {str(e)}")
-                name = f"Adventurer {i + 1}"
-                self.party[name] = self.generate_fallback_character(name)
+        # Generate NPCs concurrently, keeping slot order
+        for name, character in self._generate_npc_slots():
+            self.party[name] = character
+        self._notify_party(None, 'party')
         return self.party
         
     def get_npc_names(self) -> list:
@@ -557,103 +688,209 @@ Backstory: {character['backstory']}"""
             self.game_state['last_roll'] = result
             self.game_state['waiting_for_roll'] = False
             
-    def process_player_action(self, action: str) -> str:
-        """Process player action and get DM response"""
+    def cancel_turn(self):
+        """Abort the turn in flight; safe to call from any thread"""
+        self._turn_cancelled.set()
+
+    def _check_turn_cancelled(self):
+        if self._turn_cancelled.is_set():
+            raise TurnCancelled("Turn cancelled")
+
+    @staticmethod
+    def _parse_dc(text: str) -> Optional[int]:
+        """DC of the check a DM response asks for, or None"""
+        match = re.search(r'\bDC\s*:?\s*(\d+)', text or '')
+        return int(match.group(1)) if match else None
+
+    @staticmethod
+    def _roll_outcome_prompt(dc: int, success: bool) -> str:
+        outcome = "Success" if success else "Failure"
+        comparison = "met or beat" if success else "fell short of"
+        return f"""The player's d20 roll {comparison} DC {dc}: {outcome}.
+
+Describe the {outcome.lower()} of this roll and move the story forward.
+Do not state the exact number rolled.
+Be concise (max 3 sentences for the outcome).
+Then provide a new prompt for the next action.
+Do not ask for another roll immediately."""
+
+    def _start_roll_speculation(self, dm_response: str, dc: Optional[int]):
+        """If the DM just asked for a check, generate both outcomes while the player rolls"""
+        self._discard_roll_speculation()
+        if not self.speculative_rolls or dc is None:
+            return
+        self._speculation = {
+            'source': dm_response,
+            'dc': dc,
+            'futures': {
+                success: self._speculation_executor.submit(
+                    self._get_dm_turn,
+                    self._dm_messages(self._roll_outcome_prompt(dc, success)),
+                    call_type='roll_outcome'
+                )
+                for success in (True, False)
+            }
+        }
+
+    def _discard_roll_speculation(self):
+        """Drop pending outcomes; ones already running finish and are ignored"""
+        speculation, self._speculation = self._speculation, None
+        if speculation:
+            for future in speculation['futures'].values():
+                future.cancel()
+
+    def _take_roll_speculation(self, last_response: str, dc: Optional[int], roll_result: int):
+        """Claim the future matching this roll, discarding the other outcome"""
+        speculation, self._speculation = self._speculation, None
+        if not speculation:
+            return None
+        futures = speculation['futures']
+        if dc is None or speculation['source'] != last_response or speculation['dc'] != dc:
+            for future in futures.values():
+                future.cancel()
+            return None
+        success = roll_result >= dc
+        futures[not success].cancel()
+        return futures[success]
+
+    def _await_roll_outcome(self, future) -> Optional[DMTurn]:
+        """Wait for a speculative outcome; None means fall back to a live call"""
+        with self.metrics.call('speculation', 'roll_outcome') as record:
+            record.outcome = 'hit' if future.done() else 'wait'
+            while True:
+                self._check_turn_cancelled()
+                try:
+                    return future.result(timeout=0.1)
+                except FutureTimeoutError:
+                    continue
+                except Exception as e:
+                    print(f"Speculative roll outcome failed, asking the DM directly: {e}")
+                    record.outcome = 'failed'
+                    return None
+
+    def process_player_action(self, action: str, on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Process player action and get DM response.
+
+        If on_token is given the DM response is streamed and each text delta is
+        passed to it as it arrives; damage detection runs once the stream ends.
+        Raises TurnCancelled (leaving game_state untouched) if cancel_turn() is
+        called before the response is committed; a cancel that arrives after
+        that point is ignored and the committed response is returned.
+        """
         if not self.game_state:
             raise Exception("No active game")
             
         if not self.dm_model:
             raise Exception("No DM model selected")
 
+        self._turn_cancelled.clear()
+        self.ensure_full_history()
+        actions_before = len(self.game_state['actions'])
+        speculative = None
+
         try:
-            # Check if this is a dice roll result
-            if "rolled a" in action.lower():
-                # Extract only the first number found in the text
-                numbers = [int(num) for num in ''.join(c if c.isdigit() else ' ' for c in action).split()]
-                roll_result = numbers[0] if numbers else 0
+            with self.metrics.span('turn.prompt_build'):
+                # Check if this is a dice roll result
+                if "rolled a" in action.lower():
+                    # Extract only the first number found in the text
+                    numbers = [int(num) for num in ''.join(c if c.isdigit() else ' ' for c in action).split()]
+                    roll_result = numbers[0] if numbers else 0
                 
-                # Get the last DM response that requested a roll
-                last_response = self.game_state.get('responses', [''])[-1]
-                if "DC" in last_response:
-                    # Extract DC value from the last response
-                    dc = int(''.join(filter(str.isdigit, last_response.split("DC")[1].split()[0])))
-                    
-                    # Create a prompt that includes the roll result and DC
-                    prompt = f"""The player rolled {roll_result} on a d20 against DC {dc}.
+                    # Get the last DM response that requested a roll
+                    last_response = self.game_state.get('responses', [''])[-1]
+                    pending_roll = self.game_state.get('pending_roll')
+                    dc = pending_roll['dc'] if pending_roll else self._parse_dc(last_response)
+                    speculative = self._take_roll_speculation(last_response, dc, roll_result)
+                    history_entry = f"{self.player_character['name']} rolled {roll_result} on a d20"
+                    if dc is not None:
+                        history_entry += f" against DC {dc}"
+                        # Create a prompt that includes the roll result and DC
+                        prompt = f"""The player rolled {roll_result} on a d20 against DC {dc}.
 
 Determine the outcome:
 - On a {roll_result} vs DC {dc}
 - If {roll_result} >= {dc}: Success
 - If {roll_result} < {dc}: Failure
 
-Last game state: {last_response}
-
 Provide the outcome of this specific roll ({roll_result}), describing success or failure, and move the story forward.
 Be concise (max 3 sentences for the outcome).
 Then provide a new prompt for the next action.
 Do not ask for another roll immediately."""
 
-                else:
-                    # Generic roll response if no DC was found
-                    prompt = f"""The player rolled {roll_result} on a d20.
+                    else:
+                        # Generic roll response if no DC was found
+                        prompt = f"""The player rolled {roll_result} on a d20.
 The roll result is exactly {roll_result}, not higher or lower.
 
-Last game state: {last_response}
-
 Describe the outcome of this {roll_result} roll and move the story forward.
 Be concise (max 3 sentences).
 Then provide a new prompt for the next action.
 Do not ask for another roll immediately."""
 
-            else:
-                # Normal action processing
-                self.game_state['actions'].append({
-                    'player': self.player_character['name'],
-                    'action': action
-                })
-                prompt = self._build_dm_prompt()
+                else:
+                    # Normal action processing
+                    self._discard_roll_speculation()
+                    self.game_state['actions'].append({
+                        'player': self.player_character['name'],
+                        'action': action
+                    })
+                    history_entry = f"{self.player_character['name']}: {action}"
+                    prompt = f"{self._party_status()}\n\n{history_entry}"
+                messages = self._dm_messages(prompt)
             
             print(f"Sending prompt to API: {prompt}")  # Debug print
             
-            dm_response = self.get_dm_response_from_api(prompt)
+            with self.metrics.span('turn.network'):
+                turn = None
+                if speculative is not None:
+                    turn = self._await_roll_outcome(speculative)
+                    if turn and on_token:
+                        on_token(turn.narrative)
+                if turn is None:
+                    turn = self._get_dm_turn(messages, on_token=on_token)
+                dm_response = turn.narrative
+            # Last cancellation point: from here on the turn is committed (damage,
+            # transcript, journal), so a late cancel must not drop it from the UI
+            self._check_turn_cancelled()
             
-            # Check for damage descriptions in the response
-            damage_indicators = [
-                'hits', 'strikes', 'blast', 'attack hits', 'slashes',
-                'pierces', 'smashes', 'wounds', 'damage'
-            ]
+            with self.metrics.span('turn.damage_detection'):
+                if turn.structured:
+                    # The DM reported the mechanics itself; no keyword guessing
+                    dm_response += self._apply_turn_mechanics(turn, dm_response)
+                    roll_request = turn.roll_request
+                else:
+                    # One pass over the response for damage, target and roll cues
+                    matcher = self.response_matcher()
+                    analysis = matcher.analyze(dm_response)
+                    roll_request = {'skill': None, 'dc': analysis.dc} if analysis.dc is not None else None
             
-            if any(indicator in dm_response.lower() for indicator in damage_indicators):
-                # Calculate damage
-                damage_amount, damage_type = self.calculate_damage(dm_response)
+                    if analysis.damage:
+                        # Calculate damage
+                        damage_amount, damage_type = self.calculate_damage(dm_response, analysis)
                 
-                # Identify target (either player or NPC)
-                target_name = None
-                player_name = self.player_character['name']
+                        # Identify target (either player or NPC)
+                        target_name = matcher.target(analysis)
                 
-                # Check if player is the target
-                if any(f"hits {player_name}" in dm_response.lower() or 
-                       f"strikes {player_name}" in dm_response.lower() or
-                       "hitting you" in dm_response.lower() or
-                       "strikes you" in dm_response.lower()):
-                    target_name = player_name
-                else:
-                    # Check for NPC targets
-                    for npc_name in self.get_npc_names():
-                        if npc_name.lower() in dm_response.lower():
-                            target_name = npc_name
-                            break
-                
-                if target_name:
-                    # Apply the damage
-                    self.apply_damage(target_name, damage_amount, dm_response)
+                        if target_name:
+                            # Apply the damage
+                            self.apply_damage(target_name, damage_amount, dm_response)
                     
-                    # Append damage information to response
-                    dm_response += f"\n[{target_name} takes {damage_amount} {damage_type} damage!]"
+                            # Append damage information to response
+                            dm_response += f"\n[{target_name} takes {damage_amount} {damage_type} damage!]"
             
-            self.game_state['responses'].append(dm_response)
+            with self.metrics.span('turn.post_processing'):
+                self.game_state['responses'].append(dm_response)
+                self._append_history(history_entry, dm_response)
+                self._record_npc_memories(history_entry, dm_response)
+                self.game_state['pending_roll'] = roll_request
+                self._start_roll_speculation(dm_response, roll_request['dc'] if roll_request else None)
+                self._journal_turn()
             return dm_response
             
+        except TurnCancelled:
+            # Drop the half-finished turn so the log and state stay in sync
+            del self.game_state['actions'][actions_before:]
+            raise
         except Exception as e:
             print(f"Error processing action: {str(e)}")
             raise Exception(f"Error processing action: {str(e)}")
@@ -664,37 +901,40 @@ Do not ask for another roll immediately."""
             print(f"Character {char_name} not found in party.")
             return
             
-        char_data = self.party[char_name]
-        if isinstance(char_data, str):
-            # Parse existing character data
-            lines = char_data.split('\n')
-            new_lines = []
-            in_equipment = False
-            
-            for line in lines:
-                if line.startswith('HP:') and 'hp' in updates:
-                    try:
-                        hp_value = updates['hp']
-                        if isinstance(hp_value, str):
-                            hp_value = hp_value.split(' ')[0]  # Take only the number part
-                        new_lines.append(f"HP: {int(hp_value)}")
-                    except ValueError as e:
-                        print(f"Error parsing character data: {e}")
-                        new_lines.append(f"HP: {updates['hp']}")
-                elif line.startswith('AC:') and 'ac' in updates:
-                    new_lines.append(f"AC: {updates['ac']}")
-                elif line.startswith('Equipment:') and 'equipment' in updates:
-                    new_lines.append('Equipment:')
-                    for item in updates['equipment']:
-                        new_lines.append(f"- {item}")
-                    in_equipment = True
-                elif in_equipment and line.strip() and not line.startswith('-'):
-                    in_equipment = False
-                    new_lines.append(line)
-                elif not in_equipment:
-                    new_lines.append(line)
-                    
-            self.party[char_name] = '\n'.join(new_lines)
+        character = self.party[char_name]
+        if 'hp' in updates:
+            character.hp = int(str(updates['hp']).split(' ')[0].split('/')[0])
+        if 'max_hp' in updates:
+            character.max_hp = int(updates['max_hp'])
+        if 'ac' in updates:
+            character.ac = int(str(updates['ac']).split(' ')[0])
+        if 'equipment' in updates:
+            character.equipment = list(updates['equipment'])
+
+        if 'hp' in updates or 'max_hp' in updates:
+            self._notify_party(char_name, 'hp', (character.hp, character.max_hp))
+        if 'ac' in updates:
+            self._notify_party(char_name, 'ac', character.ac)
+        if 'equipment' in updates:
+            self._notify_party(char_name, 'equipment', list(character.equipment))
+
+    def set_character_portrait(self, char_name: str, image_path: str):
+        """Record a party member's new portrait"""
+        character = (self.party or {}).get(char_name)
+        if character:
+            character.image_path = image_path
+        self._notify_party(char_name, 'portrait', image_path)
+
+    def add_party_listener(self, listener: Callable[[Optional[str], str, object], None]):
+        """Register a callback for party changes (see party_listeners)"""
+        self.party_listeners.append(listener)
+
+    def _notify_party(self, name: Optional[str], field: str, value=None):
+        for listener in list(self.party_listeners):
+            try:
+                listener(name, field, value)
+            except Exception as e:
+                print(f"Error in party listener: {e}")
 
     def process_npc_turn(self, npc_name: str) -> str:
         """Process turn for an NPC"""
@@ -703,37 +943,37 @@ Do not ask for another roll immediately."""
         model = self.config['npc_models'].get(f"npc_{list(self.party.keys()).index(npc_name)-1}", self.dm_model)
         return self.generate_npc_action(model)
 
-    def get_dm_response_from_api(self, prompt: str) -> str:
-        """Call the OpenRouter API and return the DM's response."""
+    def get_dm_response_from_api(self, prompt: Union[str, List[Dict]],
+                                 on_token: Optional[Callable[[str], None]] = None,
+                                 call_type: Optional[str] = None, structured: bool = False) -> str:
+        """Call the OpenRouter API and return the DM's response.
+
+        prompt is either a single user message or a full messages list (as
+        built by _dm_messages).
+
+        With on_token the completion is streamed over SSE and every delta is
+        forwarded as it arrives; the full cleaned text is still returned.
+        call_type opts the (non-streamed) request into the response cache.
+        structured asks for the dm_turn JSON schema (see _get_dm_turn).
+        """
         try:
             if not self.dm_model:
                 raise Exception("Please select a DM model in Settings")
 
             print(f"Using DM model: {self.dm_model}")  # Debug print
             
-            headers = {
-                "Authorization": f"Bearer {os.getenv('OPENROUTER_API_KEY')}",
-                "HTTP-Referer": "https://github.com/your-repo",
-                "X-Title": "TD-LLM-DND"
-            }
+            if on_token:
+                return self._stream_dm_response(prompt, on_token, structured)
             
             print("Sending request to OpenRouter API...")
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                json={
-                    "model": self.dm_model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 1000,
-                    "temperature": 0.7
-                }
-            )
+            messages = self._as_messages(prompt)
+            json_response = self._call_with_fallback('dm', self.dm_model, lambda model: self.api_client.chat_completion(
+                model,
+                self._messages_for_model(model, messages),
+                call_type=call_type,
+                **self._dm_params(model, structured)
+            ))
             
-            print(f"API Response status: {response.status_code}")  # Debug print
-            if response.status_code != 200:
-                raise Exception(f"API error: {response.status_code} - {response.text}")
-                
-            json_response = response.json()
             print(f"API Response JSON: {json_response}")  # Debug print
             
             if not isinstance(json_response, dict):
@@ -761,46 +1001,410 @@ Do not ask for another roll immediately."""
             dm_response = dm_response.replace('*', '')
             return dm_response
             
+        except TurnCancelled:
+            raise
         except Exception as e:
             print(f"Error generating DM response: {str(e)}")
             raise Exception(f"Failed to get DM response: {str(e)}")
 
-    def _build_dm_prompt(self) -> str:
-        """Build the prompt for the DM"""
-        recent_actions = self.game_state.get('actions', [])[-3:]
-        recent_responses = self.game_state.get('responses', [])[-3:]
-        
-        party_info = []
-        for name, char_data in self.game_state.get('party_members', {}).items():
-            if isinstance(char_data, str):
-                party_info.append(f"{name}: " + " | ".join(
-                    line.strip() for line in char_data.split('\n')
-                    if any(key in line for key in ['Class:', 'Race:', 'Equipment:'])
-                ))
-                
-        return f"""You are the Dungeon Master for D&D 5e.
-You are controlling the NPCs in the party. The player is controlling only their character.
-Your response must not contain any asterisks, markdown, or special formatting.
-Write naturally as if speaking to the players.
+    def _stream_dm_response(self, prompt: Union[str, List[Dict]], on_token: Callable[[str], None],
+                            structured: bool = False) -> str:
+        """Stream the DM response, forwarding deltas and returning the full text"""
+        print("Streaming response from OpenRouter API...")
+        messages = self._as_messages(prompt)
 
-Party Members:
-{chr(10).join(party_info)}
+        def stream(model: str) -> List[str]:
+            parts = []
+            try:
+                for delta in self.api_client.stream_chat_completion(
+                    model,
+                    self._messages_for_model(model, messages),
+                    **self._dm_params(model, structured)
+                ):
+                    # Breaking out of the generator closes the HTTP stream
+                    self._check_turn_cancelled()
+                    parts.append(delta)
+                    on_token(delta)
+            except Exception as e:
+                if parts and is_model_failure(e):
+                    # Tokens are already on screen; switching models now would garble the reply
+                    raise Exception(f"Stream interrupted: {str(e)}")
+                raise
+            return parts
+
+        dm_response = ''.join(self._call_with_fallback('dm', self.dm_model, stream))
+        if not dm_response:
+            raise Exception("Empty streamed response from API")
+        return dm_response.replace('*', '')
+
+    def _dm_params(self, model: str, structured: bool) -> Dict:
+        """Sampling parameters for a DM call, plus response_format when structured"""
+        # usage.include reports cached prompt tokens, so prefix cache hits show up in metrics
+        if not structured:
+            return {'max_tokens': 1000, 'temperature': 0.7, 'usage': {'include': True}}
+        # The JSON wrapper and mechanics need room on top of the narrative
+        params = {'max_tokens': 1500, 'temperature': 0.7, 'usage': {'include': True}}
+        if self.model_catalog.supports(model, 'response_format') is False:
+            # No JSON mode at all: the prompt still asks for JSON and parsing is tolerant
+            return params
+        strict = self.model_catalog.supports(model, 'structured_outputs') is not False
+        params['response_format'] = response_format(self.DAMAGE_TYPES, strict=strict)
+        return params
+
+    def _get_dm_turn(self, messages: List[Dict], on_token: Optional[Callable[[str], None]] = None,
+                     call_type: Optional[str] = None) -> DMTurn:
+        """DM response plus its mechanics.
+
+        With tool_calling the DM resolves mechanics through local tools (see
+        _run_dm_tool_loop). With structured_mechanics it answers in the dm_turn
+        JSON schema and only the narrative is streamed to on_token. The turn
+        comes back with structured=False (keyword heuristics apply) when both
+        modes are off or the model replied in prose anyway.
+        """
+        if self.tool_calling:
+            return self._run_dm_tool_loop(messages, on_token, call_type)
+        if not self.structured_mechanics:
+            return DMTurn(self.get_dm_response_from_api(messages, on_token=on_token, call_type=call_type))
+
+        forward = None
+        if on_token:
+            parser = NarrativeStreamParser()
+
+            def forward(delta: str):
+                text = parser.feed(delta)
+                if text:
+                    on_token(text)
+
+        # MECHANICS_INSTRUCTIONS are part of the system prompt (see _dm_messages)
+        raw = self.get_dm_response_from_api(messages, on_token=forward, call_type=call_type, structured=True)
+        turn = DMTurn.parse(raw)
+        if not turn.structured:
+            print("DM reply was not valid dm_turn JSON, falling back to keyword heuristics")
+        return turn
+
+    def _run_dm_tool_loop(self, messages: List[Dict], on_token: Optional[Callable[[str], None]] = None,
+                          call_type: Optional[str] = None) -> DMTurn:
+        """Let the DM call roll/apply_damage/get_party_status until it narrates.
+
+        Tool rounds are not streamed; the final narration reaches on_token in
+        one piece. After max_tool_rounds the DM must answer without tools.
+        Damage from the tools is returned on the turn, not applied here; a DM
+        that had the tools and dealt none dealt no damage.
+        """
+        player_name = self.player_character['name'] if self.player_character else None
+        toolbox = DMToolbox(self.party or {}, self._resolve_target, self.DAMAGE_TYPES, self.metrics, player_name)
+        messages = list(messages)
+        tools_offered = False
+
+        for round_number in range(self.max_tool_rounds + 1):
+            self._check_turn_cancelled()
+            final_round = round_number == self.max_tool_rounds
+
+            def call(model: str) -> dict:
+                nonlocal tools_offered
+                params = {'max_tokens': 1000, 'temperature': 0.7, 'usage': {'include': True}}
+                # Models the catalog says lack tool support just narrate (heuristics apply)
+                if self.model_catalog.supports(model, 'tools') is not False:
+                    params['tools'] = DM_TOOLS
+                    tools_offered = True
+                    if final_round:
+                        params['tool_choice'] = 'none'
+                return self.api_client.chat_completion(
+                    model, self._messages_for_model(model, messages), call_type=call_type or 'dm_tools', **params
+                )
 
-Recent Events: {' '.join(str(r) for r in recent_responses)}
-Latest Actions: {' '.join(str(a) for a in recent_actions)}
+            json_response = self._call_with_fallback('dm', self.dm_model, call)
+            choices = json_response.get('choices') if isinstance(json_response, dict) else None
+            if not choices:
+                raise Exception("No response choices from API")
+            message = choices[0].get('message') or {}
+            tool_calls = message.get('tool_calls')
+            if not tool_calls or final_round:
+                break
 
-1. Acknowledge the player's action
-2. If the action requires a check or roll, specify:
-   "Suggest a [skill] check - DC [number]" or
-   "Suggest a [type] saving throw - DC [number]" or
-   "Suggest an attack roll" but do not force the player to roll.
-3. Only describe the outcome after a roll is made
-4. Use game mechanics properly (skill checks, saving throws, etc.)
-5. End with a prompt for the next action. Do not ask the NPCs what they want to do. You are controlling them.
-6. Do not ask the player to roll for NPC checks. Perform NPC rolls yourself automatically.
+            messages.append({"role": "assistant", "content": message.get('content') or '', "tool_calls": tool_calls})
+            for tool_call in tool_calls:
+                function = tool_call.get('function') or {}
+                print(f"DM tool call: {function.get('name')}({function.get('arguments')})")
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.get('id'),
+                    "content": toolbox.execute(function.get('name'), function.get('arguments'))
+                })
 
-Keep response under 250 words. Make sure to include a roll at least every 3 turns.
-"""
+        narrative = (message.get('content') or '').replace('*', '')
+        if not narrative:
+            raise Exception("Empty response from API")
+        if on_token:
+            on_token(narrative)
+        if not tools_offered:
+            return DMTurn(narrative)
+        dc = self.response_matcher().analyze(narrative).dc
+        return DMTurn(
+            narrative,
+            damage=toolbox.damage,
+            roll_request={'skill': None, 'dc': dc} if dc is not None else None,
+            structured=True
+        )
+
+    def _resolve_target(self, name: str) -> Optional[str]:
+        """Party member a DM-reported target refers to ("you" is the player)"""
+        wanted = name.strip().lower()
+        if wanted in ('you', 'player', 'the player') and self.player_character:
+            return self.player_character['name']
+        for member in self.party or {}:
+            if member.lower() == wanted:
+                return member
+        # "Thorin" for "Thorin Oakenshield" and the like
+        for member in self.party or {}:
+            if wanted and (wanted in member.lower() or member.lower() in wanted):
+                return member
+        return None
+
+    def _apply_turn_mechanics(self, turn: DMTurn, dm_response: str) -> str:
+        """Apply the damage a structured turn reports; returns the log lines to append"""
+        notes = ''
+        for hit in turn.damage:
+            target_name = self._resolve_target(hit.target)
+            if not target_name:
+                print(f"DM reported damage to unknown target {hit.target}")
+                continue
+            damage_type = hit.type if hit.type in self.DAMAGE_TYPES else 'magical'
+            self.apply_damage(target_name, hit.amount, dm_response)
+            notes += f"\n[{target_name} takes {hit.amount} {damage_type} damage!]"
+        if turn.npc_actions:
+            self.game_state.setdefault('npc_actions', []).append({
+                'turn': self.game_state.get('turn', 0),
+                'actions': turn.npc_actions
+            })
+        return notes
+
+    def _dm_prefix(self) -> List[Dict]:
+        """System rules plus the adventure/party block, identical from turn to turn.
+
+        Providers cache a repeated prompt prefix, so nothing per-turn (HP,
+        recent events) goes in here. The messages are rebuilt only when the
+        party's static details, the adventure or the response mode change.
+        """
+        party = self.game_state.get('party_members') or self.party or {}
+        intro = (self.game_state.get('story_progression') or [''])[0]
+        structured = self.structured_mechanics and not self.tool_calling
+        key = (tuple(character.profile_key() for character in party.values()), intro, structured)
+        if self._dm_prefix_messages is None or key != self._dm_prefix_key:
+            system = self.DM_SYSTEM_PROMPT + (MECHANICS_INSTRUCTIONS if structured else '')
+            world = "Party Members:\n" + "\n".join(character.profile_line() for character in party.values())
+            if intro:
+                world = f"Adventure opening:\n{intro}\n\n{world}"
+            self._dm_prefix_messages = [
+                {"role": "system", "content": system},
+                {"role": "system", "content": world}
+            ]
+            self._dm_prefix_key = key
+        return self._dm_prefix_messages
+
+    def _history(self) -> List[Dict]:
+        """Rolling user/assistant history, seeded from the transcript for older saves"""
+        history = self.game_state.get('history')
+        if history is None:
+            history = [{"role": "assistant", "content": str(response)}
+                       for response in self.game_state.get('responses', [])[-3:]]
+            self.game_state['history'] = history
+        return history
+
+    def _append_history(self, user_content: Optional[str], dm_response: str):
+        history = self._history()
+        if user_content:
+            history.append({"role": "user", "content": user_content})
+        history.append({"role": "assistant", "content": dm_response})
+        # If summaries keep failing, stop the stored history growing without bound
+        limit = self.keep_recent_messages + 8 * self.summary_every_turns
+        if len(history) > limit and self._summary_job is None:
+            del history[:-limit]
+        self._schedule_story_summary()
+
+    def _story_summary(self) -> Dict:
+        return self.game_state.setdefault('story_summary', {'arc': '', 'chunks': [], 'turns': 0})
+
+    def _story_summary_text(self) -> str:
+        summary = self._story_summary()
+        return '\n\n'.join(part for part in [summary['arc']] + summary['chunks'] if part)
+
+    def _schedule_story_summary(self):
+        """Fold history older than the recent window into the summary, off-thread.
+
+        Runs once at least summary_every_turns turns have left the window; the
+        result is picked up by _collect_story_summary on the next turn.
+        """
+        self._collect_story_summary()
+        if self._summary_job is not None:
+            return
+        history = self._history()
+        foldable = len(history) - self.keep_recent_messages
+        if foldable < 2 * self.summary_every_turns:
+            return
+        batch = history[:foldable]
+        summary = self._story_summary()
+        self._summary_job = {
+            'game_state': self.game_state,
+            'batch': batch,
+            'future': self._summary_executor.submit(
+                self._summarize_story, summary['arc'], list(summary['chunks']), summary['turns'], batch
+            )
+        }
+
+    def _collect_story_summary(self):
+        """Apply a finished summary job: store the summary and drop the turns it covers"""
+        job = self._summary_job
+        if job is None or not job['future'].done():
+            return
+        self._summary_job = None
+        if job['game_state'] is not self.game_state:
+            return  # A different game was loaded meanwhile
+        try:
+            summary = job['future'].result()
+        except Exception as e:
+            print(f"Story summary failed, will retry next turn: {e}")
+            return
+        history = self._history()
+        batch = job['batch']
+        if len(history) >= len(batch) and all(a is b for a, b in zip(history, batch)):
+            del history[:len(batch)]
+            self.game_state['story_summary'] = summary
+
+    def _summarize_story(self, arc: str, chunks: List[str], turns: int, batch: List[Dict]) -> Dict:
+        """Worker-thread body: summarize batch, folding old chunks into the arc when there are too many"""
+        transcript = '\n'.join(
+            f"{'DM' if message['role'] == 'assistant' else 'Player'}: {message['content']}" for message in batch
+        )
+        previous = chunks[-1] if chunks else arc
+        chunk = self._summary_call(f"""Summarize these D&D session events for the Dungeon Master's notes.
+Keep names, places, items, promises, injuries and unresolved threads. Max 120 words, plain text.
+
+Previous notes (for context, do not repeat): {previous or 'None'}
+
+Events:
+{transcript}""")
+        chunks = chunks + [chunk]
+        if len(chunks) > self.max_summary_chunks:
+            # Hierarchy: older chunk summaries collapse into one story-arc summary
+            folded, chunks = chunks[:-2], chunks[-2:]
+            arc = self._summary_call(f"""Merge these D&D campaign notes into one story-arc summary.
+Keep the main quest, key NPCs, places, items and open threads. Max 200 words, plain text.
+
+{chr(10).join(part for part in [arc] + folded if part)}""")
+        return {'arc': arc, 'chunks': chunks, 'turns': turns + sum(1 for m in batch if m['role'] == 'assistant')}
+
+    def _summary_call(self, prompt: str) -> str:
+        json_response = self._call_with_fallback('dm', self.dm_model, lambda model: self.api_client.chat_completion(
+            model,
+            [{"role": "user", "content": prompt}],
+            call_type='story_summary',
+            max_tokens=400,
+            temperature=0.3
+        ))
+        return self.api_client.message_content(json_response).replace('*', '').strip()
+
+    def _record_npc_memories(self, user_content: Optional[str], dm_response: str):
+        """Queue a memory for each party NPC the DM response mentions (embedded off-thread)"""
+        if not self.npc_memory_enabled:
+            return
+        turn = len(self.game_state.get('responses', []))
+        sentences = re.split(r'(?<=[.!?])\s+', dm_response)
+        for name in self.get_npc_names():
+            keys = {name.lower(), name.split()[0].lower()}
+            mentioned = [sentence for sentence in sentences if any(key in sentence.lower() for key in keys)]
+            if mentioned:
+                content = {'text': ' '.join(mentioned), 'action': user_content, 'turn': turn}
+                self._memory_executor.submit(self._save_npc_memory, name, content)
+
+    def _warm_npc_memories(self):
+        """Open the party NPCs' memory stores off-thread so the first turn doesn't wait"""
+        if self.npc_memory_enabled:
+            for name in self.get_npc_names():
+                self._memory_executor.submit(self.npc_manager.memory_store(name).all)
+
+    def _save_npc_memory(self, name: str, content: Dict):
+        try:
+            self.npc_manager.save_npc_memory(name, 'event', content)
+        except Exception as e:
+            print(f"Error saving memory for {name}: {e}")
+
+    def _npc_memory_facts(self, query: str) -> List[str]:
+        """The party NPCs' memories most relevant to this action and the last response"""
+        names = self.get_npc_names()
+        if not self.npc_memory_enabled or not names:
+            return []
+        responses = self.game_state.get('responses', [])
+        # Turns still in the recent history don't need recalling
+        max_turn = len(responses) - self.keep_recent_messages // 2
+        try:
+            results = self.npc_manager.search_memories(
+                names, [query, responses[-1] if responses else ''], self.npc_memory_k, max_turn=max_turn
+            )
+        except Exception as e:
+            print(f"Error searching NPC memories: {e}")
+            return []
+        return [f"{name} remembers: {entry['text']}" for name, _, entry in results]
+
+    def _retrieve_facts(self, query: str) -> List[str]:
+        """Sentences from older turns (outside the history) sharing the most keywords with query"""
+        keywords = {word for word in re.findall(r'[a-z]{5,}', query.lower())}
+        if not keywords or self.max_facts <= 0:
+            return []
+        in_history = {message['content'] for message in self._history()}
+        scored = []
+        for response in self.game_state.get('responses', [])[-200:]:
+            if response in in_history:
+                continue
+            for sentence in re.split(r'(?<=[.!?])\s+', str(response)):
+                score = len(keywords & set(re.findall(r'[a-z]{5,}', sentence.lower())))
+                if score >= 2:
+                    scored.append((score, sentence.strip()))
+        scored.sort(key=lambda item: -item[0])
+        facts = []
+        for _, sentence in scored:
+            if sentence not in facts:
+                facts.append(sentence)
+            if len(facts) >= self.max_facts:
+                break
+        return facts
+
+    def _party_status(self) -> str:
+        party = self.game_state.get('party_members') or self.party or {}
+        return "Party status:\n" + "\n".join(character.status_line() for character in party.values())
+
+    def _dm_messages(self, user_content: str) -> List[Dict]:
+        """Cached prefix + story summary + recent history + facts + this turn's message, within budget"""
+        self._collect_story_summary()
+        structured = self.structured_mechanics and not self.tool_calling
+        # Retrieve on the action itself, not the party status block above it
+        query = user_content.split('\n\n')[-1]
+        return self.context.build(
+            self._dm_prefix(),
+            {"role": "user", "content": user_content},
+            self._history(),
+            summary=self._story_summary_text(),
+            facts=self._npc_memory_facts(query) + self._retrieve_facts(query),
+            model=self.dm_model,
+            reply_tokens=1500 if structured else 1000
+        )
+
+    @staticmethod
+    def _as_messages(prompt: Union[str, List[Dict]]) -> List[Dict]:
+        if isinstance(prompt, str):
+            return [{"role": "user", "content": prompt}]
+        return prompt
+
+    def _messages_for_model(self, model: str, messages: List[Dict]) -> List[Dict]:
+        """Add an explicit cache breakpoint after the prefix for providers that need one"""
+        prefix = self._dm_prefix_messages
+        if (not model.startswith(self.CACHE_CONTROL_MODELS) or not prefix
+                or len(messages) < len(prefix) or messages[len(prefix) - 1] is not prefix[-1]):
+            return messages
+        marked = dict(prefix[-1])
+        marked['content'] = [{"type": "text", "text": prefix[-1]['content'],
+                              "cache_control": {"type": "ephemeral"}}]
+        return messages[:len(prefix) - 1] + [marked] + messages[len(prefix):]
 
     def generate_npc_action(self, model: str) -> str:
         """Generate action for an NPC"""
@@ -812,7 +1416,7 @@ Keep response under 250 words. Make sure to include a roll at least every 3 turn
         try:
             party_file = os.path.join(self.parties_dir, f"{party_name}.json")
             with open(party_file, 'w', encoding='utf-8') as f:
-                json.dump(self.party, f, indent=2)
+                json.dump(serialize_party(self.party), f, indent=2)
             print(f"Party saved successfully: {party_file}")
         except Exception as e:
             print(f"Error saving party: {str(e)}")
@@ -822,7 +1426,8 @@ Keep response under 250 words. Make sure to include a roll at least every 3 turn
         try:
             party_file = os.path.join(self.parties_dir, f"{party_name}.json")
             with open(party_file, 'r', encoding='utf-8') as f:
-                self.party = json.load(f)
+                self.party = parse_party(json.load(f))
+            self._notify_party(None, 'party')
             print(f"Party loaded successfully: {party_file}")
         except Exception as e:
             print(f"Error loading party: {str(e)}")
@@ -836,49 +1441,125 @@ Keep response under 250 words. Make sure to include a roll at least every 3 turn
             return []
 
     def check_for_roll_request(self, response: str) -> bool:
-        """More accurate detection of when a roll is actually needed"""
-        # Common D&D roll request patterns
-        roll_patterns = [
-            "roll a d20",
-            "make a check",
-            "ability check",
-            "skill check",
-            "saving throw",
-            "roll for initiative",
-            "attack roll",
-            "dc ",  # Usually indicates a required roll
-            "difficulty class",
-            "make a strength check", # Added
-            "make a dexterity check", # Added
-            "make a constitution check", # Added
-            "make a intelligence check", # Added
-            "make a wisdom check", # Added
-            "make a charisma check" # Added
-        ]
+        """More accurate detection of when a roll is actually needed.
         
-        # Skip if the response is asking a question
-        if "?" in response:
-            return False
-            
-        # Skip if it's just casual use of "roll" in conversation
-        casual_roll_phrases = [
-            "ready to roll",
-            "roll with it",
-            "on a roll",
-            "let's roll",
-            "roll out",
-            "roll along"
-        ]
-        
-        response_lower = response.lower()
-        
-        # First check if it's just casual usage
-        for phrase in casual_roll_phrases:
-            if (phrase in response_lower):
-                return False
-                
-        # Then check for actual roll requests
-        return any(pattern in response_lower for pattern in roll_patterns)
+        Roll phrases or a DC count, unless the response is a question or uses
+        "roll" casually ("ready to roll", "on a roll", ...).
+        """
+        return self.response_matcher().analyze(response).roll_requested
+
+    def _merge_older_history(self, game_state: Dict, packed: save_format.PackedSave):
+        for key, items in packed.older().items():
+            # Assigned, not edited in place, so readers of the recent tail never see it half-built
+            game_state[key] = items + game_state.get(key, [])
+
+    def ensure_full_history(self):
+        """Wait until a staged load's older history is back in game_state"""
+        future = self._full_history
+        if future is not None:
+            future.result()
+            self._full_history = None
+
+    def transcript_length(self) -> int:
+        self.ensure_full_history()
+        return len(self.game_state.get('responses', [])) if self.game_state else 0
+
+    def transcript_slice(self, start: int, end: int) -> List[str]:
+        """DM responses [start:end] of the whole game, for the log to page in on demand"""
+        self.ensure_full_history()
+        return list(self.game_state.get('responses', [])[start:end]) if self.game_state else []
+
+    def _save_data(self) -> Dict:
+        """The full save dict (the legacy file layout, also what the catalog and index read)"""
+        self.ensure_full_history()
+        # Lists are copied so the background indexer doesn't see the next turn's appends
+        game_state = {key: list(value) if isinstance(value, list) else value
+                      for key, value in self.game_state.items()}
+        game_state['party_members'] = serialize_party(self.game_state.get('party_members'))
+        return {
+            'game_state': game_state,
+            'party': serialize_party(self.party),
+            'player_character': self.player_character,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def _journal_state(self) -> Dict:
+        self.ensure_full_history()
+        return {
+            'game_state': {key: value for key, value in self.game_state.items() if key != 'party_members'},
+            'party': {name: character.to_dict() for name, character in (self.party or {}).items()},
+            'player_character': self.player_character
+        }
+
+    def _start_journal(self):
+        """Start a new journal from the current state (new adventure, or a branch off a save)"""
+        self.journal = None
+        if not self.journal_enabled:
+            return
+        try:
+            path = os.path.join(self.journals_dir, str(int(time.time() * 1000)))
+            self.journal = GameJournal.create(path, self._journal_state(), self.journal_snapshot_every)
+            if self.autosave:
+                self._write_autosave()
+        except Exception as e:
+            print(f"Error starting game journal: {e}")
+
+    def _resume_journal(self, save_data: Dict):
+        """Keep appending to a loaded save's journal if it is the journal's latest point"""
+        journal_id = save_data.get('journal')
+        if self.journal_enabled and journal_id:
+            try:
+                journal = GameJournal.open(os.path.join(self.journals_dir, journal_id), self.journal_snapshot_every)
+                if journal.seq == save_data.get('seq'):
+                    self.journal = journal
+                    return
+            except Exception as e:
+                print(f"Error reopening game journal {journal_id}: {e}")
+        # Older point in a journal (or a full save): continuing from it starts a new branch
+        self._start_journal()
+
+    def _autosave_path(self) -> str:
+        return os.path.join(self.saves_dir, self.AUTOSAVE_FILENAME)
+
+    def _write_journal_pointer(self, filepath: str, timestamp: str):
+        """Write a save that points at the journal's current record"""
+        pointer = {
+            'format': 'journal',
+            'journal': self.journal.id,
+            'seq': self.journal.seq,
+            'timestamp': timestamp
+        }
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(pointer, f, indent=2)
+        os.replace(tmp_path, filepath)
+
+    def _write_autosave(self):
+        """Point the autosave slot at the journal's current record.
+
+        Nothing here scales with the transcript: the catalog entry needs only
+        the turn count and party names, and goes to the catalog's autosave
+        side file rather than a rewrite of catalog.json.
+        """
+        filepath = self._autosave_path()
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        self._write_journal_pointer(filepath, timestamp)
+        self.save_catalog.record_autosave(filepath, {
+            'timestamp': timestamp,
+            'party': list(self.party or {}),
+            'game_state': {'actions': self.game_state.get('actions')}
+        })
+
+    def _journal_turn(self):
+        """Append this turn's changes to the journal and move the autosave up to them"""
+        if not self.journal or not self.game_state:
+            return
+        try:
+            self.journal.record(self._journal_state())
+            if self.autosave:
+                self._write_autosave()
+        except Exception as e:
+            print(f"Error journaling turn: {e}")
 
     def save_game_state(self, save_name: str) -> str:
         """Save current game state to a file"""
@@ -886,20 +1567,26 @@ Keep response under 250 words. Make sure to include a roll at least every 3 turn
             if not self.game_state:
                 raise Exception("No active game to save")
                 
-            # Create a save state dictionary
-            save_data = {
-                'game_state': self.game_state,
-                'party': self.party,
-                'player_character': self.player_character,
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
-            }
-            
             # Create filename with timestamp
-            filename = f"{save_name}_{int(time.time())}.json"
+            packed = not self.journal and self.full_save_format == 'packed'
+            extension = save_format.EXTENSION if packed else '.json'
+            filename = f"{save_name}_{int(time.time())}{extension}"
             filepath = os.path.join(self.saves_dir, filename)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2)
+            if self.journal:
+                # Flush anything not journaled yet, then point the save at it
+                self.journal.record(self._journal_state())
+                save_data = self._save_data()
+                self._write_journal_pointer(filepath, save_data['timestamp'])
+            else:
+                save_data = self._save_data()
+                if packed:
+                    save_format.write_packed(filepath, save_data)
+                else:
+                    with open(filepath, 'w', encoding='utf-8') as f:
+                        json.dump(save_data, f, indent=2)
+            self.save_catalog.record(filepath, save_data)
+            self._index_executor.submit(self._index_save, filepath, save_data)
                 
             return filepath
             
@@ -912,8 +1599,9 @@ Keep response under 250 words. Make sure to include a roll at least every 3 turn
         if not self.game_state or not self.game_state.get('responses'):
             return ""
 
-        # Get initial story and recent responses
+        # Get initial story, the rolling summary of older turns and recent responses
         initial_story = self.game_state.get('story_progression', [''])[0]
+        story_summary = self._story_summary_text()
         recent_responses = self.game_state.get('responses', [])[-3:]  # Get last 3 responses
         
         recap_prompt = f"""As the DM, create a brief recap of the story so far, presenting it as if the player is just waking up from a dream where they remember these events.
@@ -921,6 +1609,9 @@ Keep response under 250 words. Make sure to include a roll at least every 3 turn
 Initial story setup:
 {initial_story}
 
+Story so far:
+{story_summary or 'Nothing yet beyond the setup.'}
+
 Most recent events:
 {chr(10).join(f"- {response}" for response in recent_responses)}
 
@@ -936,28 +1627,54 @@ Requirements for the recap:
 Format it naturally as if speaking to the player."""
 
         try:
-            recap = self.get_dm_response_from_api(recap_prompt)
+            # Cached, so loading the same save twice doesn't pay for a second recap
+            recap = self.get_dm_response_from_api(recap_prompt, call_type='story_recap')
             return recap
         except Exception as e:
             print(f"Error generating recap: {e}")
             return "You wake up, remembering the recent events of your adventure..."
 
-    def load_game_state(self, filename: str) -> bool:
-        """Load game state and generate recap"""
+    def load_game_state(self, filename: str, on_recent: Optional[Callable[[List[str]], None]] = None) -> bool:
+        """Load game state and generate recap.
+
+        Packed saves load in stages: the header and the last RECENT_TURNS
+        turns are decoded first, and on_recent (if given) receives those
+        responses so the log can show them while the older history decodes
+        in the background and the DM writes the recap.
+        """
         try:
             filepath = os.path.join(self.saves_dir, filename)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
+            packed = None
+            if filepath.endswith(save_format.EXTENSION):
+                packed = save_format.PackedSave(filepath)
+                save_data = packed.recent()
+            else:
+                save_data = load_save_data(filepath)
                 
+            self._discard_roll_speculation()
+            self.ensure_full_history()  # Let a previous staged load finish with its own state
             self.game_state = save_data.get('game_state')
-            self.party = save_data.get('party')
+            self.party = parse_party(save_data.get('party') or self.game_state.get('party_members'))
+            # One set of Characters, so damage shows up in the DM prompt too
+            self.game_state['party_members'] = self.party
             self.player_character = save_data.get('player_character')
+            if packed:
+                self._full_history = self._history_executor.submit(self._merge_older_history, self.game_state, packed)
+            self._notify_party(None, 'party')
+            self._warm_npc_memories()
+            if on_recent:
+                on_recent(list(self.game_state.get('responses', [])[-save_format.RECENT_TURNS:]))
             
-            # Generate recap after loading
+            # Generate recap after loading (only needs the recent turns)
             recap = self.generate_story_recap()
+            self._resume_journal(save_data)
             if recap:
+                # The older-history merge replaces these lists; let it finish before appending
+                self.ensure_full_history()
                 # Add recap to responses so it appears in the game log
                 self.game_state['responses'].append(recap)
+                self._append_history(None, recap)
+                self._journal_turn()
             
             return True
             
@@ -966,41 +1683,56 @@ Format it naturally as if speaking to the player."""
             raise
 
     def list_saved_games(self) -> list:
-        """Get list of saved games with their timestamps"""
+        """Get list of saved games with their timestamps, party and turn count"""
         try:
-            saves = []
-            for filename in os.listdir(self.saves_dir):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(self.saves_dir, filename)
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        save_data = json.load(f)
-                        saves.append({
-                            'filename': filename,
-                            'timestamp': save_data.get('timestamp', ''),
-                            'name': filename.split('_')[0]
-                        })
-            return saves
-        except Exception:
+            return self.save_catalog.list()
+        except Exception as e:
+            print(f"Error listing saved games: {e}")
             return []
 
-    def calculate_damage(self, attack_desc: str) -> tuple:
+    def _sync_save_index(self):
+        try:
+            indexed = self.save_index.sync(self.saves_dir)
+            if indexed:
+                print(f"Indexed {indexed} saved games for search")
+        except Exception as e:
+            print(f"Error syncing save index: {e}")
+
+    def _index_save(self, filepath: str, save_data: Dict):
+        try:
+            self.save_index.index_save(filepath, save_data)
+        except Exception as e:
+            print(f"Error indexing save {filepath}: {e}")
+
+    def search_saves(self, query: str, limit: int = 20, open_mark: str = '[', close_mark: str = ']') -> List[Dict]:
+        """Search actions, responses, story and combat logs across all saved games"""
+        with self.metrics.span('search_saves'):
+            return self.save_index.search(query, limit, open_mark, close_mark)
+
+    def response_matcher(self) -> ResponseMatcher:
+        """Matcher for the current party, compiled once per party change"""
+        player_name = self.player_character['name'] if self.player_character else None
+        key = (player_name, tuple(self.get_npc_names()))
+        if self._matcher is None or key != self._matcher_key:
+            self._matcher = ResponseMatcher(self.DAMAGE_TYPES, player_name, key[1])
+            self._matcher_key = key
+        return self._matcher
+
+    def calculate_damage(self, attack_desc: str, analysis: Optional[ResponseAnalysis] = None) -> tuple:
         """Calculate damage based on attack description"""
-        damage_amount = 0
-        damage_type = 'magical'  # Default to magical damage
+        matcher = self.response_matcher()
+        if analysis is None:
+            analysis = matcher.analyze(attack_desc)
         
-        # Try to identify damage type from description
-        desc_lower = attack_desc.lower()
-        for dmg_type in self.DAMAGE_TYPES:
-            if dmg_type in desc_lower:
-                damage_type = dmg_type
-                break
+        # Damage type named in the description, magical by default
+        damage_type = matcher.damage_type(analysis)
                 
         # Get damage dice range for the type
         min_dice, max_dice = self.DAMAGE_TYPES[damage_type]
         base_damage = random.randint(min_dice, max_dice)
         
         # Additional damage based on attack description
-        if any(word in desc_lower for word in ['powerful', 'massive', 'intense']):
+        if analysis.intense:
             damage_amount = base_damage + random.randint(min_dice, max_dice)
         else:
             damage_amount = base_damage
@@ -1013,34 +1745,8 @@ Format it naturally as if speaking to the player."""
             print(f"Target {target_name} not found in party")
             return
             
-        char_data = self.party[target_name]
-        
-        # Convert string character data to dict if needed
-        if isinstance(char_data, str):
-            char_dict = self.parse_character_string(char_data)
-        else:
-            char_dict = char_data
-            
-        # Get current HP
-        current_hp = int(char_dict.get('hp', 30))
-        
-        # Apply damage
-        new_hp = max(0, current_hp - damage)
-        char_dict['hp'] = new_hp
-        
-        # Convert back to string format if needed
-        if isinstance(self.party[target_name], str):
-            # Update HP in the string representation
-            char_lines = self.party[target_name].split('\n')
-            updated_lines = []
-            for line in char_lines:
-                if line.startswith('HP:'):
-                    updated_lines.append(f'HP: {new_hp}')
-                else:
-                    updated_lines.append(line)
-            self.party[target_name] = '\n'.join(updated_lines)
-        else:
-            self.party[target_name] = char_dict
+        new_hp = self.party[target_name].apply_damage(damage)
+        self._notify_party(target_name, 'hp', (new_hp, self.party[target_name].max_hp))
             
         # Add damage event to game state
         if self.game_state:
@@ -1,3 +1,6 @@
+import time
+_process_start = time.perf_counter()
+
 import sys
 import os
 from dotenv import load_dotenv
@@ -10,23 +13,77 @@ load_dotenv()
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QObject, QEvent, QTimer, QCoreApplication
 from ui.main_window import MainWindow
 from game_manager import GameManager
 
+
+class StartupProfiler(QObject):
+    """Wall time of each startup phase, reported (and the app closed) at first paint"""
+
+    def __init__(self, start: float):
+        super().__init__()
+        self.phases = []
+        self.last = start
+        self.window = None
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def watch(self, window):
+        self.window = window
+        window.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and obj is self.window:
+            obj.removeEventFilter(self)
+            # Let the paint finish before stopping the clock
+            QTimer.singleShot(0, self.report)
+        return False
+
+    def report(self):
+        self.mark("first paint")
+        print("Startup profile (wall time):")
+        for phase, seconds in self.phases:
+            print(f"  {phase:<22}{seconds * 1000:8.1f} ms")
+            if phase == "MainWindow":
+                for title, tab_seconds in self.window.tab_build_times.items():
+                    print(f"    {title + ' tab':<20}{tab_seconds * 1000:8.1f} ms")
+        print(f"  {'total':<22}{sum(seconds for _, seconds in self.phases) * 1000:8.1f} ms")
+        QApplication.instance().quit()
+
+
 def main():
+    profiler = None
+    if '--profile-startup' in sys.argv:
+        sys.argv.remove('--profile-startup')
+        profiler = StartupProfiler(_process_start)
+        profiler.mark("imports")
+
     # Verify API key is loaded
     if not os.getenv('OPENROUTER_API_KEY'):
         print("Warning: OPENROUTER_API_KEY not found in environment variables!")
     
+    # The Character tab, and with it QtWebEngine, is imported only when first shown
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     
     # Set application icon
     icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'icon.ico')
     if os.path.exists(icon_path):
         app.setWindowIcon(QIcon(icon_path))
+    if profiler:
+        profiler.mark("QApplication")
     
     game_manager = GameManager()
+    if profiler:
+        profiler.mark("GameManager")
     window = MainWindow(game_manager)
+    if profiler:
+        profiler.mark("MainWindow")
+        profiler.watch(window)
     window.show()
     sys.exit(app.exec_())
 
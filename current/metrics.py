@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import atexit
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+_local = threading.local()
+
+
+def note_queue_wait(seconds: float):
+    """Record how long the current job sat in a queue before its thread picked it up.
+
+    The next call recorded on this thread claims the value; spans (phases of
+    the job itself) never do, so it lands on the LLM/image/TTS request.
+    """
+    _local.queue_wait = seconds
+
+
+def _take_queue_wait() -> Optional[float]:
+    wait = getattr(_local, 'queue_wait', None)
+    _local.queue_wait = None
+    return wait
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class CallRecord:
+    """One instrumented call; fill in ttfb/tokens/outcome while it runs"""
+    __slots__ = ('kind', 'name', 'model', 'started', 'queue_wait', 'ttfb',
+                 'latency', 'prompt_tokens', 'completion_tokens', 'cached_tokens',
+                 'outcome', 'extra')
+
+    def __init__(self, kind: str, name: str, model: str = ''):
+        self.kind = kind
+        self.name = name
+        self.model = model
+        self.started = time.perf_counter()
+        self.queue_wait = _take_queue_wait() if kind != 'span' else None
+        self.ttfb = None
+        self.latency = None
+        self.prompt_tokens = None
+        self.completion_tokens = None
+        self.cached_tokens = None
+        self.outcome = 'ok'
+        self.extra = {}
+
+    def mark_first_byte(self):
+        if self.ttfb is None:
+            self.ttfb = time.perf_counter() - self.started
+
+    def set_usage(self, usage: Optional[dict]):
+        """Copy token counts from an OpenAI-style usage block"""
+        if not usage:
+            return
+        self.prompt_tokens = usage.get('prompt_tokens')
+        self.completion_tokens = usage.get('completion_tokens')
+        details = usage.get('prompt_tokens_details') or {}
+        if details.get('cached_tokens') is not None:
+            self.cached_tokens = details.get('cached_tokens')
+
+    def to_dict(self) -> dict:
+        data = {
+            'ts': time.time(),
+            'kind': self.kind,
+            'name': self.name,
+            'model': self.model,
+            'queue_wait': self.queue_wait,
+            'ttfb': self.ttfb,
+            'latency': self.latency,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'cached_tokens': self.cached_tokens,
+            'outcome': self.outcome
+        }
+        data.update(self.extra)
+        return data
+
+
+class MetricsRecorder:
+    """Collects call/span timings and exports them as rolling JSONL and a Prometheus textfile"""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, metrics_dir: str, config: Optional[dict] = None):
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.metrics_dir = metrics_dir
+        self.jsonl_path = os.path.join(metrics_dir, 'calls.jsonl')
+        self.prom_path = os.path.join(metrics_dir, 'opendungeon.prom')
+        self.max_jsonl_bytes = int(config.get('max_jsonl_bytes', 5 * 1024 * 1024))
+        self.export_interval = float(config.get('export_interval', 5.0))
+        self.window = deque(maxlen=int(config.get('window', 5000)))
+        self.lock = threading.Lock()
+        self._last_export = 0.0
+        # Cumulative since start, for the Prometheus counters (the window rolls over)
+        self._sums: Dict[tuple, List[float]] = {}  # (kind, name, field) -> [sum, count]
+        self._tokens: Dict[tuple, int] = {}  # (kind, name, field) -> tokens
+        self._calls: Dict[tuple, int] = {}  # (kind, name, model, outcome) -> calls
+        if self.enabled:
+            os.makedirs(metrics_dir, exist_ok=True)
+            # Records from the last export_interval before exit still reach the textfile
+            atexit.register(self.export)
+
+    @contextmanager
+    def call(self, kind: str, name: str, model: str = ''):
+        """Time a call; exceptions mark the record as failed and are re-raised"""
+        record = CallRecord(kind, name, model)
+        try:
+            yield record
+        except Exception as e:
+            record.outcome = f"error:{getattr(e, 'status_code', None) or type(e).__name__}"
+            raise
+        finally:
+            record.latency = time.perf_counter() - record.started
+            self.record(record)
+
+    @contextmanager
+    def span(self, name: str):
+        """Named span inside a larger operation (e.g. one phase of a turn)"""
+        with self.call('span', name) as record:
+            yield record
+
+    def record(self, record: CallRecord):
+        if not self.enabled:
+            return
+        data = record.to_dict()
+        with self.lock:
+            self.window.append(data)
+            self._count(data)
+            self._append_jsonl(data)
+            if time.monotonic() - self._last_export >= self.export_interval:
+                self._write_prometheus()
+
+    def _count(self, data: dict):
+        kind, name = data['kind'], data['name']
+        for field in ('latency', 'ttfb', 'queue_wait'):
+            if data[field] is not None:
+                totals = self._sums.setdefault((kind, name, field), [0.0, 0])
+                totals[0] += data[field]
+                totals[1] += 1
+        for field in ('prompt_tokens', 'completion_tokens', 'cached_tokens'):
+            if data[field]:
+                key = (kind, name, field)
+                self._tokens[key] = self._tokens.get(key, 0) + data[field]
+        key = (kind, name, data['model'] or '', data['outcome'])
+        self._calls[key] = self._calls.get(key, 0) + 1
+
+    def _append_jsonl(self, data: dict):
+        try:
+            if (os.path.exists(self.jsonl_path)
+                    and os.path.getsize(self.jsonl_path) >= self.max_jsonl_bytes):
+                # Keep one previous file so the log rolls instead of growing forever
+                os.replace(self.jsonl_path, self.jsonl_path + '.1')
+            with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(data) + '\n')
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+
+    def summary(self) -> Dict[str, dict]:
+        """p50/p95/p99 latency and TTFB per kind/name over the in-memory window"""
+        with self.lock:
+            records = list(self.window)
+        groups = {}
+        for data in records:
+            groups.setdefault((data['kind'], data['name']), []).append(data)
+
+        result = {}
+        for (kind, name), items in groups.items():
+            entry = {'count': len(items),
+                     'errors': sum(1 for d in items if d['outcome'].startswith('error'))}
+            for field in ('latency', 'ttfb', 'queue_wait'):
+                values = sorted(d[field] for d in items if d[field] is not None)
+                if values:
+                    entry[field] = {f"p{int(q * 100)}": percentile(values, q) for q in self.QUANTILES}
+            for field in ('prompt_tokens', 'completion_tokens', 'cached_tokens'):
+                entry[field] = sum(d[field] or 0 for d in items)
+            if entry['prompt_tokens']:
+                # Share of prompt tokens served from the provider's prefix cache
+                entry['cached_ratio'] = entry['cached_tokens'] / entry['prompt_tokens']
+            result[f"{kind}:{name}"] = entry
+        return result
+
+    def export(self):
+        """Write the Prometheus textfile now, regardless of export_interval"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self._write_prometheus()
+
+    def _write_prometheus(self):
+        self._last_export = time.monotonic()
+        groups = {}
+        for data in self.window:
+            groups.setdefault((data['kind'], data['name']), []).append(data)
+
+        lines = []
+        for metric, field, help_text in (
+            ('opendungeon_call_latency_seconds', 'latency', 'Total call latency'),
+            ('opendungeon_call_ttfb_seconds', 'ttfb', 'Time to first byte/token'),
+            ('opendungeon_call_queue_wait_seconds', 'queue_wait', 'Time queued before the call started')
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} summary")
+            # Quantiles cover the rolling window; _sum and _count are since start
+            for (kind, name), items in sorted(groups.items()):
+                values = sorted(d[field] for d in items if d[field] is not None)
+                if not values:
+                    continue
+                labels = f'kind="{kind}",name="{name}"'
+                for q in self.QUANTILES:
+                    lines.append(f'{metric}{{{labels},quantile="{q}"}} {percentile(values, q):.6f}')
+                total, count = self._sums[(kind, name, field)]
+                lines.append(f"{metric}_sum{{{labels}}} {total:.6f}")
+                lines.append(f"{metric}_count{{{labels}}} {count}")
+
+        lines.append("# HELP opendungeon_tokens_total Tokens reported in usage blocks")
+        lines.append("# TYPE opendungeon_tokens_total counter")
+        for (kind, name, field), total in sorted(self._tokens.items()):
+            lines.append(f'opendungeon_tokens_total{{kind="{kind}",name="{name}",type="{field}"}} {total}')
+
+        lines.append("# HELP opendungeon_prompt_cache_ratio Cached share of prompt tokens")
+        lines.append("# TYPE opendungeon_prompt_cache_ratio gauge")
+        for (kind, name), items in sorted(groups.items()):
+            prompt_tokens = sum(d['prompt_tokens'] or 0 for d in items)
+            if prompt_tokens:
+                cached_tokens = sum(d['cached_tokens'] or 0 for d in items)
+                lines.append(f'opendungeon_prompt_cache_ratio{{kind="{kind}",name="{name}"}} '
+                             f'{cached_tokens / prompt_tokens:.4f}')
+
+        lines.append("# HELP opendungeon_calls_total Calls by outcome")
+        lines.append("# TYPE opendungeon_calls_total counter")
+        for (kind, name, model, outcome), count in sorted(self._calls.items()):
+            lines.append(
+                f'opendungeon_calls_total{{kind="{kind}",name="{name}",model="{model}",outcome="{outcome}"}} {count}'
+            )
+
+        try:
+            tmp_path = self.prom_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            os.replace(tmp_path, self.prom_path)
+        except OSError as e:
+            print(f"Error writing Prometheus metrics: {e}")
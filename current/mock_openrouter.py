@@ -0,0 +1,446 @@
+"""Local OpenRouter-compatible server for offline benchmarking.
+
+Serves /api/v1/chat/completions (plain and SSE streaming) and /api/v1/models.
+Three modes:
+
+  synthetic  deterministic generated replies with a configurable latency profile
+  record     proxy to the real API and append every exchange to a cassette file
+  replay     answer from a cassette; identical requests get identical responses
+
+Point the game at it with "openrouter": {"base_url": "http://127.0.0.1:8765/api/v1"}
+in config.json, or the OPENROUTER_BASE_URL environment variable.
+
+    python current/mock_openrouter.py --mode synthetic --ttfb 0.4 --tokens-per-sec 40
+    python current/mock_openrouter.py --mode record --cassette cassettes/session.jsonl
+    python current/mock_openrouter.py --mode replay --cassette cassettes/session.jsonl
+"""
+import os
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import requests
+
+
+API_PREFIX = '/api/v1'
+UPSTREAM_URL = 'https://openrouter.ai/api/v1'
+
+WORDS = (
+    "the torchlight flickers across ancient stone as a cold wind carries whispers "
+    "from the depths below your party presses onward through the ruined hall where "
+    "shadows gather and something stirs beyond the broken archway roll for perception "
+    "DC 14 goblin blade strikes shield glints dragon ember tavern keeper grins"
+).split()
+
+DEFAULT_MODELS = [
+    "meta-llama/llama-3.3-70b-instruct",
+    "meta-llama/llama-3.3-70b-instruct:free",
+    "qwen/qwen2.5-vl-72b-instruct:free",
+    "microsoft/phi-3-medium-128k-instruct:free"
+]
+
+
+class LatencyProfile:
+    """Time to first token, token rate and jitter for synthetic responses"""
+
+    def __init__(self, ttfb: float = 0.3, tokens_per_sec: float = 50.0, jitter: float = 0.0,
+                 reply_tokens: int = 80):
+        self.ttfb = ttfb
+        self.tokens_per_sec = tokens_per_sec
+        self.jitter = jitter
+        self.reply_tokens = reply_tokens
+
+    def first_token_delay(self, rng: random.Random) -> float:
+        return max(0.0, self.ttfb + rng.uniform(-self.jitter, self.jitter))
+
+    def token_delay(self) -> float:
+        return 1.0 / self.tokens_per_sec if self.tokens_per_sec > 0 else 0.0
+
+
+def request_key(method: str, path: str, body: Optional[dict]) -> str:
+    """Stable hash of a request; used to match replays to recordings"""
+    payload = json.dumps({"method": method, "path": path, "body": body or {}},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    """Append-only JSONL of recorded exchanges.
+
+    Each entry is {key, method, path, request, status, headers, body} for plain
+    responses or {..., events: [[delay, line], ...]} for streams. Repeated
+    identical requests replay their recordings in order, then repeat the last.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries: Dict[str, deque] = {}
+        self.last: Dict[str, dict] = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                self.entries.setdefault(entry['key'], deque()).append(entry)
+
+    def append(self, entry: dict):
+        with self.lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.entries.setdefault(entry['key'], deque()).append(entry)
+
+    def next(self, key: str) -> Optional[dict]:
+        with self.lock:
+            queue = self.entries.get(key)
+            if queue:
+                self.last[key] = queue.popleft()
+            return self.last.get(key)
+
+
+class MockOpenRouterServer:
+    """Threaded mock server; run it from the CLI or start() it in-process for benchmarks"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, mode: str = 'synthetic',
+                 cassette: Optional[str] = None, profile: Optional[LatencyProfile] = None,
+                 replay_speed: float = 1.0, upstream: str = UPSTREAM_URL,
+                 models: Optional[List[str]] = None, seed: int = 0):
+        if mode not in ('synthetic', 'record', 'replay'):
+            raise Exception(f"Unknown mock server mode: {mode}")
+        if mode != 'synthetic' and not cassette:
+            raise Exception(f"Mode '{mode}' needs a cassette file")
+
+        self.mode = mode
+        self.cassette = Cassette(cassette) if cassette else None
+        self.profile = profile or LatencyProfile()
+        self.replay_speed = replay_speed
+        self.upstream = upstream.rstrip('/')
+        self.models = models or DEFAULT_MODELS
+        self.seed = seed
+        self.upstream_session = requests.Session() if mode == 'record' else None
+        # Message-list prefixes already "seen", to report prefix-cache hits like a provider
+        self.seen_prefixes = set()
+        self.prefix_lock = threading.Lock()
+
+        handler = type('MockHandler', (_MockHandler,), {'server_state': self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> str:
+        """Serve on a background thread and return the base URL"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def serve_forever(self):
+        print(f"Mock OpenRouter ({self.mode}) listening on {self.base_url}")
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.upstream_session:
+            self.upstream_session.close()
+
+    def sleep(self, seconds: float):
+        if seconds > 0 and self.replay_speed > 0:
+            time.sleep(seconds / self.replay_speed)
+
+    # Synthetic responses
+
+    def synthetic_text(self, key: str, max_tokens: Optional[int]) -> List[str]:
+        rng = random.Random(f"{self.seed}:{key}")
+        count = min(self.profile.reply_tokens, max_tokens or self.profile.reply_tokens)
+        tokens = [rng.choice(WORDS) for _ in range(max(1, count))]
+        tokens[0] = tokens[0].capitalize()
+        return [tokens[0]] + [' ' + t for t in tokens[1:]] + ['.']
+
+    @staticmethod
+    def synthetic_json(tokens: List[str]) -> List[str]:
+        """Wrap synthetic prose as a dm_turn JSON reply, split like a real stream"""
+        narrative = [json.dumps(t)[1:-1] for t in tokens]
+        return (['{"narrative": "'] + narrative +
+                ['", "damage": [], "roll_request": null, "npc_actions": []}'])
+
+    @staticmethod
+    def synthetic_tool_calls(body: dict, key: str) -> Optional[List[dict]]:
+        """Call the first argument-free tool once per conversation, then narrate"""
+        if body.get('stream') or body.get('tool_choice') == 'none':
+            return None
+        if any(m.get('role') == 'tool' for m in body.get('messages', [])):
+            return None
+        for tool in body.get('tools') or []:
+            function = tool.get('function', {})
+            if not function.get('parameters', {}).get('required'):
+                return [{"id": f"call-mock-{key[:8]}", "type": "function",
+                         "function": {"name": function.get('name'), "arguments": "{}"}}]
+        return None
+
+    def cached_tokens(self, body: dict) -> int:
+        """Tokens of the longest leading run of messages sent before, then remember this one"""
+        digest = hashlib.sha256()
+        cached_chars = chars = 0
+        with self.prefix_lock:
+            for message in body.get('messages', []):
+                digest.update(json.dumps(message, sort_keys=True).encode('utf-8'))
+                chars += len(str(message.get('content', '')))
+                prefix = digest.hexdigest()
+                if prefix in self.seen_prefixes and cached_chars == chars - len(str(message.get('content', ''))):
+                    cached_chars = chars
+                self.seen_prefixes.add(prefix)
+        return cached_chars // 4
+
+    @staticmethod
+    def prompt_tokens(body: dict) -> int:
+        # Rough 4-characters-per-token estimate, close enough for load tests
+        text = ''.join(str(m.get('content', '')) for m in body.get('messages', []))
+        return max(1, len(text) // 4)
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    server_state: MockOpenRouterServer = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch('GET', None)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw or b'{}')
+        except json.JSONDecodeError:
+            self.send_json(400, {"error": {"code": 400, "message": "Invalid JSON body"}})
+            return
+        self.dispatch('POST', body)
+
+    def dispatch(self, method: str, body: Optional[dict]):
+        if not self.path.startswith(API_PREFIX):
+            self.send_json(404, {"error": {"code": 404, "message": f"Unknown path {self.path}"}})
+            return
+        path = self.path[len(API_PREFIX):]
+        state = self.server_state
+        key = request_key(method, path, body)
+
+        if state.mode == 'replay':
+            entry = state.cassette.next(key)
+            if entry is None:
+                # 400 rather than 404/5xx so the client neither retries nor fails over
+                self.send_json(400, {"error": {"code": 400, "message": f"No cassette entry for {method} {path}"}})
+            else:
+                self.replay(entry)
+        elif state.mode == 'record':
+            self.record(method, path, body, key)
+        elif path == '/models' and method == 'GET':
+            self.send_json(200, {"data": [{"id": m, "name": m, "context_length": 32768,
+                                           "supported_parameters": ["max_tokens", "temperature",
+                                                                    "response_format", "structured_outputs"]}
+                                          for m in state.models]})
+        elif path == '/chat/completions' and method == 'POST':
+            self.synthesize(body, key)
+        else:
+            self.send_json(404, {"error": {"code": 404, "message": f"Unknown endpoint {method} {path}"}})
+
+    # Response helpers
+
+    def send_json(self, status: int, data, headers: Optional[dict] = None):
+        payload = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def start_stream(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        # No Content-Length: close the connection to end the stream
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+    def send_event(self, line: str):
+        self.wfile.write((line + '\n\n').encode('utf-8'))
+        self.wfile.flush()
+
+    # Modes
+
+    def synthesize(self, body: dict, key: str):
+        state = self.server_state
+        rng = random.Random(f"{state.seed}:{key}")
+        model = body.get('model', '')
+        tokens = state.synthetic_text(key, body.get('max_tokens'))
+        if body.get('response_format'):
+            tokens = state.synthetic_json(tokens)
+        usage = {
+            "prompt_tokens": state.prompt_tokens(body),
+            "completion_tokens": len(tokens),
+            "total_tokens": state.prompt_tokens(body) + len(tokens),
+            "prompt_tokens_details": {"cached_tokens": state.cached_tokens(body)}
+        }
+        completion_id = f"gen-mock-{key[:16]}"
+
+        state.sleep(state.profile.first_token_delay(rng))
+        tool_calls = state.synthetic_tool_calls(body, key)
+        if tool_calls:
+            self.send_json(200, {
+                "id": completion_id,
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": "tool_calls",
+                             "message": {"role": "assistant", "content": "", "tool_calls": tool_calls}}],
+                "usage": usage
+            })
+            return
+        if not body.get('stream'):
+            state.sleep(state.profile.token_delay() * len(tokens))
+            self.send_json(200, {
+                "id": completion_id,
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": ''.join(tokens)}}],
+                "usage": usage
+            })
+            return
+
+        self.start_stream()
+        try:
+            self.send_event(": OPENROUTER PROCESSING")
+            for i, token in enumerate(tokens):
+                if i:
+                    state.sleep(state.profile.token_delay())
+                self.send_event("data: " + json.dumps({
+                    "id": completion_id, "model": model,
+                    "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+                }))
+            self.send_event("data: " + json.dumps({
+                "id": completion_id, "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                "usage": usage
+            }))
+            self.send_event("data: [DONE]")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client cancelled the turn mid-stream
+            pass
+
+    def replay(self, entry: dict):
+        state = self.server_state
+        if 'events' not in entry:
+            state.sleep(entry.get('elapsed', 0.0))
+            self.send_json(entry['status'], entry['body'], entry.get('headers'))
+            return
+
+        self.start_stream()
+        try:
+            for delay, line in entry['events']:
+                state.sleep(delay)
+                self.send_event(line)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def record(self, method: str, path: str, body: Optional[dict], key: str):
+        state = self.server_state
+        headers = {"Authorization": self.headers.get('Authorization')
+                   or f"Bearer {os.getenv('OPENROUTER_API_KEY')}"}
+        for name in ('HTTP-Referer', 'X-Title'):
+            if self.headers.get(name):
+                headers[name] = self.headers.get(name)
+        entry = {"key": key, "method": method, "path": path, "request": body}
+        stream = bool(body and body.get('stream'))
+
+        started = time.perf_counter()
+        try:
+            response = state.upstream_session.request(
+                method, state.upstream + path, json=body, headers=headers,
+                stream=stream, timeout=(5, 300)
+            )
+        except requests.exceptions.RequestException as e:
+            self.send_json(502, {"error": {"code": 502, "message": f"Upstream error: {e}"}})
+            return
+
+        if not stream or response.status_code != 200:
+            entry.update({
+                "status": response.status_code,
+                "elapsed": time.perf_counter() - started,
+                "headers": {k: v for k, v in response.headers.items() if k.lower() == 'retry-after'},
+                "body": response.json() if response.content else {}
+            })
+            state.cassette.append(entry)
+            self.send_json(entry['status'], entry['body'], entry['headers'])
+            return
+
+        events = []
+        last = started
+        self.start_stream()
+        try:
+            response.encoding = 'utf-8'
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    continue
+                now = time.perf_counter()
+                events.append([now - last, line])
+                last = now
+                self.send_event(line)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            response.close()
+            entry.update({"status": 200, "events": events})
+            state.cassette.append(entry)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenRouter-compatible mock server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--mode', choices=['synthetic', 'record', 'replay'], default='synthetic')
+    parser.add_argument('--cassette', help="JSONL cassette to record to / replay from")
+    parser.add_argument('--ttfb', type=float, default=0.3, help="Synthetic time to first token (s)")
+    parser.add_argument('--tokens-per-sec', type=float, default=50.0, help="Synthetic token rate")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Random +/- seconds added to TTFB")
+    parser.add_argument('--reply-tokens', type=int, default=80, help="Synthetic reply length")
+    parser.add_argument('--replay-speed', type=float, default=1.0,
+                        help="Divide recorded/synthetic delays by this; 0 disables delays")
+    parser.add_argument('--upstream', default=UPSTREAM_URL, help="Real API base URL for record mode")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockOpenRouterServer(
+        host=args.host, port=args.port, mode=args.mode, cassette=args.cassette,
+        profile=LatencyProfile(args.ttfb, args.tokens_per_sec, args.jitter, args.reply_tokens),
+        replay_speed=args.replay_speed, upstream=args.upstream, seed=args.seed
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
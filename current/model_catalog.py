@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional
+
+
+class ModelCatalog:
+    """Last known OpenRouter /models listing, persisted so startup never waits on the network.
+
+    The catalog is served from disk immediately and refreshed in the background
+    once it is older than the TTL. filter() keeps a lowercase search index and
+    narrows the previous result when the query only grew, so typing stays
+    instant over a few hundred models.
+    """
+
+    DEFAULT_TTL = 6 * 3600
+
+    def __init__(self, path: str, api_client, config: Optional[dict] = None):
+        config = config or {}
+        self.path = path
+        self.api_client = api_client
+        self.ttl = float(config.get('ttl', self.DEFAULT_TTL))
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.fetched_at = 0.0
+        self.models: List[Dict] = []
+        self.by_id: Dict[str, Dict] = {}
+        self._index: List[tuple] = []
+        self._last_query = None
+        self._last_result: List[tuple] = []
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._set_models(data.get('models', []), data.get('fetched_at', 0.0))
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def save(self):
+        """Write atomically so a crash never leaves a half-written catalog"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with self.lock:
+                data = {'fetched_at': self.fetched_at, 'models': self.models}
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving model catalog: {e}")
+
+    @staticmethod
+    def _normalize(raw: Dict) -> Dict:
+        """Keep only the metadata the UI uses from a raw /models entry"""
+        pricing = raw.get('pricing') or {}
+        prompt_price = pricing.get('prompt')
+        completion_price = pricing.get('completion')
+        model_id = raw.get('id', '')
+        free = model_id.endswith(':free') or (
+            str(prompt_price) in ('0', '0.0') and str(completion_price) in ('0', '0.0')
+        )
+        return {
+            'id': model_id,
+            'name': raw.get('name', model_id),
+            'context_length': raw.get('context_length'),
+            'pricing': {'prompt': prompt_price, 'completion': completion_price},
+            'free': free,
+            'supported_parameters': raw.get('supported_parameters')
+        }
+
+    def _set_models(self, models: List[Dict], fetched_at: float):
+        models = sorted((m for m in models if m.get('id')), key=lambda m: m['id'])
+        index = [(f"{m['id']} {m.get('name', '')}".lower(), m['id'], m.get('free', False))
+                 for m in models]
+        with self.lock:
+            self.models = models
+            self.by_id = {m['id']: m for m in models}
+            self.fetched_at = fetched_at
+            self._index = index
+            self._last_query = None
+            self._last_result = []
+
+    def is_stale(self) -> bool:
+        return not self.models or time.time() - self.fetched_at >= self.ttl
+
+    def refresh(self, force: bool = False) -> bool:
+        """Fetch /models if stale (or forced). Returns True if the catalog changed.
+
+        Safe to call from several workers at once; only one fetch runs.
+        """
+        with self.refresh_lock:
+            if not force and not self.is_stale():
+                return False
+            raw_models = self.api_client.list_models(use_cache=False)
+            models = [self._normalize(m) for m in raw_models]
+            if not models:
+                # Keep the last good catalog rather than replacing it with nothing
+                return False
+            with self.lock:
+                changed = [m['id'] for m in models] != [m['id'] for m in self.models]
+            self._set_models(models, time.time())
+            self.save()
+            return changed
+
+    def ids(self) -> List[str]:
+        with self.lock:
+            return [m['id'] for m in self.models]
+
+    def get(self, model_id: str) -> Optional[Dict]:
+        with self.lock:
+            return self.by_id.get(model_id)
+
+    def supports(self, model_id: str, parameter: str) -> Optional[bool]:
+        """Whether OpenRouter lists parameter for the model; None if unknown"""
+        model = self.get(model_id)
+        if not model or model.get('supported_parameters') is None:
+            return None
+        return parameter in model['supported_parameters']
+
+    def filter(self, text: str, free_only: bool = False) -> List[str]:
+        """Ids whose id or name contains every whitespace-separated term of text"""
+        query = text.strip().lower()
+        with self.lock:
+            if self._last_query is not None and query.startswith(self._last_query):
+                # Query only grew, so every new match is among the previous matches
+                candidates = self._last_result
+            else:
+                candidates = self._index
+            terms = query.split()
+            result = [entry for entry in candidates if all(t in entry[0] for t in terms)]
+            self._last_query = query
+            self._last_result = result
+        return [model_id for _, model_id, free in result if free or not free_only]
@@ -1,10 +1,12 @@
 import os
 import json
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from npc_memory import NPCMemoryStore, default_embedder, safe_name
 
 class NPCManager:
-    def __init__(self, base_path: str = None):
+    def __init__(self, base_path: str = None, memory_config: Optional[dict] = None):
         if base_path is None:
             # Get the path relative to the current script
             base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,6 +18,13 @@ class NPCManager:
         # Create necessary directories
         for path in [self.npc_path, self.memory_path, self.models_path]:
             os.makedirs(path, exist_ok=True)
+        
+        # Embedding-backed memory stores, one per NPC, created on first use
+        self.memory_config = memory_config or {}
+        self.embedder = None
+        self._stores = {}
+        self._stores_lock = threading.Lock()
+        self._embedder_lock = threading.Lock()
     
     def save_npc_model(self, npc_name: str, model: str):
         """Save the model preference for an NPC"""
@@ -33,36 +42,45 @@ class NPCManager:
         except (FileNotFoundError, json.JSONDecodeError):
             return default_model
     
+    def get_embedder(self):
+        with self._embedder_lock:
+            if self.embedder is None:
+                self.embedder = default_embedder(self.memory_config)
+            return self.embedder
+
+    def memory_store(self, npc_name: str) -> NPCMemoryStore:
+        """The NPC's memory store, opened once per session"""
+        key = safe_name(npc_name)
+        with self._stores_lock:
+            if key not in self._stores:
+                self._stores[key] = NPCMemoryStore(os.path.join(self.memory_path, key), self.get_embedder())
+            return self._stores[key]
+
     def save_npc_memory(self, npc_name: str, memory_type: str, content: Dict):
-        """Save a memory entry for an NPC"""
-        # Sanitize the NPC name for file system
-        safe_name = "".join(c for c in npc_name if c.isalnum() or c in ('-', '_'))
-        npc_memory_path = os.path.join(self.memory_path, safe_name)
-        os.makedirs(npc_memory_path, exist_ok=True)
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = os.path.join(npc_memory_path, f"{memory_type}_{timestamp}.json")
-        
-        with open(filepath, 'w') as f:
-            json.dump({
-                "timestamp": datetime.now().isoformat(),
-                "type": memory_type,
-                "content": content
-            }, f, indent=2)
+        """Save a memory entry for an NPC (content['text'] is what gets embedded)"""
+        self.memory_store(npc_name).add(memory_type, content)
     
     def get_npc_memories(self, npc_name: str, memory_type: Optional[str] = None) -> List[Dict]:
         """Get all memories for an NPC, optionally filtered by type"""
-        npc_memory_path = os.path.join(self.memory_path, npc_name.lower())
-        if not os.path.exists(npc_memory_path):
+        return [
+            {"timestamp": entry['timestamp'], "type": entry['type'], "content": entry['content']}
+            for entry in self.memory_store(npc_name).all()
+            if not memory_type or entry['type'] == memory_type
+        ]
+
+    def search_memories(self, npc_names: List[str], queries: List[str], k: int = 3,
+                        max_turn: Optional[int] = None) -> List[Tuple[str, float, Dict]]:
+        """The k memories across npc_names most similar to any of the query texts.
+
+        The queries are embedded once and searched as one batch per NPC.
+        """
+        queries = [q for q in queries if q]
+        if not npc_names or not queries or k <= 0:
             return []
-        
-        memories = []
-        for filename in os.listdir(npc_memory_path):
-            if filename.endswith('.json'):
-                if memory_type and not filename.startswith(f"{memory_type}_"):
-                    continue
-                    
-                with open(os.path.join(npc_memory_path, filename), 'r') as f:
-                    memories.append(json.load(f))
-        
-        return sorted(memories, key=lambda x: x['timestamp'])
+        query_vectors = self.get_embedder().encode(queries)
+        results = []
+        for name in npc_names:
+            for score, entry in self.memory_store(name).search(query_vectors, k, max_turn=max_turn):
+                results.append((name, score, entry))
+        results.sort(key=lambda item: -item[1])
+        return results[:k]
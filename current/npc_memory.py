@@ -0,0 +1,308 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import importlib.util
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def safe_name(npc_name: str) -> str:
+    """Directory name for an NPC (the sanitizing save_npc_memory has always used)"""
+    return "".join(c for c in npc_name if c.isalnum() or c in ('-', '_'))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class SentenceEmbedder:
+    """sentence-transformers model, loaded on first use (or by warm_up)"""
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+        self.model_name = model_name
+        self.name = f"st-{model_name}"
+        self._model = None
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        with self._lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self.warm_up().encode(list(texts), convert_to_numpy=True, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class HashingEmbedder:
+    """Dependency-free fallback: signed feature hashing of words and word pairs"""
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def warm_up(self):
+        return None
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = re.findall(r"[a-z0-9']+", text.lower())
+            for token in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                h = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+                vectors[row, h % self.dim] += 1.0 if h >> 63 else -1.0
+        return _normalize(vectors)
+
+
+def default_embedder(config: Optional[dict] = None):
+    """sentence-transformers when installed, hashing otherwise"""
+    config = config or {}
+    if importlib.util.find_spec('sentence_transformers') is None:
+        print("sentence-transformers not installed; NPC memory falls back to hashed word embeddings")
+        return HashingEmbedder()
+    return SentenceEmbedder(config.get('embedding_model', 'all-MiniLM-L6-v2'))
+
+
+class NPCMemoryStore:
+    """One NPC's memories: an append-only JSONL log plus a float32 vector file.
+
+    Row i of vectors.f32 is the L2-normalized embedding of log entry i and
+    is memory-mapped for search, so cosine similarity is a dot product.
+    Stores larger than EXACT_LIMIT are searched in two steps: Hamming
+    distance on in-memory sign bits (column-major, so numpy's popcount runs
+    over contiguous words) picks CANDIDATES rows per query, and exact
+    cosine on just those rows ranks them. That keeps a 100k-memory search
+    at a couple of milliseconds instead of a full 100k x dim matmul.
+    """
+
+    EXACT_LIMIT = 4096
+    CANDIDATES = 256
+
+    def __init__(self, path: str, embedder):
+        self.path = path
+        self.log_path = os.path.join(path, 'log.jsonl')
+        self.vectors_path = os.path.join(path, 'vectors.f32')
+        self.meta_path = os.path.join(path, 'meta.json')
+        self.embedder = embedder
+        self.lock = threading.RLock()
+        self.entries = None
+        self.dim = None
+        self._matrix = None
+        self._bits = None
+        self._bit_rows = 0
+
+    # Loading
+
+    def _load(self):
+        if self.entries is not None:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        self.entries = self._read_log()
+        if not self.entries:
+            self._import_legacy_files()
+
+        meta = {}
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        if meta.get('embedder') != self.embedder.name or not meta.get('dim'):
+            # New store or a different embedding model: embed the whole log again
+            self._write_vectors(0, self._embed_entries(self.entries))
+            return
+
+        self.dim = meta['dim']
+        rows = os.path.getsize(self.vectors_path) // (4 * self.dim) if os.path.exists(self.vectors_path) else 0
+        if rows > len(self.entries):
+            # Crashed after the vector write but before the log line: drop the orphan rows
+            with open(self.vectors_path, 'r+b') as f:
+                f.truncate(len(self.entries) * 4 * self.dim)
+        elif rows < len(self.entries):
+            self._write_vectors(rows, self._embed_entries(self.entries[rows:]))
+            return
+        self._rebuild_bits()
+
+    def _read_log(self) -> List[Dict]:
+        entries = []
+        if not os.path.exists(self.log_path):
+            return entries
+        good_bytes = 0
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A torn final line from a crash: cut it so the next append starts clean
+                    with open(self.log_path, 'r+b') as log:
+                        log.truncate(good_bytes)
+                    break
+                good_bytes += len(line)
+        return entries
+
+    def _import_legacy_files(self):
+        """Fold the old one-JSON-file-per-memory layout into the log"""
+        legacy = []
+        for filename in os.listdir(self.path):
+            if filename.endswith('.json') and filename != 'meta.json':
+                try:
+                    with open(os.path.join(self.path, filename), 'r', encoding='utf-8') as f:
+                        legacy.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        for memory in sorted(legacy, key=lambda m: m.get('timestamp', '')):
+            self._append_log(memory.get('type', 'memory'), memory.get('content'), memory.get('timestamp'))
+
+    def _embed_entries(self, entries: List[Dict]) -> np.ndarray:
+        texts = [entry['text'] for entry in entries]
+        return self.embedder.encode(texts) if texts else None
+
+    def _write_vectors(self, start_row: int, vectors: Optional[np.ndarray]):
+        """Write vectors from start_row on (truncating), record the embedder, rebuild the bits"""
+        if vectors is not None:
+            self.dim = vectors.shape[1]
+        mode = 'r+b' if start_row and os.path.exists(self.vectors_path) else 'wb'
+        with open(self.vectors_path, mode) as f:
+            if self.dim:
+                f.seek(start_row * 4 * self.dim)
+                f.truncate()
+            if vectors is not None:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        if self.dim:
+            with open(self.meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'embedder': self.embedder.name, 'dim': self.dim}, f)
+        self._matrix = None
+        self._rebuild_bits()
+
+    # Writing
+
+    def _append_log(self, memory_type: str, content, timestamp: Optional[str] = None) -> Dict:
+        if isinstance(content, dict):
+            text = str(content.get('text') or json.dumps(content))
+            turn = content.get('turn')
+        else:
+            text, turn = str(content), None
+        entry = {
+            'id': len(self.entries),
+            'timestamp': timestamp or datetime.now().isoformat(),
+            'type': memory_type,
+            'text': text,
+            'turn': turn,
+            'content': content
+        }
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        self.entries.append(entry)
+        return entry
+
+    def add(self, memory_type: str, content) -> Dict:
+        """Append one memory; content is a dict (its 'text' is embedded) or a string"""
+        text = str(content.get('text') or json.dumps(content)) if isinstance(content, dict) else str(content)
+        vector = self.embedder.encode([text])  # outside the lock, it's the slow part
+        with self.lock:
+            self._load()
+            entry = self._append_log(memory_type, content)
+            if self.dim != vector.shape[1]:
+                self._write_vectors(0, self._embed_entries(self.entries))
+                return entry
+            with open(self.vectors_path, 'ab') as f:
+                f.write(vector.astype(np.float32).tobytes())
+            self._matrix = None
+            self._append_bits(vector)
+            return entry
+
+    def all(self) -> List[Dict]:
+        with self.lock:
+            self._load()
+            return list(self.entries)
+
+    # Sign bits for the candidate pass
+
+    def _pack(self, vectors: np.ndarray) -> np.ndarray:
+        packed = np.packbits(vectors > 0, axis=1)
+        pad = (-packed.shape[1]) % 8
+        if pad:
+            packed = np.pad(packed, ((0, 0), (0, pad)))
+        return np.ascontiguousarray(packed).view(np.uint64).T
+
+    def _rebuild_bits(self):
+        self._bits = None
+        self._bit_rows = 0
+        matrix = self.matrix()
+        for start in range(0, len(matrix), 8192):
+            self._append_bits(np.asarray(matrix[start:start + 8192]))
+
+    def _append_bits(self, vectors: np.ndarray):
+        words = self._pack(vectors)
+        needed = self._bit_rows + words.shape[1]
+        if self._bits is None or needed > self._bits.shape[1]:
+            capacity = max(needed, 2 * (self._bits.shape[1] if self._bits is not None else 1024))
+            grown = np.zeros((words.shape[0], capacity), dtype=np.uint64)
+            if self._bits is not None:
+                grown[:, :self._bit_rows] = self._bits[:, :self._bit_rows]
+            self._bits = grown
+        self._bits[:, self._bit_rows:needed] = words
+        self._bit_rows = needed
+
+    # Reading
+
+    def matrix(self) -> np.ndarray:
+        """Memory-mapped (count, dim) vectors, reopened after appends"""
+        self._load()
+        if self._matrix is None or len(self._matrix) != len(self.entries):
+            if not self.entries or not self.dim:
+                return np.zeros((0, self.dim or 1), dtype=np.float32)
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                     shape=(len(self.entries), self.dim))
+        return self._matrix
+
+    def _candidates(self, queries: np.ndarray) -> np.ndarray:
+        """Union of the ~CANDIDATES nearest rows (by sign-bit Hamming distance) per query"""
+        bits = self._bits[:, :self._bit_rows]
+        query_bits = self._pack(queries)
+        chosen = []
+        for q in range(queries.shape[0]):
+            distance = np.bitwise_count(bits[0] ^ query_bits[0, q]).astype(np.uint16)
+            for word in range(1, bits.shape[0]):
+                distance += np.bitwise_count(bits[word] ^ query_bits[word, q])
+            # Distances are small integers: a histogram threshold beats argpartition
+            cumulative = np.cumsum(np.bincount(distance))
+            threshold = int(np.searchsorted(cumulative, self.CANDIDATES))
+            chosen.append(np.flatnonzero(distance <= threshold))
+        return np.unique(np.concatenate(chosen))
+
+    def search(self, queries: np.ndarray, k: int = 3, max_turn: Optional[int] = None) -> List[Tuple[float, Dict]]:
+        """Top-k memories by best cosine similarity to any of the (normalized) query rows"""
+        with self.lock:
+            self._load()
+            matrix = self.matrix()
+            if not len(matrix) or queries.shape[1] != self.dim:
+                return []
+            if len(matrix) > self.EXACT_LIMIT and hasattr(np, 'bitwise_count'):
+                rows = self._candidates(queries)
+                scores = (matrix[rows] @ queries.T).max(axis=1)
+            else:
+                rows = np.arange(len(matrix))
+                scores = (np.asarray(matrix) @ queries.T).max(axis=1)
+
+            # Over-fetch a little so filtered-out recent memories don't leave gaps
+            wanted = min(len(rows), k * 4)
+            top = np.argpartition(-scores, wanted - 1)[:wanted]
+            results = []
+            for index in top[np.argsort(-scores[top])]:
+                entry = self.entries[int(rows[index])]
+                if max_turn is not None and entry.get('turn') is not None and entry['turn'] > max_turn:
+                    continue
+                results.append((float(scores[index]), entry))
+                if len(results) >= k:
+                    break
+            return results
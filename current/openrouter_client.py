@@ -0,0 +1,217 @@
+import os
+import json
+import time
+import requests
+from contextlib import nullcontext
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterator, List, Optional
+from resilience import RETRYABLE_STATUSES, backoff_delay, parse_retry_after
+from metrics import CallRecord
+
+
+class OpenRouterError(Exception):
+    """Raised when OpenRouter returns a non-200 response"""
+    def __init__(self, message: str, status_code: Optional[int] = None, body: str = "",
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+        self.retry_after = retry_after
+
+
+class OpenRouterClient:
+    """Shared, pooled HTTP client for every OpenRouter call in the app"""
+
+    DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+    DEFAULT_CONNECT_TIMEOUT = 5.0
+    DEFAULT_READ_TIMEOUT = 120.0
+    DEFAULT_POOL_SIZE = 8
+    DEFAULT_MAX_RETRIES = 2
+    DEFAULT_BACKOFF_BASE = 1.0
+    DEFAULT_BACKOFF_MAX = 20.0
+
+    def __init__(self, config: dict, cache=None, metrics=None):
+        settings = config.get('openrouter', {})
+        self.cache = cache
+        self.metrics = metrics
+        # OPENROUTER_BASE_URL lets benchmarks point at mock_openrouter.py without editing config
+        self.base_url = (
+            os.getenv('OPENROUTER_BASE_URL') or settings.get('base_url', self.DEFAULT_BASE_URL)
+        ).rstrip('/')
+        self.timeout = (
+            float(settings.get('connect_timeout', self.DEFAULT_CONNECT_TIMEOUT)),
+            float(settings.get('read_timeout', self.DEFAULT_READ_TIMEOUT))
+        )
+        pool_size = int(settings.get('pool_size', self.DEFAULT_POOL_SIZE))
+        self.max_retries = int(settings.get('max_retries', self.DEFAULT_MAX_RETRIES))
+        self.backoff_base = float(settings.get('backoff_base', self.DEFAULT_BACKOFF_BASE))
+        self.backoff_max = float(settings.get('backoff_max', self.DEFAULT_BACKOFF_MAX))
+
+        # One keep-alive session so every turn reuses the same TCP+TLS connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._api_key = None
+        self.refresh_headers()
+
+    def refresh_headers(self):
+        """Build the request headers once; rebuilt only when the API key changes"""
+        self._api_key = os.getenv('OPENROUTER_API_KEY')
+        self.session.headers.update({
+            "Authorization": f"Bearer {self._api_key}",
+            "HTTP-Referer": "https://github.com/your-repo",
+            "X-Title": "TD-LLM-DND",
+            "Content-Type": "application/json"
+        })
+
+    def _check_headers(self):
+        # The Settings tab can save a new key into the environment at runtime
+        if os.getenv('OPENROUTER_API_KEY') != self._api_key:
+            self.refresh_headers()
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _instrument(self, name: str, model: str = ''):
+        if self.metrics:
+            return self.metrics.call('llm', name, model)
+        return nullcontext(CallRecord('llm', name, model))
+
+    def _send(self, method: str, path: str, record: Optional[CallRecord] = None, **kwargs) -> requests.Response:
+        """Send a request, retrying transient failures with jittered exponential backoff.
+
+        Retry-After is honored when the server sends it; if it asks for a longer
+        wait than backoff_max we give up so the caller can fail over to another
+        model instead of stalling the turn. Returns only 200 responses.
+        """
+        self._check_headers()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, self._url(path), timeout=self.timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ConnectTimeout) as e:
+                # Read timeouts are not retried: the model already had its full deadline
+                if attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+                print(f"Connection error ({e}), retrying in {delay:.1f}s")
+            else:
+                if response.status_code == 200:
+                    if record is not None:
+                        # elapsed stops at the response headers of the final attempt
+                        record.ttfb = response.elapsed.total_seconds()
+                        record.extra['attempts'] = attempt + 1
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                error = OpenRouterError(
+                    f"API error: {response.status_code} - {response.text}",
+                    status_code=response.status_code,
+                    body=response.text,
+                    retry_after=retry_after
+                )
+                response.close()
+                if (response.status_code not in RETRYABLE_STATUSES
+                        or attempt >= self.max_retries
+                        or (retry_after is not None and retry_after > self.backoff_max)):
+                    raise error
+
+                delay = retry_after if retry_after is not None else backoff_delay(
+                    attempt, self.backoff_base, self.backoff_max
+                )
+                print(f"API error {response.status_code}, retrying in {delay:.1f}s")
+
+            time.sleep(delay)
+            attempt += 1
+
+    def chat_completion(self, model: str, messages: List[Dict], call_type: Optional[str] = None, **params) -> dict:
+        """POST /chat/completions and return the decoded JSON body.
+
+        call_type tags the request for the response cache; only call types the
+        cache is configured for are looked up or stored.
+        """
+        with self._instrument(call_type or 'chat', model) as record:
+            cache_key = None
+            if self.cache and self.cache.enabled_for(call_type):
+                cache_key = self.cache.make_key(model, messages, params)
+                cached = self.cache.get(call_type, cache_key)
+                if cached is not None:
+                    record.outcome = 'cache_hit'
+                    return cached
+
+            payload = {"model": model, "messages": messages}
+            payload.update(params)
+
+            response = self._send('POST', 'chat/completions', record=record, json=payload)
+            json_response = response.json()
+            record.set_usage(json_response.get('usage'))
+            if cache_key:
+                self.cache.put(call_type, cache_key, json_response)
+            return json_response
+
+    def stream_chat_completion(self, model: str, messages: List[Dict], **params) -> Iterator[str]:
+        """POST /chat/completions with stream=true and yield content deltas as they arrive"""
+        payload = {"model": model, "messages": messages, "stream": True}
+        payload.update(params)
+
+        with self._instrument('dm_stream', model) as record:
+            try:
+                # No record passed: for streams TTFB is the first token, not the headers
+                with self._send('POST', 'chat/completions', json=payload, stream=True) as response:
+                    # SSE is always UTF-8; requests would otherwise guess ISO-8859-1
+                    response.encoding = 'utf-8'
+                    for line in response.iter_lines(decode_unicode=True):
+                        # Blank keep-alives and ": OPENROUTER PROCESSING" comments
+                        if not line or not line.startswith('data:'):
+                            continue
+                        data = line[5:].strip()
+                        if data == '[DONE]':
+                            break
+                        chunk = json.loads(data)
+                        if 'error' in chunk:
+                            error = chunk['error']
+                            raise OpenRouterError(
+                                f"API error: {error.get('code')} - {error.get('message')}",
+                                status_code=error.get('code'),
+                                body=data
+                            )
+                        # The final chunk carries the usage block
+                        record.set_usage(chunk.get('usage'))
+                        choices = chunk.get('choices') or []
+                        if not choices:
+                            continue
+                        delta = choices[0].get('delta', {}).get('content')
+                        if delta:
+                            record.mark_first_byte()
+                            yield delta
+            except GeneratorExit:
+                # Consumer stopped reading (e.g. the turn was cancelled)
+                record.outcome = 'cancelled'
+                raise
+
+    def list_models(self, use_cache: bool = True) -> List[Dict]:
+        """GET /models and return the raw model entries"""
+        with self._instrument('models') as record:
+            cache_key = None
+            if use_cache and self.cache and self.cache.enabled_for('models'):
+                cache_key = self.cache.make_key(self._url('models'), [])
+                cached = self.cache.get('models', cache_key)
+                if cached is not None:
+                    record.outcome = 'cache_hit'
+                    return cached
+
+            response = self._send('GET', 'models', record=record)
+            models = response.json().get('data', [])
+            if cache_key:
+                self.cache.put('models', cache_key, models)
+            return models
+
+    @staticmethod
+    def message_content(json_response: dict) -> str:
+        """Pull the first choice's message content out of a completion body"""
+        return json_response['choices'][0]['message']['content']
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+import requests
+
+
+# Statuses worth retrying or failing over on: rate limits, timeouts, provider outages,
+# and 404 which OpenRouter returns when a model has no live endpoints
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+MODEL_FAILURE_STATUSES = RETRYABLE_STATUSES | {404}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given 0-based retry attempt"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def is_model_failure(error: Exception) -> bool:
+    """True if the error says this model is unavailable, so another model may succeed"""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    status = getattr(error, 'status_code', None)
+    return status in MODEL_FAILURE_STATUSES
+
+
+class CircuitBreaker:
+    """Per-model breaker: opens after repeated failures, half-opens after a cooldown.
+
+    While half-open a single call at a time is let through as a probe; its
+    outcome closes the breaker or re-opens it for another cooldown.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float,
+                 failures: int = 0, opened_at: Optional[float] = None):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = failures
+        self.opened_at = opened_at
+        self.probing = False  # A probe call is in flight (not persisted)
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.time() - self.opened_at >= self.cooldown:
+            return 'half_open'
+        return 'open'
+
+    def allow(self, force: bool = False) -> bool:
+        """Claim a call; force treats an open breaker as half-open (nothing else to try)"""
+        state = self.state
+        if state == 'closed':
+            return True
+        if (state == 'half_open' or force) and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def release(self):
+        """End a probe that gave no verdict on the model (e.g. a bad request)"""
+        self.probing = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        self.probing = False
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            # A failed half-open probe re-opens for another full cooldown
+            self.opened_at = time.time()
+
+    def to_dict(self) -> dict:
+        return {'failures': self.failures, 'opened_at': self.opened_at}
+
+
+class ModelHealth:
+    """Circuit breakers for every model, persisted so restarts skip known-dead models"""
+
+    def __init__(self, path: str, config: Optional[dict] = None):
+        config = config or {}
+        self.path = path
+        self.failure_threshold = int(config.get('failure_threshold', 3))
+        self.cooldown = float(config.get('cooldown', 300))
+        self.lock = threading.Lock()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for model, state in data.items():
+                self.breakers[model] = CircuitBreaker(
+                    self.failure_threshold, self.cooldown,
+                    failures=state.get('failures', 0),
+                    opened_at=state.get('opened_at')
+                )
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def save(self):
+        """Write atomically so a crash never leaves a half-written health file"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({m: b.to_dict() for m, b in self.breakers.items()}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving model health: {e}")
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        if model not in self.breakers:
+            self.breakers[model] = CircuitBreaker(self.failure_threshold, self.cooldown)
+        return self.breakers[model]
+
+    def order(self, models: List[str]) -> List[str]:
+        """Models whose breaker is not open, in chain order; all of them if every one is open"""
+        with self.lock:
+            available = [m for m in models if self.breaker(m).state != 'open']
+        return available or list(models)
+
+    def acquire(self, model: str, force: bool = False) -> bool:
+        """Claim a call to model; False while its breaker is open or another caller is probing it"""
+        with self.lock:
+            return self.breaker(model).allow(force)
+
+    def release(self, model: str):
+        with self.lock:
+            self.breaker(model).release()
+
+    def record_success(self, model: str):
+        with self.lock:
+            breaker = self.breaker(model)
+            changed = breaker.failures or breaker.opened_at is not None
+            breaker.record_success()
+            if changed:
+                self.save()
+
+    def record_failure(self, model: str):
+        with self.lock:
+            self.breaker(model).record_failure()
+            self.save()
+
+    def status(self) -> Dict[str, str]:
+        with self.lock:
+            return {m: b.state for m, b in self.breakers.items()}
@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+
+class ResponseCache:
+    """On-disk LLM response cache keyed by model, messages and sampling params.
+
+    Caching is opt-in per call type: only call types listed under
+    config['call_types'] (mapped to a TTL in seconds) are stored. The cache is
+    bounded by total payload bytes and evicts least-recently-used entries.
+    """
+
+    DEFAULT_CALL_TYPES = {
+        'scene_prompt': 30 * 24 * 3600,
+        'story_recap': 30 * 24 * 3600,
+        'models': 24 * 3600
+    }
+    DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+    def __init__(self, cache_dir: str, config: Optional[dict] = None):
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.call_types = dict(config.get('call_types', self.DEFAULT_CALL_TYPES))
+        self.max_bytes = int(config.get('max_bytes', self.DEFAULT_MAX_BYTES))
+        self.hits = {}
+        self.misses = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, 'llm_cache.sqlite')
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                call_type TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+        self.conn.commit()
+
+    def enabled_for(self, call_type: Optional[str]) -> bool:
+        return bool(self.enabled and call_type and call_type in self.call_types)
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict], params: Optional[dict] = None) -> str:
+        """Stable hash of everything that affects the completion"""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params or {}},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, call_type: str, key: str):
+        """Return the cached response or None on a miss / expired entry"""
+        if not self.enabled_for(call_type):
+            return None
+        ttl = self.call_types[call_type]
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and (ttl is None or now - row[1] <= ttl):
+                self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+                self.hits[call_type] = self.hits.get(call_type, 0) + 1
+                return json.loads(row[0])
+            if row:
+                # Expired
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+            self.misses[call_type] = self.misses.get(call_type, 0) + 1
+            return None
+
+    def put(self, call_type: str, key: str, response):
+        if not self.enabled_for(call_type):
+            return
+        data = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, call_type, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, call_type, data, len(data.encode('utf-8')), now, now)
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """Drop least-recently-used rows until the cache fits in max_bytes"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def invalidate(self, call_type: Optional[str] = None):
+        """Clear one call type, or everything"""
+        with self.lock:
+            if call_type:
+                self.conn.execute("DELETE FROM responses WHERE call_type = ?", (call_type,))
+            else:
+                self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters and entry counts per call type for this session"""
+        with self.lock:
+            counts = dict(self.conn.execute(
+                "SELECT call_type, COUNT(*) FROM responses GROUP BY call_type"
+            ).fetchall())
+        return {
+            call_type: {
+                'hits': self.hits.get(call_type, 0),
+                'misses': self.misses.get(call_type, 0),
+                'entries': counts.get(call_type, 0)
+            }
+            for call_type in self.call_types
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,120 @@
+import re
+from typing import Iterable, Optional
+
+
+# "attack hits" from the old list is already covered by "hits"
+DAMAGE_INDICATORS = ['hits', 'strikes', 'blast', 'slashes', 'pierces', 'smashes',
+                     'wounds', 'damage']
+INTENSITY_WORDS = ['powerful', 'massive', 'intense']
+ROLL_PHRASES = [
+    "roll a d20", "make a check", "ability check", "skill check", "saving throw",
+    "roll for initiative", "attack roll", "difficulty class",
+    "make a strength check", "make a dexterity check", "make a constitution check",
+    "make a intelligence check", "make a wisdom check", "make a charisma check"
+]
+CASUAL_ROLL_PHRASES = ["ready to roll", "roll with it", "on a roll", "let's roll",
+                       "roll out", "roll along"]
+
+
+class ResponseAnalysis:
+    """Everything process_player_action needs to know about one DM response"""
+    __slots__ = ('damage', 'damage_types', 'intense', 'player_targeted', 'npc_targets',
+                 'roll_phrase', 'casual_roll', 'dc', 'question')
+
+    def __init__(self):
+        self.damage = False
+        self.damage_types = set()
+        self.intense = False
+        self.player_targeted = False
+        self.npc_targets = set()
+        self.roll_phrase = False
+        self.casual_roll = False
+        self.dc = None
+        self.question = False
+
+    @property
+    def roll_requested(self) -> bool:
+        """Same rules as check_for_roll_request: no questions, no casual "roll" idioms"""
+        return (self.roll_phrase or self.dc is not None) and not self.casual_roll and not self.question
+
+
+class ResponseMatcher:
+    """Keyword tables for one party, built once and reused for every DM response.
+
+    analyze() lowercases the response once and answers every question the turn
+    logic has (damage, damage type, intensity, target, roll request, DC) from
+    that copy, skipping the damage lookups entirely when nothing was hit.
+    The tables are lowercase string tuples tested with plain substring checks;
+    benchmarks/bench_response_matcher.py compares this against the old
+    per-check any() chains (about twice as fast, with identical results).
+    """
+
+    DC_VALUE = re.compile(r'\s*:?\s*(\d+)')
+
+    def __init__(self, damage_types: Iterable[str], player_name: Optional[str] = None,
+                 npc_names: Iterable[str] = ()):
+        self.damage_types = tuple(damage_types)
+        self.player_name = player_name
+        self.npc_names = tuple(npc_names)
+
+        # Everything below is lowercased once here instead of on every response
+        player_phrases = ['hitting you', 'strikes you']
+        if player_name:
+            player_phrases += [f"hits {player_name}".lower(), f"strikes {player_name}".lower()]
+        self._player_phrases = tuple(player_phrases)
+        self._npc_keys = tuple((name.lower(), name) for name in self.npc_names)
+        self._type_keys = tuple(t.lower() for t in self.damage_types)
+        self._damage_keys = tuple(DAMAGE_INDICATORS)
+        self._intensity_keys = tuple(INTENSITY_WORDS)
+        self._roll_keys = tuple(ROLL_PHRASES)
+        self._casual_keys = tuple(CASUAL_ROLL_PHRASES)
+
+    def analyze(self, text: str) -> ResponseAnalysis:
+        result = ResponseAnalysis()
+        lower = (text or '').lower()
+
+        result.player_targeted = any(phrase in lower for phrase in self._player_phrases)
+        # "strikes you" etc. is a hit on the player as well as a damage cue
+        result.damage = result.player_targeted or any(key in lower for key in self._damage_keys)
+        if result.damage:
+            result.damage_types = {key for key in self._type_keys if key in lower}
+            result.intense = any(key in lower for key in self._intensity_keys)
+            result.npc_targets = {name for key, name in self._npc_keys if key in lower}
+
+        result.question = '?' in lower
+        result.casual_roll = any(key in lower for key in self._casual_keys)
+        result.dc = self._find_dc(lower)
+        if result.dc is None and not result.question and not result.casual_roll:
+            result.roll_phrase = any(key in lower for key in self._roll_keys)
+        return result
+
+    def _find_dc(self, lower: str) -> Optional[int]:
+        """Number after the first standalone "dc".
+
+        Anchored matches at each "dc" found by str.find; an unanchored
+        word-boundary regex search costs more than the rest of analyze().
+        """
+        index = lower.find('dc')
+        while index != -1:
+            if index == 0 or not lower[index - 1].isalnum():
+                match = self.DC_VALUE.match(lower, index + 2)
+                if match:
+                    return int(match.group(1))
+            index = lower.find('dc', index + 2)
+        return None
+
+    def damage_type(self, analysis: ResponseAnalysis, default: str = 'magical') -> str:
+        """First damage type in DAMAGE_TYPES order, as calculate_damage always picked"""
+        for damage_type in self.damage_types:
+            if damage_type in analysis.damage_types:
+                return damage_type
+        return default
+
+    def target(self, analysis: ResponseAnalysis) -> Optional[str]:
+        """Player if they were hit, else the first NPC (party order) named in the text"""
+        if analysis.player_targeted and self.player_name:
+            return self.player_name
+        for name in self.npc_names:
+            if name in analysis.npc_targets:
+                return name
+        return None
@@ -0,0 +1,158 @@
+import os
+import json
+import argparse
+import threading
+from typing import Dict, List, Optional
+
+import save_format
+from game_journal import load_save_data
+
+
+class SaveCatalog:
+    """Manifest of saved games in saved_games/catalog.json.
+
+    save_game_state records each new save here, so the load dialog reads
+    one small file instead of parsing every save. The catalog is replaced
+    atomically (temp file + os.replace) and is only a cache: listing
+    compares it with the directory and parses just the saves it is missing,
+    and rebuild() recreates it from the save files.
+
+    The autosave changes every turn, so its entry lives on its own in
+    catalog.autosave (not a save extension) and updating it never rewrites
+    the full catalog.
+    """
+
+    FILENAME = 'catalog.json'
+    AUTOSAVE_FILENAME = 'catalog.autosave'
+    VERSION = 1
+
+    def __init__(self, saves_dir: str):
+        self.saves_dir = saves_dir
+        self.path = os.path.join(saves_dir, self.FILENAME)
+        self.autosave_path = os.path.join(saves_dir, self.AUTOSAVE_FILENAME)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def entry_for(filename: str, save_data: Dict, size: int) -> Dict:
+        game_state = save_data.get('game_state') or {}
+        party = save_data.get('party') or game_state.get('party_members') or {}
+        return {
+            'filename': filename,
+            'name': filename.split('_')[0],
+            'timestamp': save_data.get('timestamp', ''),
+            'party': list(party),
+            'turns': len(game_state.get('actions') or []),
+            'size': size
+        }
+
+    def _read(self) -> Optional[Dict[str, Dict]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != self.VERSION:
+            return None
+        return data.get('saves', {})
+
+    def _write(self, saves: Dict[str, Dict]):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'saves': saves}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _scan(self, filename: str) -> Optional[Dict]:
+        filepath = os.path.join(self.saves_dir, filename)
+        try:
+            if filename.endswith(save_format.EXTENSION):
+                # The header has everything the catalog needs; skip the transcript
+                header = save_format.PackedSave(filepath).header
+                return dict(self.entry_for(filename, header, os.path.getsize(filepath)), turns=header['turns'])
+            save_data = load_save_data(filepath)
+            return self.entry_for(filename, save_data, os.path.getsize(filepath))
+        except Exception as e:
+            print(f"Error reading save {filename}: {e}")
+            return None
+
+    def _save_files(self) -> List[str]:
+        return [f for f in os.listdir(self.saves_dir) if save_format.is_save_file(f) and f != self.FILENAME]
+
+    def record(self, filepath: str, save_data: Dict):
+        """Add or replace the entry for a save that was just written"""
+        filename = os.path.basename(filepath)
+        with self.lock:
+            saves = self._read() or {}
+            saves[filename] = self.entry_for(filename, save_data, os.path.getsize(filepath))
+            self._write(saves)
+
+    def record_autosave(self, filepath: str, entry_source: Dict):
+        """Replace the autosave entry; only the one-entry side file is written"""
+        filename = os.path.basename(filepath)
+        entry = self.entry_for(filename, entry_source, os.path.getsize(filepath))
+        with self.lock:
+            tmp_path = f"{self.autosave_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'saves': {filename: entry}}, f)
+            os.replace(tmp_path, self.autosave_path)
+
+    def _read_autosave(self) -> Dict[str, Dict]:
+        try:
+            with open(self.autosave_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get('saves', {}) if data.get('version') == self.VERSION else {}
+
+    def list(self) -> List[Dict]:
+        """Catalog entries for every save on disk, newest first"""
+        with self.lock:
+            saves = self._read()
+            if saves is None:
+                saves = {entry['filename']: entry for entry in self._rebuild()}
+
+            on_disk = set(self._save_files())
+            autosaves = {filename: entry for filename, entry in self._read_autosave().items()
+                         if filename in on_disk}
+            missing = on_disk - set(saves) - set(autosaves)
+            stale = set(saves) - on_disk
+            if missing or stale:
+                # Saves copied in or deleted by hand: patch just those entries
+                for filename in stale:
+                    del saves[filename]
+                for filename in missing:
+                    entry = self._scan(filename)
+                    if entry:
+                        saves[filename] = entry
+                self._write(saves)
+            saves.update(autosaves)
+            return sorted(saves.values(), key=lambda save: save['timestamp'], reverse=True)
+
+    def _rebuild(self) -> List[Dict]:
+        saves = {}
+        for filename in self._save_files():
+            entry = self._scan(filename)
+            if entry:
+                saves[filename] = entry
+        self._write(saves)
+        return sorted(saves.values(), key=lambda save: save['timestamp'], reverse=True)
+
+    def rebuild(self) -> List[Dict]:
+        """Recreate the catalog from the save files on disk"""
+        with self.lock:
+            return self._rebuild()
+
+
+def main():
+    default_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'saved_games')
+    parser = argparse.ArgumentParser(description="Rebuild the saved game catalog from the save files")
+    parser.add_argument('saves_dir', nargs='?', default=default_dir)
+    args = parser.parse_args()
+
+    saves = SaveCatalog(args.saves_dir).rebuild()
+    print(f"Catalogued {len(saves)} saves in {os.path.join(args.saves_dir, SaveCatalog.FILENAME)}")
+
+
+if __name__ == '__main__':
+    main()
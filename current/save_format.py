@@ -0,0 +1,218 @@
+import os
+import json
+import struct
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+try:
+    import msgpack
+    import zstandard
+except ImportError:  # Optional: packed saves need both, JSON saves work without
+    msgpack = None
+    zstandard = None
+
+
+MAGIC = b'ODSV'
+VERSION = 1
+EXTENSION = '.odsave'
+SAVE_EXTENSIONS = ('.json', EXTENSION)
+RECENT_TURNS = 20
+_PREAMBLE = struct.Struct('<4sHI')  # magic, version, header length
+
+# Transcript lists, split into a recent tail and the older history
+LIST_KEYS = ('actions', 'responses', 'story_progression', 'history', 'combat_log', 'npc_actions')
+
+
+def available() -> bool:
+    return msgpack is not None and zstandard is not None
+
+
+def _require():
+    if not available():
+        raise Exception("Packed saves need the msgpack and zstandard packages (pip install msgpack zstandard)")
+
+
+def is_save_file(filename: str) -> bool:
+    return filename.endswith(SAVE_EXTENSIONS)
+
+
+def write_packed(filepath: str, save_data: Dict, level: int = 3):
+    """Write save_data as a packed save: a msgpack header, then zstd-compressed sections.
+
+    The header (uncompressed) holds the timestamp, party, player character
+    and section offsets. Sections are independent zstd frames, so a reader
+    can decode the game state and the last RECENT_TURNS entries of each
+    transcript list without touching the older history.
+    """
+    _require()
+    game_state = dict(save_data.get('game_state') or {})
+    party = save_data.get('party') or game_state.get('party_members') or {}
+    game_state.pop('party_members', None)
+
+    recent, older = {}, {}
+    for key in LIST_KEYS:
+        if isinstance(game_state.get(key), list):
+            items = game_state.pop(key)
+            split = max(0, len(items) - RECENT_TURNS)
+            older[key], recent[key] = items[:split], items[split:]
+
+    compressor = zstandard.ZstdCompressor(level=level)
+    sections, blobs, offset = {}, [], 0
+    for name, payload in (('state', game_state), ('recent', recent), ('older', older)):
+        blob = compressor.compress(msgpack.packb(payload, use_bin_type=True))
+        sections[name] = [offset, len(blob)]
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = msgpack.packb({
+        'timestamp': save_data.get('timestamp', ''),
+        'party': party,
+        'player_character': save_data.get('player_character'),
+        'turns': len(recent.get('actions', [])) + len(older.get('actions', [])),
+        'recent_turns': RECENT_TURNS,
+        'sections': sections
+    }, use_bin_type=True)
+
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, filepath)
+
+
+class PackedSave:
+    """Reader for a packed save that decodes only what is asked for.
+
+    Opening reads just the header (party, player character, timestamp,
+    turn count); recent() adds the game state and the last RECENT_TURNS
+    entries of each transcript list, older() the rest of those lists, and
+    load() decodes everything.
+    """
+
+    def __init__(self, filepath: str):
+        _require()
+        self.filepath = filepath
+        with open(filepath, 'rb') as f:
+            preamble = f.read(_PREAMBLE.size)
+            if len(preamble) < _PREAMBLE.size:
+                raise Exception(f"{filepath} is not a packed save")
+            magic, version, header_length = _PREAMBLE.unpack(preamble)
+            if magic != MAGIC:
+                raise Exception(f"{filepath} is not a packed save")
+            if version > VERSION:
+                raise Exception(f"{filepath} is save format v{version}; this version reads up to v{VERSION}")
+            self.version = version
+            self.header = msgpack.unpackb(f.read(header_length), raw=False)
+        self._data_start = _PREAMBLE.size + header_length
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    @property
+    def party(self) -> Dict:
+        return self.header['party']
+
+    @property
+    def player_character(self) -> Optional[Dict]:
+        return self.header['player_character']
+
+    def _section(self, name: str):
+        offset, length = self.header['sections'][name]
+        with open(self.filepath, 'rb') as f:
+            f.seek(self._data_start + offset)
+            blob = f.read(length)
+        return msgpack.unpackb(self._decompressor.decompress(blob), raw=False)
+
+    def _save_data(self, game_state: Dict) -> Dict:
+        return {
+            'game_state': game_state,
+            'party': self.party,
+            'player_character': self.player_character,
+            'timestamp': self.header['timestamp']
+        }
+
+    def recent(self) -> Dict:
+        """Save dict whose transcript lists hold only the recent tail"""
+        game_state = self._section('state')
+        game_state.update(self._section('recent'))
+        return self._save_data(game_state)
+
+    def older(self) -> Dict[str, List]:
+        """The transcript items recent() leaves out, per list key (prepend them to its lists)"""
+        return self._section('older')
+
+    def load(self) -> Dict:
+        """The complete save dict, as the JSON format would have loaded it"""
+        game_state = self._section('state')
+        recent = self._section('recent')
+        for key, items in self.older().items():
+            game_state[key] = items + recent.pop(key, [])
+        game_state.update(recent)
+        return self._save_data(game_state)
+
+
+def _is_full_json_save(save_data) -> bool:
+    # Journal pointer saves are already tiny, and catalog.json is not a save
+    return isinstance(save_data, dict) and 'game_state' in save_data
+
+
+def convert_file(filepath: str, keep_json: bool = False) -> Optional[str]:
+    """Convert one full JSON save to a packed save next to it; returns the new path"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        save_data = json.load(f)
+    if not _is_full_json_save(save_data):
+        return None
+
+    packed_path = os.path.splitext(filepath)[0] + EXTENSION
+    write_packed(packed_path, save_data)
+    # Only drop the JSON once the packed copy reads back identically
+    restored = PackedSave(packed_path).load()
+    expected = dict(save_data['game_state'])
+    expected.pop('party_members', None)
+    if restored['game_state'] != expected or restored['party'] != (save_data.get('party') or save_data['game_state'].get('party_members') or {}):
+        os.remove(packed_path)
+        raise Exception(f"Packed copy of {filepath} did not read back identically")
+    if not keep_json:
+        os.remove(filepath)
+    return packed_path
+
+
+def convert_directory(saves_dir: str, workers: Optional[int] = None, keep_json: bool = False) -> List[str]:
+    """Convert every full JSON save in saves_dir in parallel; returns the packed paths"""
+    _require()
+    paths = [
+        os.path.join(saves_dir, filename)
+        for filename in sorted(os.listdir(saves_dir))
+        if filename.endswith('.json')
+    ]
+    converted = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {path: executor.submit(convert_file, path, keep_json) for path in paths}
+        for path, future in futures.items():
+            try:
+                result = future.result()
+                if result:
+                    converted.append(result)
+            except Exception as e:
+                print(f"Error converting {os.path.basename(path)}: {e}")
+    return converted
+
+
+def main():
+    default_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'saved_games')
+    parser = argparse.ArgumentParser(description="Convert full JSON saves to the packed (msgpack + zstd) format")
+    parser.add_argument('saves_dir', nargs='?', default=default_dir)
+    parser.add_argument('--workers', type=int, default=None, help="Converter processes (default: CPU count)")
+    parser.add_argument('--keep-json', action='store_true', help="Leave the JSON files in place")
+    args = parser.parse_args()
+
+    converted = convert_directory(args.saves_dir, args.workers, args.keep_json)
+    print(f"Converted {len(converted)} saves in {args.saves_dir}")
+
+    from save_catalog import SaveCatalog
+    SaveCatalog(args.saves_dir).rebuild()
+
+
+if __name__ == '__main__':
+    main()
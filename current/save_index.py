@@ -0,0 +1,188 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import save_format
+from game_journal import load_save_data
+from save_catalog import SaveCatalog
+
+
+class SaveIndex:
+    """SQLite FTS5 index over the transcripts of every saved game.
+
+    Each action, response, story_progression entry and combat_log entry is
+    one row, tagged with its save file, kind and turn offset. Saves are
+    indexed when save_game_state writes them; sync() catches up with files
+    added, changed or deleted outside the app by comparing mtime and size,
+    so only new saves are ever parsed.
+    """
+
+    KINDS = ('actions', 'responses', 'story_progression', 'combat_log')
+    RANK_LIMIT = 5000
+
+    def __init__(self, db_path: str):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS saves (
+                filename TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                filename TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                turn INTEGER NOT NULL,
+                text TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_filename ON entries(filename);
+            CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                text, content='entries', content_rowid='id', tokenize='porter unicode61'
+            );
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def _entry_text(kind: str, entry) -> str:
+        if isinstance(entry, str):
+            return entry
+        if not isinstance(entry, dict):
+            return str(entry)
+        if kind == 'actions' and 'action' in entry:
+            return f"{entry.get('player', '')}: {entry['action']}".strip(': ')
+        if kind == 'combat_log':
+            return f"{entry.get('target', '')} took {entry.get('damage', '')} damage: {entry.get('attack', '')}"
+        return json.dumps(entry, ensure_ascii=False)
+
+    def _rows(self, game_state: Dict) -> Iterable[Tuple[str, int, str]]:
+        for kind in self.KINDS:
+            for offset, entry in enumerate(game_state.get(kind) or []):
+                # Combat entries carry the game turn; the rest use their list position
+                turn = entry.get('turn', offset) if kind == 'combat_log' and isinstance(entry, dict) else offset
+                text = self._entry_text(kind, entry)
+                if text.strip():
+                    yield kind, int(turn or 0), text
+
+    def _delete(self, filename: str):
+        # External-content FTS tables are told the old text of each removed row
+        self.conn.execute("""
+            INSERT INTO entries_fts(entries_fts, rowid, text)
+            SELECT 'delete', id, text FROM entries WHERE filename = ?
+        """, (filename,))
+        self.conn.execute("DELETE FROM entries WHERE filename = ?", (filename,))
+        self.conn.execute("DELETE FROM saves WHERE filename = ?", (filename,))
+
+    def _insert(self, filename: str, save_data: Dict, mtime: float, size: int):
+        game_state = save_data.get('game_state') or {}
+        self.conn.execute(
+            "INSERT INTO saves (filename, name, timestamp, mtime, size) VALUES (?, ?, ?, ?, ?)",
+            (filename, filename.split('_')[0], save_data.get('timestamp', ''), mtime, size)
+        )
+        self.conn.executemany(
+            "INSERT INTO entries (filename, kind, turn, text) VALUES (?, ?, ?, ?)",
+            ((filename, kind, turn, text) for kind, turn, text in self._rows(game_state))
+        )
+        self.conn.execute(
+            "INSERT INTO entries_fts(rowid, text) SELECT id, text FROM entries WHERE filename = ?",
+            (filename,)
+        )
+
+    def index_save(self, filepath: str, save_data: Optional[Dict] = None):
+        """(Re)index one save file; pass save_data when it is already in memory"""
+        filename = os.path.basename(filepath)
+        stat = os.stat(filepath)
+        if save_data is None:
+            save_data = load_save_data(filepath)
+        with self.lock:
+            self._delete(filename)
+            self._insert(filename, save_data, stat.st_mtime, stat.st_size)
+            self.conn.commit()
+
+    def sync(self, saves_dir: str) -> int:
+        """Index new or changed saves and forget deleted ones; returns files indexed"""
+        on_disk = {}
+        for filename in os.listdir(saves_dir):
+            if save_format.is_save_file(filename) and filename != SaveCatalog.FILENAME:
+                stat = os.stat(os.path.join(saves_dir, filename))
+                on_disk[filename] = (stat.st_mtime, stat.st_size)
+
+        with self.lock:
+            known = {row[0]: (row[1], row[2]) for row in self.conn.execute("SELECT filename, mtime, size FROM saves")}
+            for filename in set(known) - set(on_disk):
+                self._delete(filename)
+            self.conn.commit()
+
+        indexed = 0
+        for filename, signature in on_disk.items():
+            if known.get(filename) == signature:
+                continue
+            try:
+                self.index_save(os.path.join(saves_dir, filename))
+                indexed += 1
+            except Exception as e:
+                print(f"Error indexing save {filename}: {e}")
+        return indexed
+
+    def search(self, query: str, limit: int = 20, open_mark: str = '[', close_mark: str = ']') -> List[Dict]:
+        """Best-matching transcript entries with a highlighted snippet each.
+
+        Every word must match; if nothing does, any word may. Results are
+        ranked by bm25, except when a query matches more than RANK_LIMIT
+        entries (a word that is in every save): scoring all of those takes
+        hundreds of milliseconds, so the newest matches are returned instead.
+        """
+        # Quoted terms, so FTS5 operators and punctuation in the query are just text
+        terms = [f'"{term}"' for term in re.findall(r"\w+", query.lower())]
+        if not terms:
+            return []
+        rows = []
+        for operator in (('AND', 'OR') if len(terms) > 1 else ('AND',)):
+            expression = f" {operator} ".join(terms)
+            with self.lock:
+                matches = len(self.conn.execute(
+                    "SELECT rowid FROM entries_fts WHERE entries_fts MATCH ? LIMIT ?",
+                    (expression, self.RANK_LIMIT + 1)
+                ).fetchall())
+                if not matches:
+                    continue
+                if matches <= self.RANK_LIMIT:
+                    score, order = 'bm25(entries_fts)', 'bm25(entries_fts)'
+                else:
+                    # bm25 needs statistics over every match even to score one row
+                    score, order = 'NULL', 'entries_fts.rowid DESC'
+                rows = self.conn.execute(f"""
+                    SELECT e.filename, s.name, s.timestamp, e.kind, e.turn,
+                           snippet(entries_fts, 0, ?, ?, '…', 16), {score}
+                    FROM entries_fts
+                    JOIN entries e ON e.id = entries_fts.rowid
+                    JOIN saves s ON s.filename = e.filename
+                    WHERE entries_fts MATCH ?
+                    ORDER BY {order}
+                    LIMIT ?
+                """, (open_mark, close_mark, expression, limit)).fetchall()
+            break
+        return [
+            {
+                'filename': filename,
+                'name': name,
+                'timestamp': timestamp,
+                'kind': kind,
+                'turn': turn,
+                'snippet': snippet,
+                'score': -score if score is not None else None
+            }
+            for filename, name, timestamp, kind, turn, snippet, score in rows
+        ]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -26,7 +26,7 @@ Format as a single detailed description focused on:
 Do not include: dialogue, game mechanics, or non-visual elements.
 """
         try:
-            response = self.game_manager.get_dm_response_from_api(prompt)
+            response = self.game_manager.get_dm_response_from_api(prompt, call_type='scene_prompt')
             # Clean up the response
             response = response.replace('\n', ' ').strip()
             return response
@@ -46,7 +46,10 @@ Do not include: dialogue, game mechanics, or non-visual elements.
             image_path = os.path.join(self.scenes_dir, filename)
             
             # Generate image
-            result_path = aigirl_generator.generate_image(image_prompt, image_path)
+            with self.game_manager.metrics.call('image', 'scene') as record:
+                result_path = aigirl_generator.generate_image(image_prompt, image_path)
+                if not result_path:
+                    record.outcome = 'failed'
             
             if result_path and os.path.exists(result_path):
                 print(f"Scene image generated: {result_path}")
@@ -1,15 +1,19 @@
 import os
+import time
 import azure.cognitiveservices.speech as speechsdk
 from PyQt5.QtCore import QObject, QMutex, pyqtSignal
 from typing import Optional
+from metrics import CallRecord
 
 class TTSManager(QObject):
     speech_completed = pyqtSignal()  # Add signal for completion
     speech_started = pyqtSignal()  # Add new signal
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, metrics=None):
         super().__init__()
         self.config = config
+        self.metrics = metrics
+        self.speech_record = None  # CallRecord for the utterance in flight
         self.current_voice = config.get('tts_voice', "en-US-DavisNeural")
         self.service_region = config.get('tts_region', "eastus")
         self.speech_key = os.getenv('AZURE_SPEECH_KEY')
@@ -45,6 +49,7 @@ class TTSManager(QObject):
             )
             
             # Set up event handlers
+            self.current_synthesizer.synthesizing.connect(self.on_synthesizing)
             self.current_synthesizer.synthesis_completed.connect(self.on_synthesis_completed)
             self.current_synthesizer.synthesis_canceled.connect(self.on_synthesis_canceled)
             
@@ -53,13 +58,28 @@ class TTSManager(QObject):
             self.speech_config = None
             self.current_synthesizer = None
 
+    def on_synthesizing(self, evt):
+        """First audio chunk arrived"""
+        if self.speech_record:
+            self.speech_record.mark_first_byte()
+
+    def finish_speech_record(self, outcome: str):
+        """Close the metrics record for the current utterance"""
+        record, self.speech_record = self.speech_record, None
+        if record and self.metrics:
+            record.outcome = outcome
+            record.latency = time.perf_counter() - record.started
+            self.metrics.record(record)
+
     def on_synthesis_completed(self, evt):
         """Handle synthesis completion"""
+        self.finish_speech_record('ok')
         self.speaking = False
         self.speech_completed.emit()
 
     def on_synthesis_canceled(self, evt):
         """Handle synthesis cancellation"""
+        self.finish_speech_record('cancelled')
         self.speaking = False
         self.speech_completed.emit()
         print(f"Speech synthesis canceled: {evt.result.cancellation_details.reason}")
@@ -90,10 +110,13 @@ class TTSManager(QObject):
             self.current_synthesizer.synthesis_canceled.connect(on_speech_end)
             
             # Speak asynchronously
+            self.speech_record = CallRecord('tts', 'speak', self.current_voice)
+            self.speech_record.extra['chars'] = len(text)
             self.current_synthesizer.speak_text_async(text)
                 
         except Exception as e:
             print(f"Error in TTS: {e}")
+            self.finish_speech_record(f"error:{type(e).__name__}")
             self.speaking = False
             self.speech_completed.emit()
             raise
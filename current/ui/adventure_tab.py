@@ -1,73 +1,27 @@
-from PyQt5.QtWidgets import (
-    QWidget, QMessageBox, QInputDialog, QFrame, 
-    QVBoxLayout, QTextEdit
-)
+from PyQt5.QtWidgets import QWidget, QMessageBox, QInputDialog
 from PyQt5.QtCore import Qt
-from PyQt5 import uic
-from .play_game_tab import PlayGameTab
-
-class AdventureLogEntry(QFrame):
-    def __init__(self, text, entry_type="normal", parent=None):
-        super().__init__(parent)
-        layout = QVBoxLayout(self)
-        self.text_area = QTextEdit()
-        self.text_area.setReadOnly(True)
-        self.text_area.setText(text)
-        self.text_area.setMinimumHeight(100)  # Make text areas taller
-        layout.setContentsMargins(0, 0, 0, 0)  # Remove margins
-        layout.addWidget(self.text_area)
-        
-        if entry_type == "dm":
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: #FFE0A8;
-                    border: none;
-                    margin: 5px;
-                }
-                QTextEdit {
-                    color: #203D72;
-                    background-color: transparent;
-                    border: none;
-                    font-family: 'MedievalSharp';
-                    font-size: 18px;
-                    padding: 10px;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: #334970;
-                    border: none;
-                }
-                QTextEdit {
-                    color: #203D72;
-                    background-color: transparent;
-                    border: none;
-                    font-family: 'Poppins', sans-serif;
-                    font-size: 14px;
-                }
-            """)
+from .ui_loader import load_ui
+from .workers import TaskRunner
 
 class AdventureTab(QWidget):
     def __init__(self, game_manager):
         super().__init__()
         self.setStyleSheet("""
-            QScrollArea {
+            GameLogView {
                 background-color: #FFECCC;
                 border: none;
                 border-radius: 10px;
             }
-            QWidget#logWidget {
-                background-color: #FFECCC;
-            }
         """)
         self.game_manager = game_manager
         
         # Load the UI
-        uic.loadUi('current/ui/designer/adventure_tab.ui', self)
+        load_ui(self, 'adventure_tab')
         
-        # Initialize log layout
-        self.log_layout = self.logWidget.layout()
+        # Log entries are rows of a model/view list rather than a widget each
+        self.log_model = self.adventureLog.log_model
+        self.adventureLog.log_delegate.set_entry_style('dm', '#FFE0A8', '#FFE0A8', '#203D72', 'MedievalSharp', 18)
+        self.adventureLog.log_delegate.set_entry_style('normal', '#334970', '#334970', '#203D72', 'Poppins', 14)
         
         # Connect signals
         self.generatePartyBtn.clicked.connect(self.generate_party)
@@ -75,53 +29,68 @@ class AdventureTab(QWidget):
         self.resetBtn.clicked.connect(self.reset_game)
         self.savePartyBtn.clicked.connect(self.save_party)
         self.loadPartyBtn.clicked.connect(self.load_party)
+        
+        # Party generation and the adventure intro are slow LLM calls
+        self.task_runner = TaskRunner(self)
+        self.task_runner.busy_changed.connect(self.set_busy)
+
+    def set_busy(self, busy: bool):
+        """Block duplicate submissions while a generation job is running"""
+        for btn in (self.generatePartyBtn, self.startAdventureBtn, self.resetBtn,
+                    self.savePartyBtn, self.loadPartyBtn):
+            btn.setEnabled(not busy)
 
     def generate_party(self):
+        if self.task_runner.is_busy():
+            return
         if not self.game_manager.has_models():
             self.show_error("Please select models first!")
             return
             
-        try:
-            player_char = self.game_manager.get_player_character()
-            if not player_char:
-                self.show_error("Please create or load your character first!")
-                return
-                
-            party = self.game_manager.generate_party_with_player(player_char)
-            if party:
-                for name, info in party.items():
-                    self.add_log_entry(f"=== {name} ===\n{info}", "dm")
-            else:
-                self.show_error("Failed to generate party")
-        except Exception as e:
-            self.show_error(f"Error generating party: {str(e)}")
+        player_char = self.game_manager.get_player_character()
+        if not player_char:
+            self.show_error("Please create or load your character first!")
+            return
+            
+        self.add_log_entry("Gathering your party...", "dm")
+        self.task_runner.submit(
+            self.game_manager.generate_party_with_player, player_char,
+            on_result=self.on_party_generated,
+            on_error=lambda message: self.show_error(f"Error generating party: {message}")
+        )
+
+    def on_party_generated(self, party):
+        if party:
+            for name, info in party.items():
+                self.add_log_entry(f"=== {name} ===\n{info}", "dm")
+        else:
+            self.show_error("Failed to generate party")
     
     def start_adventure(self):
+        if self.task_runner.is_busy():
+            return
         if not self.game_manager.party:
             self.show_error("Please generate a party first!")
             return
             
-        try:
-            game_state, intro = self.game_manager.start_new_adventure()
-            if game_state and intro:
-                # Get reference to PlayGameTab
-                play_tab = None
-                for i in range(self.parent().parent().count()):
-                    tab = self.parent().parent().widget(i)
-                    if isinstance(tab, PlayGameTab):
-                        play_tab = tab
-                        break
-                        
-                if play_tab:
-                    play_tab.add_message(intro, is_dm=True)
-                    # Switch to play tab
-                    self.parent().parent().setCurrentIndex(2)  # Index of play tab
-                else:
-                    self.show_error("Could not find Play Game tab!")
+        self.add_log_entry("The Dungeon Master is preparing your adventure...", "dm")
+        self.task_runner.submit(
+            self.game_manager.start_new_adventure,
+            on_result=self.on_adventure_started,
+            on_error=lambda message: self.show_error(f"Error starting adventure: {message}")
+        )
+
+    def on_adventure_started(self, result):
+        game_state, intro = result
+        if game_state and intro:
+            # Switch to the play tab, building it if it has not been shown yet
+            if hasattr(self.window(), 'show_tab'):
+                play_tab = self.window().show_tab("Play Game")
+                play_tab.add_message(intro, is_dm=True)
             else:
-                self.show_error("Failed to start adventure")
-        except Exception as e:
-            self.show_error(f"Error starting adventure: {str(e)}")
+                self.show_error("Could not find Play Game tab!")
+        else:
+            self.show_error("Failed to start adventure")
             
     # Remove unused methods that were moved to PlayTab
     def add_log_entry(self, text: str, entry_type: str = "normal"):
@@ -178,19 +147,15 @@ class AdventureTab(QWidget):
             except Exception as e:
                 print(f"Error processing character entry: {e}")
 
-        # Create and add the entry widget
-        entry = AdventureLogEntry(text, entry_type)
-        self.log_layout.addWidget(entry)
+        self.log_model.append(text, is_dm=entry_type == "dm")
+        self.adventureLog.scroll_to_end()
         
     def reset_game(self):
         self.game_manager.reset_game()
         self.clear_log()
         
     def clear_log(self):
-        while self.log_layout.count():
-            item = self.log_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        self.log_model.clear()
                 
     def show_error(self, message):
         QMessageBox.warning(self, "Error", message)
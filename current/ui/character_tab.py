@@ -3,7 +3,7 @@ from PyQt5.QtWidgets import (QWidget, QMessageBox, QLabel, QPushButton,
 from PyQt5 import QtWidgets  # Import QtWidgets as a module
 from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QPoint, QUrl
 from PyQt5.QtGui import QPixmap
-from PyQt5 import uic
+from .ui_loader import load_ui
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 import os
 import sys
@@ -12,6 +12,7 @@ import random
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from character_image_handler import CharacterImageHandler
 from game_manager import GameManager
+from ui.workers import TaskRunner
 
 class NotificationWidget(QWidget):
     def __init__(self, message, parent=None):
@@ -108,8 +109,11 @@ class CharacterTab(QWidget):
         self.game_manager = game_manager
         self.image_handler = CharacterImageHandler(game_manager)
         
+        # Portrait generation drives a headless browser; never on the GUI thread
+        self.task_runner = TaskRunner(self)
+        
         # Load UI
-        uic.loadUi('current/ui/designer/character_tab.ui', self)
+        load_ui(self, 'character_tab')
 
         # Initialize styles and widgets
         self.setup_ui()
@@ -117,6 +121,7 @@ class CharacterTab(QWidget):
         
         # Connect signals
         self.createBtn.clicked.connect(self.create_character)
+        self.task_runner.busy_changed.connect(lambda busy: self.createBtn.setEnabled(not busy))
         self.loadBtn.clicked.connect(self.show_load_dialog)
         self.classCombo.currentTextChanged.connect(self.update_derived_stats)
         self.raceCombo.currentTextChanged.connect(self.update_derived_stats)
@@ -127,10 +132,20 @@ class CharacterTab(QWidget):
         self.logos_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logos')
         self.logo_timer = QTimer(self)
         self.logo_timer.timeout.connect(self.update_logo)
+
+        # Decoding a logo and loading the YouTube player are slow; leave them
+        # until the tab has painted once so the window appears first
+        self.media_started = False
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.media_started:
+            self.media_started = True
+            QTimer.singleShot(0, self.start_media)
+
+    def start_media(self):
         self.logo_timer.start(5000)  # Change logo every 5 seconds
         self.update_logo()  # Show initial logo
-
-        # Initialize YouTube player
         self.setup_youtube_player()
 
     def setup_ui(self):
@@ -423,6 +438,8 @@ class CharacterTab(QWidget):
             print(f"No portrait found for character at {character.get('image_path')}")
 
     def create_character(self):
+        if self.task_runner.is_busy():
+            return
         # Validate required fields
         if not self.nameEdit.text():
             self.show_temporary_notification("Please enter a character name!", 3000)
@@ -471,11 +488,21 @@ class CharacterTab(QWidget):
                 self.game_manager.set_player_character(character)
                 return
                 
-            # Rest of the existing image generation code
+            # Save first so the character is never lost if the portrait fails
             char_path = self.game_manager.save_character(character)
             save_dir = os.path.dirname(char_path)
-            image_path = self.image_handler.generate_and_save_image(character, save_dir)
+            self.show_temporary_notification("Character saved, generating portrait...")
+            self.task_runner.submit(
+                self.image_handler.generate_and_save_image, character, save_dir,
+                on_result=lambda image_path: self.on_portrait_generated(character, image_path),
+                on_error=lambda message: self.on_portrait_failed(character, message)
+            )
             
+        except Exception as e:
+            self.show_temporary_notification(f"Error: {str(e)}", 3000)
+
+    def on_portrait_generated(self, character, image_path):
+        try:
             if image_path:
                 # Update character data with image path
                 character['image_path'] = image_path
@@ -487,15 +514,14 @@ class CharacterTab(QWidget):
             # Set as active character after everything is saved
             self.game_manager.set_player_character(character)
             self.show_temporary_notification("Character saved and portrait generated!")
-            
-        except ValueError as ve:
-            self.show_temporary_notification(f"API Error: {str(ve)}", 3000)
-            # Still save the character without an image
-            self.game_manager.save_character(character)
-            self.game_manager.set_player_character(character)
         except Exception as e:
             self.show_temporary_notification(f"Error: {str(e)}", 3000)
 
+    def on_portrait_failed(self, character, message):
+        self.show_temporary_notification(f"API Error: {message}", 3000)
+        # The character was already saved without an image
+        self.game_manager.set_player_character(character)
+
     def display_character_portrait(self, image_path):
         """Display character portrait in the UI"""
         try:
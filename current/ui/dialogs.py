@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
-                           QLabel, QTextEdit, QListWidget)
-from PyQt5.QtCore import Qt
+                           QLabel, QTextEdit, QListWidget, QListWidgetItem, QLineEdit)
+from PyQt5.QtCore import Qt, QTimer
 
 class LoadingDialog(QDialog):
     def __init__(self, message, parent=None):
@@ -106,3 +106,59 @@ class CharacterSelectDialog(QDialog):
         self.selected_character = self.game_manager.load_character(filename)
         if self.selected_character:
             self.accept()
+
+class SaveSearchDialog(QDialog):
+    """Search box over all saved games; double-click a hit to load its save"""
+
+    def __init__(self, game_manager, parent=None):
+        super().__init__(parent)
+        self.game_manager = game_manager
+        self.selected_filename = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        self.setWindowTitle("Search Saved Games")
+        self.setMinimumSize(600, 400)
+        layout = QVBoxLayout(self)
+
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("e.g. hooded figure windmill")
+        self.results_list = QListWidget()
+        self.results_list.setWordWrap(True)
+        self.status_label = QLabel("")
+
+        # Search as the user types, once they pause
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        self.query_edit.textChanged.connect(self.search_timer.start)
+        self.results_list.itemDoubleClicked.connect(self.load_selected)
+
+        load_btn = QPushButton("Load Save")
+        load_btn.clicked.connect(lambda: self.load_selected(self.results_list.currentItem()))
+
+        layout.addWidget(self.query_edit)
+        layout.addWidget(self.results_list)
+        layout.addWidget(self.status_label)
+        layout.addWidget(load_btn)
+
+    def run_search(self):
+        self.results_list.clear()
+        query = self.query_edit.text().strip()
+        if not query:
+            self.status_label.setText("")
+            return
+        hits = self.game_manager.search_saves(query, limit=50)
+        for hit in hits:
+            kind = hit['kind'].replace('_', ' ')
+            item = QListWidgetItem(f"{hit['name']} ({hit['timestamp']}) - {kind} #{hit['turn']}\n{hit['snippet']}")
+            item.setData(Qt.UserRole, hit['filename'])
+            self.results_list.addItem(item)
+        self.status_label.setText(f"{len(hits)} matches")
+
+    def load_selected(self, item):
+        if item is None:
+            return
+        self.selected_filename = item.data(Qt.UserRole)
+        self.accept()
@@ -0,0 +1,632 @@
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional
+from PyQt5.QtWidgets import QTreeView, QStyledItemDelegate, QAbstractItemView, QStyle, QApplication, QMenu, QFrame
+from PyQt5.QtCore import (Qt, QAbstractListModel, QModelIndex, QPersistentModelIndex, QEvent, QPoint, QPointF, QRect, QRectF, QSize,
+                          QTimer, pyqtSignal)
+from PyQt5.QtGui import (QColor, QCursor, QFont, QFontMetrics, QFontMetricsF, QImageReader, QKeySequence, QPen, QPixmap, QPixmapCache,
+                         QTextLayout, QTextOption)
+
+
+class LogRecord:
+    """One game log message. Plain data, so a long session costs a few hundred bytes per entry"""
+    __slots__ = ('text', 'is_dm', 'image_path', 'busy', 'image_size', 'size_hint')
+
+    def __init__(self, text: str, is_dm: bool = False, image_path: Optional[str] = None):
+        self.text = text
+        self.is_dm = is_dm
+        self.image_path = image_path
+        self.busy = False  # Row action disabled (still streaming, image generating)
+        self.image_size = None  # Full size of image_path, read from the file header
+        self.size_hint = None  # (viewport width, QSize, measured rather than estimated)
+
+
+class GameLogModel(QAbstractListModel):
+    """The game log as a flat list of LogRecords, of which rows expose records[start:end].
+
+    The view re-measures every exposed row whenever one is inserted, so
+    only a window of at most WINDOW records is exposed; the view slides it
+    (page_older/page_newer) as the user scrolls to either end, and appending
+    brings it back to the newest entries. Updates address records rather
+    than rows, since rows shift when an entry (a cancelled turn) is removed
+    while another is still streaming.
+
+    A loaded game is not held whole: load_transcript() keeps its tail, and
+    paging fetches transcript entries as the window reaches the ones not
+    held and releases those it has moved well past.
+    """
+    WINDOW = 400
+    PAGE = 100
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records: List[LogRecord] = []
+        self.start = 0
+        self.end = 0
+        # A loaded transcript: records[:_fetched] are its entries
+        # [older_available:older_available + _fetched], the next _gap entries are
+        # released, and records[_fetched:] are the entries added after it
+        self._fetch: Optional[Callable[[int, int], List[str]]] = None
+        self._fetched_is_dm = False
+        self.older_available = 0
+        self._fetched = 0
+        self._gap = 0
+        self._released_images = {}  # Transcript index -> image_path of a released record
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.end - self.start
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if index.isValid() and role == Qt.DisplayRole:
+            return self.records[self.start + index.row()].text
+        return None
+
+    def record_at(self, row: int) -> LogRecord:
+        return self.records[self.start + row]
+
+    def _position(self, record: LogRecord) -> int:
+        # Searched from the end, where streaming and image updates land
+        for position in range(len(self.records) - 1, -1, -1):
+            if self.records[position] is record:
+                return position
+        return -1
+
+    def row_of(self, record: LogRecord) -> int:
+        """Row of record, or -1 if it is gone or outside the window"""
+        position = self._position(record)
+        return position - self.start if self.start <= position < self.end else -1
+
+    def show_range(self, start: int, end: int):
+        self.beginResetModel()
+        self.start, self.end = start, end
+        self.endResetModel()
+
+    def show_latest(self):
+        if self._gap:
+            self._fetch_newer(self._gap)
+        if self.end != len(self.records):
+            self.show_range(max(0, len(self.records) - self.WINDOW), len(self.records))
+            self._release_older()
+
+    def load_transcript(self, fetch: Callable[[int, int], List[str]], length: int, is_dm: bool = False):
+        """Replace the log with the tail of a transcript of length entries.
+
+        fetch(start, end) returns transcript entries [start:end]. Only about
+        a window of them is held at a time: the rest are fetched a page at a
+        time as the view scrolls towards them and released once it has
+        scrolled well past. Scene images survive the round trip.
+        """
+        count = min(length, self.WINDOW)
+        self.beginResetModel()
+        self.records = [LogRecord(text, is_dm) for text in fetch(length - count, length)]
+        self.start, self.end = 0, len(self.records)
+        self._fetch, self._fetched_is_dm = fetch, is_dm
+        self.older_available, self._fetched, self._gap = length - count, len(self.records), 0
+        self._released_images = {}
+        self.endResetModel()
+
+    def _fetched_records(self, first: int, texts: List[str]) -> List[LogRecord]:
+        records = [LogRecord(text, self._fetched_is_dm) for text in texts]
+        for index, record in enumerate(records, first):
+            record.image_path = self._released_images.pop(index, None)
+        return records
+
+    def _releasable(self, positions) -> int:
+        """How many of positions (farthest from the window first) can go; a busy record waits on a job"""
+        count = 0
+        for position in positions:
+            if self.records[position].busy:
+                break
+            count += 1
+        return count
+
+    def _release(self, first: int, count: int):
+        for position in range(first, first + count):
+            if self.records[position].image_path:
+                self._released_images[self.older_available + position] = self.records[position].image_path
+        del self.records[first:first + count]
+
+    def _fetch_older(self, count: int):
+        """Hold up to count more transcript entries before records[0]; rows are unchanged"""
+        count = min(count, self.older_available)
+        texts = self._fetch(self.older_available - count, self.older_available) if count else []
+        if not texts:
+            self.older_available = 0
+            return
+        self.records[0:0] = self._fetched_records(self.older_available - len(texts), texts)
+        self.older_available -= len(texts)
+        self._fetched += len(texts)
+        self.start += len(texts)
+        self.end += len(texts)
+
+    def _fetch_newer(self, count: int):
+        """Hold up to count of the released transcript entries after the fetched ones"""
+        count = min(count, self._gap)
+        first = self.older_available + self._fetched
+        texts = self._fetch(first, first + count) if count else []
+        if not texts:
+            self._gap = 0
+            return
+        # The gap is always below the window, so rows are unchanged
+        self.records[self._fetched:self._fetched] = self._fetched_records(first, texts)
+        self._fetched += len(texts)
+        self._gap -= len(texts)
+
+    def _release_older(self):
+        """Drop fetched records well above the window; they are fetched again if needed"""
+        # Keep a page above the window so scrolling back up does not refetch at once
+        count = self._releasable(range(min(self._fetched, self.start - self.PAGE)))
+        if count <= 0:
+            return
+        self._release(0, count)
+        self.start -= count
+        self.end -= count
+        self.older_available += count
+        self._fetched -= count
+
+    def _release_newer(self):
+        """Drop fetched records well below the window; the gap is fetched again on the way down"""
+        count = self._releasable(range(self._fetched - 1, self.end + self.PAGE - 1, -1))
+        if count <= 0:
+            return
+        self._release(self._fetched - count, count)
+        self._fetched -= count
+        self._gap += count
+
+    def _trim(self, from_top: bool):
+        excess = self.end - self.start - self.WINDOW
+        if excess <= 0:
+            return
+        if from_top:
+            self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+            self.start += excess
+        else:
+            self.beginRemoveRows(QModelIndex(), self.end - self.start - excess, self.end - self.start - 1)
+            self.end -= excess
+        self.endRemoveRows()
+        if from_top:
+            self._release_older()
+        else:
+            self._release_newer()
+
+    def has_older(self) -> bool:
+        return self.start > 0 or self.older_available > 0
+
+    def has_newer(self) -> bool:
+        return self.end < len(self.records) or self._gap > 0
+
+    def page_older(self) -> int:
+        """Expose up to PAGE older records above the window; returns how many"""
+        if self.start == 0:
+            self._fetch_older(self.PAGE)
+        count = min(self.PAGE, self.start)
+        if count:
+            self.beginInsertRows(QModelIndex(), 0, count - 1)
+            self.start -= count
+            self.endInsertRows()
+            self._trim(from_top=False)
+        return count
+
+    def page_newer(self) -> int:
+        """Expose up to PAGE newer records below the window; returns how many"""
+        if self.end == self._fetched:
+            self._fetch_newer(self.PAGE)
+        count = min(self.PAGE, len(self.records) - self.end)
+        if count:
+            self.beginInsertRows(QModelIndex(), self.end - self.start, self.end - self.start + count - 1)
+            self.end += count
+            self.endInsertRows()
+            self._trim(from_top=True)
+        return count
+
+    def append(self, text: str, is_dm: bool = False) -> LogRecord:
+        record = LogRecord(text, is_dm)
+        self.extend_records([record])
+        return record
+
+    def extend(self, texts: Iterable[str], is_dm: bool = False):
+        self.extend_records([LogRecord(text, is_dm) for text in texts])
+
+    def extend_records(self, records: List[LogRecord]):
+        if not records:
+            return
+        self.show_latest()
+        if len(records) >= self.WINDOW:
+            # A whole transcript at once (a loaded game): just show its tail
+            self.records.extend(records)
+            self.show_range(len(self.records) - self.WINDOW, len(self.records))
+            return
+        row = self.end - self.start
+        self.beginInsertRows(QModelIndex(), row, row + len(records) - 1)
+        self.records.extend(records)
+        self.end = len(self.records)
+        self.endInsertRows()
+        self._trim(from_top=True)
+
+    def remove(self, record: LogRecord):
+        position = self._position(record)
+        if position < 0:
+            return
+        if self.start <= position < self.end:
+            self.beginRemoveRows(QModelIndex(), position - self.start, position - self.start)
+            del self.records[position]
+            self.end -= 1
+            self.endRemoveRows()
+        else:
+            del self.records[position]
+            if position < self.start:
+                self.start -= 1
+                self.end -= 1
+        if position < self._fetched:
+            # Fetched records after it no longer line up with the transcript
+            self._fetched, self._gap = position, 0
+
+    def clear(self):
+        self.beginResetModel()
+        self.records = []
+        self.start = self.end = 0
+        self._fetch = None
+        self.older_available = self._fetched = self._gap = 0
+        self._released_images = {}
+        self.endResetModel()
+
+    def _changed(self, record: LogRecord, resized: bool = True):
+        if resized and record.size_hint is not None:
+            # Keep the old height until the row is measured again on its next paint
+            record.size_hint = record.size_hint[:2] + (False,)
+        row = self.row_of(record)
+        if row >= 0:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def set_text(self, record: LogRecord, text: str):
+        record.text = text
+        self._changed(record)
+
+    def append_text(self, record: LogRecord, text: str):
+        record.text += text
+        self._changed(record)
+
+    def set_image(self, record: LogRecord, image_path: str):
+        record.image_path = image_path
+        record.image_size = None
+        self._changed(record)
+
+    def set_busy(self, record: LogRecord, busy: bool):
+        record.busy = busy
+        self._changed(record, resized=False)
+
+
+class GameLogDelegate(QStyledItemDelegate):
+    """Paints log entries as framed text blocks, with an optional action button and scene image.
+
+    Only painted rows are measured exactly; the others get a height
+    estimated from their text length, so a long transcript lays out in
+    one cheap pass. Heights are cached on the records and the wrapped text
+    layouts of recently painted rows in a small LRU, so scrolling re-lays
+    out nothing and memory does not grow with the length of the session.
+    """
+    action_clicked = pyqtSignal(object)  # LogRecord
+
+    MARGIN = 5
+    BORDER = 2
+    PADDING = 10
+    SPACING = 6
+    BUTTON_SIZE = QSize(200, 32)
+    IMAGE_SIZE = QSize(600, 400)
+    LAYOUT_CACHE = 256
+
+    def __init__(self, view: QTreeView):
+        super().__init__(view)
+        self.view = view
+        self.styles = {}
+        self.action_text = None
+        self.busy_text = None
+        self._layouts = OrderedDict()  # (id(record), width) -> (record, text, layout, height)
+        self.set_entry_style('normal', '#334970', '#203D72', '#ECF0F1', 'Poppins', 14)
+
+    def set_entry_style(self, kind: str, background: str, border: str, color: str, family: str, pixel_size: int):
+        """Colours and font for 'dm' or 'normal' entries"""
+        font = QFont(family)
+        font.setPixelSize(pixel_size)
+        metrics = QFontMetricsF(font)
+        self.styles[kind] = {
+            'background': QColor(background),
+            'border': QColor(border),
+            'color': QColor(color),
+            'font': font,
+            'char_width': metrics.averageCharWidth(),
+            'line_height': metrics.lineSpacing()
+        }
+        self.clear_cache()
+
+    def set_action(self, text: Optional[str], busy_text: Optional[str] = None):
+        """Button shown under DM entries (None for none); clicks emit action_clicked"""
+        self.action_text = text
+        self.busy_text = busy_text or text
+        self.clear_cache()
+
+    def clear_cache(self):
+        self._layouts.clear()
+        model = getattr(self.view, 'log_model', None)
+        for record in model.records if model else []:
+            record.size_hint = None
+
+    def _style(self, record: LogRecord) -> dict:
+        return self.styles.get('dm' if record.is_dm else 'normal') or self.styles['normal']
+
+    def _has_action(self, record: LogRecord) -> bool:
+        return record.is_dm and self.action_text is not None
+
+    def _inset(self) -> int:
+        return self.MARGIN + self.BORDER + self.PADDING
+
+    def _text_layout(self, record: LogRecord, width: int):
+        key = (id(record), width)
+        cached = self._layouts.get(key)
+        if cached and cached[0] is record and cached[1] is record.text:
+            self._layouts.move_to_end(key)
+            return cached[2], cached[3]
+
+        # QTextLayout only breaks lines on the Unicode line separator
+        layout = QTextLayout(record.text.replace('\n', '\u2028'), self._style(record)['font'])
+        option = QTextOption()
+        option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
+        layout.setTextOption(option)
+        height = 0.0
+        layout.beginLayout()
+        while True:
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(width)
+            line.setPosition(QPointF(0, height))
+            height += line.height()
+        layout.endLayout()
+
+        self._layouts[key] = (record, record.text, layout, int(height + 0.999))
+        if len(self._layouts) > self.LAYOUT_CACHE:
+            self._layouts.popitem(last=False)
+        return layout, int(height + 0.999)
+
+    def _image_size(self, record: LogRecord, width: int) -> QSize:
+        if record.image_size is None:
+            record.image_size = QImageReader(record.image_path).size()
+        if not record.image_size.isValid():
+            return QSize(0, 0)
+        bound = QSize(min(self.IMAGE_SIZE.width(), width), self.IMAGE_SIZE.height())
+        return record.image_size.scaled(bound, Qt.KeepAspectRatio)
+
+    def _pixmap(self, record: LogRecord, size: QSize) -> QPixmap:
+        # Scaled images live in the global QPixmapCache, which is size-bounded
+        key = f"game_log:{record.image_path}:{size.width()}x{size.height()}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = QPixmap(record.image_path).scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def _button_rect(self, record: LogRecord, rect: QRect) -> QRect:
+        inset = self._inset()
+        _, text_height = self._text_layout(record, rect.width() - 2 * inset)
+        label_width = max(QFontMetrics(self.view.font()).horizontalAdvance(text)
+                          for text in (self.action_text, self.busy_text))
+        width = min(max(self.BUTTON_SIZE.width(), label_width + 2 * self.PADDING), rect.width() - 2 * inset)
+        return QRect(rect.left() + inset, rect.top() + inset + text_height + self.SPACING,
+                     width, self.BUTTON_SIZE.height())
+
+    def _height(self, record: LogRecord, inner_width: int, text_height: float) -> int:
+        height = text_height
+        if self._has_action(record):
+            height += self.SPACING + self.BUTTON_SIZE.height()
+        if record.image_path:
+            height += self.SPACING + self._image_size(record, inner_width).height()
+        return int(height) + 2 * self._inset()
+
+    def _estimate_text_height(self, record: LogRecord, inner_width: int) -> float:
+        style = self._style(record)
+        chars_per_line = max(1, int(inner_width / style['char_width']))
+        lines = sum(len(paragraph) // chars_per_line + 1 for paragraph in record.text.split('\n'))
+        return lines * style['line_height']
+
+    def sizeHint(self, option, index: QModelIndex) -> QSize:
+        record = self.view.log_model.record_at(index.row())
+        width = self.view.viewport().width()
+        if record.size_hint is not None and record.size_hint[0] == width:
+            return record.size_hint[1]
+        # Rows get measured exactly when first painted (see paint)
+        inner_width = max(1, width - 2 * self._inset())
+        size = QSize(width, self._height(record, inner_width, self._estimate_text_height(record, inner_width)))
+        record.size_hint = (width, size, False)
+        return size
+
+    def paint(self, painter, option, index: QModelIndex):
+        record = index.model().record_at(index.row())
+        style = self._style(record)
+        inset = self._inset()
+        rect = option.rect
+        painter.save()
+        painter.setRenderHint(painter.Antialiasing)
+
+        frame = QRectF(rect).adjusted(self.MARGIN + self.BORDER / 2, self.MARGIN + self.BORDER / 2,
+                                      -self.MARGIN - self.BORDER / 2, -self.MARGIN - self.BORDER / 2)
+        border = style['border'].lighter(160) if option.state & QStyle.State_Selected else style['border']
+        painter.setPen(QPen(border, self.BORDER))
+        painter.setBrush(style['background'])
+        painter.drawRect(frame)
+
+        inner_width = max(1, rect.width() - 2 * inset)
+        layout, text_height = self._text_layout(record, inner_width)
+        if record.size_hint is None or not record.size_hint[2] or record.size_hint[0] != rect.width():
+            # Replace the estimate (or the pre-streaming height) with the real one
+            height = self._height(record, inner_width, text_height)
+            changed = record.size_hint is None or record.size_hint[1].height() != height
+            record.size_hint = (rect.width(), QSize(rect.width(), height), True)
+            if changed:
+                self.view.row_resized(index)
+        painter.setPen(style['color'])
+        layout.draw(painter, QPointF(rect.left() + inset, rect.top() + inset))
+        y = rect.top() + inset + text_height
+
+        if self._has_action(record):
+            button = self._button_rect(record, rect)
+            hovered = button.contains(self.view.viewport().mapFromGlobal(QCursor.pos()))
+            if record.busy:
+                fill = QColor('#5D6D7E')
+            else:
+                fill = QColor('#3498DB' if hovered else '#2980B9')
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(fill)
+            painter.drawRoundedRect(QRectF(button), 5, 5)
+            painter.setPen(QColor('white'))
+            painter.setFont(self.view.font())
+            painter.drawText(button, Qt.AlignCenter, self.busy_text if record.busy else self.action_text)
+            y = button.bottom() + 1
+
+        if record.image_path:
+            size = self._image_size(record, inner_width)
+            if not size.isEmpty():
+                painter.drawPixmap(rect.left() + inset, y + self.SPACING, self._pixmap(record, size))
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index: QModelIndex) -> bool:
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            record = model.record_at(index.row())
+            if self._has_action(record) and not record.busy and \
+                    self._button_rect(record, option.rect).contains(event.pos()):
+                self.action_clicked.emit(record)
+                return True
+        return False
+
+
+class GameLogView(QTreeView):
+    """Virtualized game log: only rows in the viewport are laid out and painted.
+
+    Holds its own GameLogModel (log_model) and GameLogDelegate
+    (log_delegate), and keeps showing the newest entry while the user is
+    scrolled to the bottom. A headerless QTreeView rather than a QListView
+    because it caches row heights: a streaming row re-measures just itself
+    instead of re-flowing the whole list.
+    """
+    action_clicked = pyqtSignal(object)  # LogRecord
+    RELAYOUT_DELAY_MS = 100
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log_model = GameLogModel(self)
+        self.log_delegate = GameLogDelegate(self)
+        self.setModel(self.log_model)
+        self.setItemDelegate(self.log_delegate)
+        self.log_delegate.action_clicked.connect(self.action_clicked)
+
+        self.setHeaderHidden(True)
+        self.setRootIsDecorated(False)
+        self.setIndentation(0)
+        self.setItemsExpandable(False)
+        self.setUniformRowHeights(False)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(20)
+        # A scrollbar that comes and goes would change the width and re-wrap every row
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setMouseTracking(True)
+        self._hover_index = QModelIndex()
+
+        self._follow = True
+        self._paging = False
+        self.verticalScrollBar().rangeChanged.connect(self._on_range_changed)
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+        # Rows measured during a paint are re-sized once the paint is over
+        self._resized_rows = []
+        # Re-wrap everything once a window resize settles, not on every step of the drag
+        self._layout_width = 0
+        self._relayout_timer = QTimer(self)
+        self._relayout_timer.setSingleShot(True)
+        self._relayout_timer.setInterval(self.RELAYOUT_DELAY_MS)
+        self._relayout_timer.timeout.connect(self.scheduleDelayedItemsLayout)
+        self.setFrameShape(QFrame.NoFrame)
+
+    def row_resized(self, index: QModelIndex):
+        if not self._resized_rows:
+            QTimer.singleShot(0, self._update_resized_rows)
+        self._resized_rows.append(QPersistentModelIndex(index))
+
+    def _update_resized_rows(self):
+        rows, self._resized_rows = self._resized_rows, []
+        for row in rows:
+            if row.isValid():
+                index = self.log_model.index(row.row())
+                # QTreeView.dataChanged refreshes its cached height for just this row
+                self.dataChanged(index, index)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.viewport().width() != self._layout_width:
+            self._layout_width = self.viewport().width()
+            self._relayout_timer.start()
+
+    def _on_range_changed(self, minimum: int, maximum: int):
+        if self._follow:
+            self.verticalScrollBar().setValue(maximum)
+
+    def _on_scrolled(self, value: int):
+        bar = self.verticalScrollBar()
+        model = self.log_model
+        if self._paging:
+            return
+        # Keep showing new entries only while the user is at the bottom
+        self._follow = value >= bar.maximum() and not model.has_newer()
+        if value == bar.minimum() and bar.maximum() > 0 and model.has_older():
+            self._page(model.page_older)
+        elif value == bar.maximum() and model.has_newer():
+            self._page(model.page_newer)
+
+    def _page(self, page):
+        """Slide the model's window, keeping the entry at the top of the viewport in place"""
+        anchor = self.indexAt(QPoint(0, 0))
+        record = self.log_model.record_at(anchor.row()) if anchor.isValid() else None
+        top = self.visualRect(anchor).top()
+        self._paging = True
+        try:
+            page()
+            self.executeDelayedItemsLayout()
+            row = self.log_model.row_of(record) if record else -1
+            if row >= 0:
+                bar = self.verticalScrollBar()
+                bar.setValue(bar.value() + self.visualRect(self.log_model.index(row)).top() - top)
+        finally:
+            self._paging = False
+
+    def scroll_to_end(self):
+        self.log_model.show_latest()
+        self._follow = True
+        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+
+    def mouseMoveEvent(self, event):
+        super().mouseMoveEvent(event)
+        # Repaint the rows the pointer left and entered so the button hover follows it
+        index = self.indexAt(event.pos())
+        for hovered in (self._hover_index, index):
+            if hovered.isValid():
+                self.viewport().update(self.visualRect(hovered))
+        self._hover_index = index
+
+    def copy_selection(self):
+        rows = sorted(index.row() for index in self.selectedIndexes())
+        if rows:
+            QApplication.clipboard().setText("\n\n".join(self.log_model.record_at(row).text for row in rows))
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            self.copy_selection()
+        else:
+            super().keyPressEvent(event)
+
+    def contextMenuEvent(self, event):
+        if not self.indexAt(event.pos()).isValid():
+            return
+        menu = QMenu(self)
+        menu.addAction("Copy", self.copy_selection)
+        menu.exec_(event.globalPos())
@@ -1,15 +1,23 @@
-from PyQt5.QtWidgets import QMainWindow, QTabWidget
+from PyQt5.QtWidgets import QMainWindow, QTabWidget, QWidget
 from PyQt5.QtCore import Qt
-from PyQt5 import uic, QtWidgets
+from PyQt5 import QtWidgets
 from PyQt5.QtGui import QIcon
 import os
-from .character_tab import CharacterTab
-from .adventure_tab import AdventureTab
-from .play_game_tab import PlayGameTab
-from .party_status_tab import PartyStatusTab
-from .settings_tab import SettingsTab
+import time
+import importlib
+from typing import Dict, Optional
+from .ui_loader import load_ui
 from game_manager import GameManager
 
+# (module, class, title) in tab order; a tab's module is imported when it is first shown
+TABS = [
+    ('character_tab', 'CharacterTab', "Character"),
+    ('adventure_tab', 'AdventureTab', "Adventure"),
+    ('play_game_tab', 'PlayGameTab', "Play Game"),
+    ('party_status_tab', 'PartyStatusTab', "Party Status"),
+    ('settings_tab', 'SettingsTab', "Settings")
+]
+
 class MainWindow(QMainWindow):
     def __init__(self, game_manager: GameManager):
         super().__init__()
@@ -19,7 +27,7 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(QtWidgets.QWidget())
         
         # Load the UI file
-        uic.loadUi('current/ui/designer/main_window.ui', self)
+        load_ui(self, 'main_window')
         
         # Set application icon
         icon_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'icon.ico')
@@ -47,16 +55,41 @@ class MainWindow(QMainWindow):
         self.show()
         
     def setup_tabs(self):
-        """Create and add all tabs with proper game_manager initialization"""
-        # Create tab instances
-        tabs = [
-            (CharacterTab(self.game_manager), "Character"),
-            (AdventureTab(self.game_manager), "Adventure"),
-            (PlayGameTab(self.game_manager), "Play Game"),
-            (PartyStatusTab(self.game_manager), "Party Status"),
-            (SettingsTab(self.game_manager), "Settings")
-        ]
-        
-        # Add tabs to widget
-        for tab, title in tabs:
-            self.tabWidget.addTab(tab, title)
+        """Add a placeholder per tab; each real tab is built the first time it is shown"""
+        self.tabs: Dict[str, Optional[QWidget]] = {}
+        self.tab_build_times: Dict[str, float] = {}  # seconds, for --profile-startup
+        for _, _, title in TABS:
+            self.tabs[title] = None
+            self.tabWidget.addTab(QWidget(), title)
+        self.tabWidget.currentChanged.connect(self.on_tab_changed)
+        self.on_tab_changed(self.tabWidget.currentIndex())
+
+    def on_tab_changed(self, index: int):
+        if 0 <= index < len(TABS):
+            self.tab(TABS[index][2])
+
+    def tab(self, title: str) -> QWidget:
+        """The tab with this title, building it in place of its placeholder if needed"""
+        if self.tabs.get(title) is None:
+            index = [tab_title for _, _, tab_title in TABS].index(title)
+            module_name, class_name, _ = TABS[index]
+            start = time.perf_counter()
+            module = importlib.import_module(f".{module_name}", __package__)
+            tab = getattr(module, class_name)(self.game_manager)
+            self.tabs[title] = tab
+            self.tab_build_times[title] = time.perf_counter() - start
+
+            current = self.tabWidget.currentIndex()
+            placeholder = self.tabWidget.widget(index)
+            self.tabWidget.blockSignals(True)
+            self.tabWidget.removeTab(index)
+            self.tabWidget.insertTab(index, tab, title)
+            self.tabWidget.setCurrentIndex(current)
+            self.tabWidget.blockSignals(False)
+            placeholder.deleteLater()
+        return self.tabs[title]
+
+    def show_tab(self, title: str) -> QWidget:
+        tab = self.tab(title)
+        self.tabWidget.setCurrentWidget(tab)
+        return tab
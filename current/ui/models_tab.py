@@ -1,11 +1,13 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QComboBox, QPushButton, QLineEdit)
 from PyQt5.QtCore import Qt
+from .workers import TaskRunner
 
 class ModelsTab(QWidget):
     def __init__(self, game_manager):
         super().__init__()
         self.game_manager = game_manager
+        self.task_runner = TaskRunner(self)
         self.init_ui()
         self.load_saved_models()
         
@@ -51,14 +53,32 @@ class ModelsTab(QWidget):
         self.load_available_models()
         
     def load_available_models(self):
-        models = self.game_manager.list_available_models()
-        self.dm_model_combo.addItems(models)
-        for combo in self.npc_models:
+        # Served from the on-disk catalog; a stale catalog is refreshed off-thread
+        self.populate_model_combos(self.game_manager.list_available_models())
+        self.task_runner.submit(
+            self.game_manager.refresh_model_catalog,
+            on_result=self.on_models_refreshed
+        )
+        
+    def populate_model_combos(self, models):
+        """Replace the combo items, keeping each combo's current selection"""
+        for combo in [self.dm_model_combo] + self.npc_models:
+            current = combo.currentText()
+            combo.blockSignals(True)
+            combo.clear()
             combo.addItems(models)
+            if current and current not in models:
+                combo.insertItem(0, current)
+            if current:
+                combo.setCurrentText(current)
+            combo.blockSignals(False)
+            
+    def on_models_refreshed(self, changed):
+        if changed:
+            self.filter_models(self.filter_input.text())
             
     def filter_models(self, text):
-        # TODO: Implement model filtering
-        pass
+        self.populate_model_combos(self.game_manager.filter_models(text))
         
     def load_saved_models(self):
         # Load previously saved models
@@ -0,0 +1,33 @@
+from typing import Optional
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class PartyModel(QObject):
+    """Qt face of the game manager's party: one signal per kind of change.
+
+    GameManager calls its party listeners from whichever thread applied
+    the change (damage is applied on turn workers); signals emitted there
+    reach GUI-thread slots through queued connections.
+    """
+    hp_changed = pyqtSignal(str, int, int)  # name, hp, max_hp
+    ac_changed = pyqtSignal(str, int)
+    equipment_changed = pyqtSignal(str, list)
+    portrait_changed = pyqtSignal(str, str)
+    party_changed = pyqtSignal()  # Roster replaced (new party, loaded game, reset)
+
+    def __init__(self, game_manager, parent=None):
+        super().__init__(parent)
+        self.game_manager = game_manager
+        game_manager.add_party_listener(self.on_party_event)
+
+    def on_party_event(self, name: Optional[str], field: str, value):
+        if field == 'party':
+            self.party_changed.emit()
+        elif field == 'hp':
+            self.hp_changed.emit(name, *value)
+        elif field == 'ac':
+            self.ac_changed.emit(name, value)
+        elif field == 'equipment':
+            self.equipment_changed.emit(name, list(value))
+        elif field == 'portrait':
+            self.portrait_changed.emit(name, value or '')
@@ -1,20 +1,19 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QScrollArea, QFrame, QPushButton, QTextEdit)
+                           QScrollArea, QFrame, QPushButton)
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPixmap
 from character_image_handler import CharacterImageHandler
+from character import Character
+from .party_model import PartyModel
 import os  # Added missing import
 
+SECTION = "<span style='font-size: 18px; font-weight: bold; color: #FFE0B2;'>{}</span>"
+
 class CharacterStatusCard(QFrame):
-    def __init__(self, character_data, game_manager, parent=None):
-        super().__init__(parent)
-        self.game_manager = game_manager
-        self.character_data = character_data
-        self.image_handler = CharacterImageHandler(game_manager)
-        self.init_ui()
-        self.setStyleSheet("""
+    """One party member's card; PartyStatusTab pushes changes into the set_* methods"""
+    STYLE = """
             QFrame {
-                background-color: #203D72;
+                background-color: %(background)s;
                 border-radius: 10px;
                 padding: 15px;
                 margin: 5px;
@@ -36,25 +35,29 @@ class CharacterStatusCard(QFrame):
                 margin-top: 10px;
             }
             QWidget {
-                background-color: #203D72;
+                background-color: %(background)s;
+            }
+            QLabel[info=true] {
+                padding: 0px;
+                margin: 0px;
             }
             QScrollArea {
                 border: none;
                 background-color: #FFECCC;
             }
-            QTextEdit {
-                font-size: 16px;
-                line-height: 1.4;
-            }
-        """)
+        """
+    BACKGROUND = '#203D72'
+    DAMAGE_BACKGROUND = '#722020'
 
-        # Add HP update timer
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.check_hp_updates)
-        self.update_timer.start(1000)  # Check every second
-        
-        # Store last known HP
-        self.last_known_hp = self.get_current_hp()
+    def __init__(self, character_data, game_manager, parent=None):
+        super().__init__(parent)
+        self.game_manager = game_manager
+        self.character_data = character_data
+        self.image_handler = CharacterImageHandler(game_manager)
+        self.hp = character_data.get('hp', 30)
+        self.max_hp = character_data.get('max_hp', self.hp)
+        self.init_ui()
+        self.setStyleSheet(self.STYLE % {'background': self.BACKGROUND})
 
     def find_portrait_file(self) -> str:
         """Find matching portrait file for this character"""
@@ -125,7 +128,7 @@ class CharacterStatusCard(QFrame):
                     self.character_data['image_path'] = portrait_path
         
         # Character info
-        self.display_character_info(layout)
+        layout.addWidget(self.build_character_info())
         
         # Generate Portrait button at bottom for NPCs
         if not self.is_player_character():
@@ -178,58 +181,19 @@ class CharacterStatusCard(QFrame):
                 # Only save to character file if it's a player character
                 if self.is_player_character():
                     self.game_manager.save_character(char_data)
-                else:
-                    # For NPCs, update the party data to include image path
-                    self.game_manager.party[char_data['name']] = {
-                        **char_data,
-                        'image_path': image_path
-                    }
                 
-                # Display the new portrait
-                self.display_portrait(image_path)
+                # Records it on the party member; the portrait_changed signal redraws this card
+                self.game_manager.set_character_portrait(char_data['name'], image_path)
                 
         except Exception as e:
             print(f"Error generating portrait: {e}")
 
     def parse_character_data(self):
-        """Convert string character data to dictionary format"""
+        """Character data as a dictionary"""
         if isinstance(self.character_data, dict):
             return self.character_data
-            
-        char_dict = {
-            'name': 'Unknown',
-            'race': 'Unknown',
-            'class': 'Unknown',
-            'equipment': [],
-            'personality': '',
-            'image_path': self.find_portrait_file()  # Add existing portrait if found
-        }
-        
-        # Parse the character string
-        lines = self.character_data.split('\n')
-        current_section = None
-        
-        for line in lines:
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip().lower()
-                value = value.strip()
-                
-                if key == 'name':
-                    char_dict['name'] = value
-                elif key == 'race':
-                    char_dict['race'] = value
-                elif key == 'class':
-                    char_dict['class'] = value
-                elif key == 'personality':
-                    current_section = 'personality'
-                    char_dict['personality'] = value
-                elif key == 'equipment':
-                    current_section = 'equipment'
-                    char_dict['equipment'] = []
-            elif current_section == 'equipment' and line.strip().startswith('-'):
-                char_dict['equipment'].append(line.strip('- ').strip())
-                
+        char_dict = Character.from_any(self.character_data).to_dict()
+        char_dict.setdefault('image_path', self.find_portrait_file())  # Add existing portrait if found
         return char_dict
 
     def display_portrait(self, image_path):
@@ -241,164 +205,85 @@ class CharacterStatusCard(QFrame):
             self.portrait_label.setPixmap(scaled_pixmap)
             self.portrait_label.setToolTip("Character Portrait")
 
-    def parse_hp_value(self, hp_string: str) -> int:
-        """Parse HP value from various string formats"""
-        try:
-            # If it's already a number, return it
-            if isinstance(hp_string, (int, float)):
-                return int(hp_string)
-                
-            # Clean up the string
-            hp_string = hp_string.strip()
-            
-            # If it's a simple number string
-            if hp_string.isdigit():
-                return int(hp_string)
-                
-            # Handle formats like "34 (5d8 + 14 CON mod)"
-            if '(' in hp_string:
-                # Take only the first number before parentheses
-                base_hp = hp_string.split('(')[0].strip()
-                if base_hp.isdigit():
-                    return int(base_hp)
-                    
-            # Try to extract the first number from the string
-            import re
-            numbers = re.findall(r'\d+', hp_string)
-            if numbers:
-                return int(numbers[0])
-                
-            # If all else fails, return default HP
-            return 30
-            
-        except Exception as e:
-            print(f"Error parsing HP value '{hp_string}': {e}")
-            return 30
+    def build_character_info(self) -> QWidget:
+        """Static details plus one label per field that can change in play"""
+        info = QWidget()
+        info.setMinimumHeight(300)  # Keeps the cards aligned
+        info_layout = QVBoxLayout(info)
+        info_layout.setContentsMargins(0, 0, 0, 0)
 
-    def get_current_hp(self) -> int:
-        """Get current HP from character data"""
-        if isinstance(self.character_data, dict):
-            hp_value = self.character_data.get('hp', 30)
-            return self.parse_hp_value(hp_value)
-        else:
-            # Parse HP from string format
-            for line in self.character_data.split('\n'):
-                if line.startswith('HP:'):
-                    try:
-                        hp_str = line.split(':')[1].strip().split('/')[0].strip()
-                        return self.parse_hp_value(hp_str)
-                    except (ValueError, IndexError) as e:
-                        print(f"Error parsing HP line '{line}': {e}")
-                        return 30
-        return 30
+        def add_label(text: str = "") -> QLabel:
+            label = QLabel(text)
+            label.setProperty('info', True)
+            label.setTextFormat(Qt.RichText)
+            label.setWordWrap(True)
+            info_layout.addWidget(label)
+            return label
 
-    def display_character_info(self, layout):
-        """Display the character information"""
-        info = QTextEdit()
-        info.setReadOnly(True)
-        info.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)  # Disable scroll
-        info.setFixedHeight(300)  # Fixed height to prevent scrolling
-        
-        # Format character info with larger text and section headers
-        equipment_list = self.character_data.get('equipment', ['Basic adventuring gear'])
-        if isinstance(equipment_list, str):
-            equipment_items = [item.strip() for item in equipment_list.split(',')]
-        else:
-            equipment_items = equipment_list
-            
-        # Create formatted HTML text with larger font and section headers
-        current_hp = self.get_current_hp()
-        max_hp = current_hp  # Use current as max if not specified
-        
-        # Try to get max HP if available
-        if isinstance(self.character_data, dict):
-            max_hp_str = self.character_data.get('max_hp', current_hp)
-            max_hp = self.parse_hp_value(str(max_hp_str))
-        
-        hp_percent = (current_hp / max_hp) * 100 if max_hp > 0 else 0
-        
+        add_label(f"{SECTION.format('Race:')} {self.character_data.get('race', 'Unknown')}<br>"
+                  f"{SECTION.format('Class:')} {self.character_data.get('class', 'Unknown')}")
+        self.hp_label = add_label()
+        self.ac_label = add_label()
+        scores = self.character_data.get('ability_scores', {})
+        add_label(SECTION.format('Ability Scores:') + '<br>' + '<br>'.join(
+            f"{ability}: {scores.get(ability, '10')}" for ability in ('STR', 'DEX', 'CON', 'INT', 'WIS', 'CHA')
+        ))
+        self.equipment_label = add_label()
+        info_layout.addStretch()
+
+        self.set_hp(self.hp, self.max_hp)
+        self.set_ac(self.character_data.get('ac', '?'))
+        self.set_equipment(self.character_data.get('equipment', ['Basic adventuring gear']))
+        return info
+
+    def set_hp(self, hp: int, max_hp: int):
+        took_damage = hp < self.hp
+        self.hp, self.max_hp = hp, max_hp
+        self.character_data['hp'], self.character_data['max_hp'] = hp, max_hp
+
+        hp_percent = (hp / max_hp) * 100 if max_hp > 0 else 0
         if hp_percent <= 25:
             hp_color = '#E74C3C'  # Red for low HP
         elif hp_percent <= 50:
             hp_color = '#F39C12'  # Orange for medium HP
         else:
             hp_color = '#2ECC71'  # Green for high HP
-            
-        # Format HP display with current/max if available
-        hp_text = f"""<p><span style='font-size: 18px; font-weight: bold; color: #FFE0B2;'>HP:</span> 
-                     <span style='color: {hp_color};'>{current_hp}</span>"""
-        if max_hp != current_hp:
-            hp_text += f"<span style='color: {hp_color};'>/{max_hp}</span>"
-        hp_text += "</p>"
-        
-        info_html = f"""
-        <div style='font-size: 16px; line-height: 1.4;'>
-            <p><span style='font-size: 18px; font-weight: bold; color: #FFE0B2;'>Race:</span> {self.character_data.get('race', 'Unknown')}</p>
-            <p><span style='font-size: 18px; font-weight: bold; color: #FFE0B2;'>Class:</span> {self.character_data.get('class', 'Unknown')}</p>
-            {hp_text}
-            <p><span style='font-size: 18px; font-weight: bold; color: #FFE0B2;'>AC:</span> {self.character_data.get('ac', '?')}</p>
-            
-            <p style='font-size: 18px; font-weight: bold; color: #FFE0B2; margin-top: 15px;'>Ability Scores:</p>
-            <p>STR: {self.character_data.get('ability_scores', {}).get('STR', '10')}</p>
-            <p>DEX: {self.character_data.get('ability_scores', {}).get('DEX', '10')}</p>
-            <p>CON: {self.character_data.get('ability_scores', {}).get('CON', '10')}</p>
-            <p>INT: {self.character_data.get('ability_scores', {}).get('INT', '10')}</p>
-            <p>WIS: {self.character_data.get('ability_scores', {}).get('WIS', '10')}</p>
-            <p>CHA: {self.character_data.get('ability_scores', {}).get('CHA', '10')}</p>
-            
-            <p style='font-size: 18px; font-weight: bold; color: #FFE0B2; margin-top: 15px;'>Equipment:</p>
-            {''.join(f'<p>• {item}</p>' for item in equipment_items)}
-        </div>
-        """
-        
-        info.setHtml(info_html)
-        info.setStyleSheet("""
-            QTextEdit {
-                background-color: transparent;
-                border: none;
-                color: #ECF0F1;
-            }
-        """)
-        layout.addWidget(info)
+        hp_text = f"{hp}/{max_hp}" if max_hp != hp else f"{hp}"
+        self.hp_label.setText(f"{SECTION.format('HP:')} <span style='color: {hp_color};'>{hp_text}</span>")
+
+        if took_damage:
+            # Flash red for damage
+            self.setStyleSheet(self.STYLE % {'background': self.DAMAGE_BACKGROUND})
+            QTimer.singleShot(500, self.restore_style)
 
-    def check_hp_updates(self):
-        """Check if HP has changed and update display"""
-        current_hp = self.get_current_hp()
-        if current_hp != self.last_known_hp:
-            self.display_character_info(self.layout())
-            if current_hp < self.last_known_hp:
-                # Flash red for damage
-                self.setStyleSheet("""
-                    QFrame {
-                        background-color: #722020;
-                        border-radius: 10px;
-                        padding: 15px;
-                        margin: 5px;
-                    }
-                """)
-                QTimer.singleShot(500, self.restore_style)
-            self.last_known_hp = current_hp
+    def set_ac(self, ac):
+        self.character_data['ac'] = ac
+        self.ac_label.setText(f"{SECTION.format('AC:')} {ac}")
+
+    def set_equipment(self, equipment):
+        if isinstance(equipment, str):
+            equipment = [item.strip() for item in equipment.split(',')]
+        self.character_data['equipment'] = list(equipment)
+        self.equipment_label.setText(SECTION.format('Equipment:') + ''.join(f"<br>• {item}" for item in equipment))
 
     def restore_style(self):
         """Restore original style after damage flash"""
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #203D72;
-                border-radius: 10px;
-                padding: 15px;
-                margin: 5px;
-            }
-        """)
+        self.setStyleSheet(self.STYLE % {'background': self.BACKGROUND})
 
 class PartyStatusTab(QWidget):
     def __init__(self, game_manager):
         super().__init__()
         self.game_manager = game_manager
+        self.cards = {}
         self.init_ui()
         
-    def showEvent(self, event):
-        """Called when tab becomes visible"""
-        super().showEvent(event)
+        # Cards follow the party through change signals; nothing polls
+        self.party_model = PartyModel(game_manager, self)
+        self.party_model.party_changed.connect(self.update_party_status)
+        self.party_model.hp_changed.connect(lambda name, hp, max_hp: self._card_call(name, 'set_hp', hp, max_hp))
+        self.party_model.ac_changed.connect(lambda name, ac: self._card_call(name, 'set_ac', ac))
+        self.party_model.equipment_changed.connect(lambda name, items: self._card_call(name, 'set_equipment', items))
+        self.party_model.portrait_changed.connect(lambda name, path: self._card_call(name, 'display_portrait', path))
         self.update_party_status()
         
     def init_ui(self):
@@ -414,10 +299,16 @@ class PartyStatusTab(QWidget):
         layout.addWidget(scroll)
         
         self.setLayout(layout)
+
+    def _card_call(self, name: str, method: str, *args):
+        card = self.cards.get(name)
+        if card:
+            getattr(card, method)(*args)
         
     def update_party_status(self):
-        """Update party status display"""
+        """Rebuild the cards for a new roster"""
         # Clear existing cards
+        self.cards = {}
         while self.cards_layout.count():
             item = self.cards_layout.takeAt(0)
             if item.widget():
@@ -426,9 +317,7 @@ class PartyStatusTab(QWidget):
         # Add card for each party member
         if self.game_manager.party:
             for name, char_data in self.game_manager.party.items():
-                # Convert string data to dict if needed
-                if isinstance(char_data, str):
-                    char_data = self.parse_character_string(char_data)
+                char_data = Character.from_any(char_data, fallback_name=name).to_dict()
                 # Update image path if it's the player character
                 if self.is_player_character(name):
                     player_char = self.game_manager.get_player_character()
@@ -436,93 +325,10 @@ class PartyStatusTab(QWidget):
                         char_data['image_path'] = player_char['image_path']
                 if char_data:
                     card = CharacterStatusCard(char_data, self.game_manager)
+                    self.cards[name] = card
                     self.cards_layout.addWidget(card)
 
     def is_player_character(self, name: str) -> bool:
         """Check if the given name matches the player character"""
         player_char = self.game_manager.get_player_character()
         return player_char and player_char.get('name') == name
-
-    def parse_character_string(self, char_str: str) -> dict:
-        """Parse character string into dictionary with error handling"""
-        char_dict = {
-            'name': 'Unknown',
-            'race': 'Unknown',
-            'class': 'Unknown',
-            'background': 'Unknown',
-            'alignment': 'Unknown',
-            'hp': '?',
-            'ac': '?',
-            'ability_scores': {},
-            'equipment': [],
-            'personality': '',
-            'backstory': ''
-        }
-        
-        try:
-            # If it's already a dictionary (player character)
-            if isinstance(char_str, dict):
-                char_dict.update(char_str)
-                # Convert equipment string to list if needed
-                if isinstance(char_dict['equipment'], str):
-                    items = [item.strip() for item in char_dict['equipment'].split(',')]
-                    char_dict['equipment'] = [item for item in items if item]
-                return char_dict
-
-            # Parse string format (NPCs)
-            lines = char_str.split('\n')
-            equipment_section = False
-            equipment_items = []
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                # Check for section headers
-                if line.startswith('Equipment:'):
-                    equipment_section = True
-                    continue
-                    
-                # Parse equipment items
-                if equipment_section and line.startswith('-'):
-                    item = line.replace('-', '').strip()
-                    if item:
-                        equipment_items.append(item)
-                
-                # Parse other attributes
-                elif ':' in line and not equipment_section:
-                    key, value = line.split(':', 1)
-                    key = key.strip().lower()
-                    value = value.strip()
-                    
-                    if key == 'name':
-                        char_dict['name'] = value
-                    elif key == 'race':
-                        char_dict['race'] = value
-                    elif key == 'class':
-                        char_dict['class'] = value
-                    elif key == 'hp':
-                        char_dict['hp'] = value.split('/')[0].strip()
-                    elif key == 'ac':
-                        char_dict['ac'] = value.split()[0].strip()
-                    elif key in ['str', 'dex', 'con', 'int', 'wis', 'cha']:
-                        if 'ability_scores' not in char_dict:
-                            char_dict['ability_scores'] = {}
-                        char_dict['ability_scores'][key.upper()] = value.split()[0]
-                
-                # Stop equipment section if we hit another section
-                elif line.endswith(':'):
-                    equipment_section = False
-            
-            # Store equipment
-            if equipment_items:
-                char_dict['equipment'] = equipment_items
-            elif not char_dict['equipment']:
-                char_dict['equipment'] = ['Basic adventuring gear']
-                
-        except Exception as e:
-            print(f"Error parsing character data: {e}")
-            print(f"Problematic character string: {char_str[:100]}...")  # Debug print
-            
-        return char_dict
@@ -5,10 +5,13 @@ from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QTextCursor, QPixmap
 from enum import Enum
 import traceback
-from PyQt5 import uic
+from .ui_loader import load_ui
 import random
 import os
 from scene_image_handler import SceneImageHandler
+from .workers import TaskRunner
+from .dialogs import SaveSearchDialog
+from .game_log import LogRecord
 
 class GameState(Enum):
     WAITING_FOR_INPUT = 1
@@ -16,84 +19,6 @@ class GameState(Enum):
     WAITING_FOR_ROLL = 3
     ERROR = 4
 
-class GameLogEntry(QFrame):
-    def __init__(self, text, entry_type="normal", parent=None):
-        super().__init__(parent)
-        self.main_layout = QVBoxLayout(self)
-        self.text_area = QTextEdit()
-        self.text_area.setReadOnly(True)
-        self.text_area.setText(text)
-        self.text_area.setMinimumHeight(100)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.main_layout.addWidget(self.text_area)
-        
-        # Add image generation button for DM messages
-        if entry_type == "dm":
-            self.image_layout = QVBoxLayout()
-            self.generate_image_btn = QPushButton("🎨 Generate Scene Image")
-            self.generate_image_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #2980B9;
-                    color: white;
-                    border: none;
-                    border-radius: 5px;
-                    padding: 5px;
-                    max-width: 200px;
-                }
-                QPushButton:hover {
-                    background-color: #3498DB;
-                }
-            """)
-            self.image_layout.addWidget(self.generate_image_btn)
-            
-            # Add image display label (hidden initially)
-            self.image_label = QLabel()
-            self.image_label.setVisible(False)
-            self.image_label.setStyleSheet("""
-                QLabel {
-                    background-color: transparent;
-                    border: 2px solid #203D72;
-                    border-radius: 10px;
-                    padding: 5px;
-                }
-            """)
-            self.image_layout.addWidget(self.image_label)
-            self.main_layout.addLayout(self.image_layout)
-        
-        # Apply styles based on entry type
-        if entry_type == "dm":
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: #203D72;
-                    border: 2px solid #334970;
-                    margin: 5px;
-                }
-                QTextEdit {
-                    color: #ECF0F1;
-                    background-color: transparent;
-                    border: none;
-                    font-family: 'MedievalSharp';
-                    font-size: 18px;
-                    padding: 10px;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: #334970;
-                    border: 2px solid #203D72;
-                    margin: 5px;
-                }
-                QTextEdit {
-                    color: #ECF0F1;
-                    background-color: transparent;
-                    border: none;
-                    font-family: 'Poppins', sans-serif;
-                    font-size: 14px;
-                    padding: 10px;
-                }
-            """)
-
 class PlayGameTab(QWidget):
     def __init__(self, game_manager):
         super().__init__()
@@ -101,7 +26,16 @@ class PlayGameTab(QWidget):
         self.last_dm_message = ""
         
         # Load UI
-        uic.loadUi('current/ui/designer/play_game_tab.ui', self)
+        load_ui(self, 'play_game_tab')
+        
+        # The game log is a model/view list: every message is a plain LogRecord in
+        # log_model, and only the rows on screen are laid out and painted
+        self.log_model = self.gameLog.log_model
+        delegate = self.gameLog.log_delegate
+        delegate.set_entry_style('dm', '#203D72', '#334970', '#ECF0F1', 'MedievalSharp', 18)
+        delegate.set_entry_style('normal', '#334970', '#203D72', '#ECF0F1', 'Poppins', 14)
+        delegate.set_action("🎨 Generate Scene Image", "Generating image...")
+        self.gameLog.action_clicked.connect(lambda record: self.generate_scene_image(record, record.text))
         
         # Connect signals
         self.submitBtn.clicked.connect(self.submit_action)
@@ -110,6 +44,13 @@ class PlayGameTab(QWidget):
         self.rollDiceBtn.clicked.connect(self.roll_dice)
         self.saveGameBtn.clicked.connect(self.save_game)
         self.loadGameBtn.clicked.connect(self.load_game)
+        self.searchSavesBtn.clicked.connect(self.search_saves)
+        self.cancelBtn.clicked.connect(self.cancel_turn)
+        self.cancelBtn.hide()
+        
+        # Network-bound work runs on the thread pool so the window keeps painting
+        self.task_runner = TaskRunner(self)
+        self.turn_worker = None
         
         # Update button text to match settings tab
         self.stopBtn.setText("🔊 Volume")
@@ -144,49 +85,130 @@ class PlayGameTab(QWidget):
         # Initialize scene image handler
         self.scene_image_handler = SceneImageHandler(game_manager)
 
-    def add_message(self, text: str, is_dm: bool = False):
-        entry = GameLogEntry(text, "dm" if is_dm else "normal")
+    def add_message(self, text: str, is_dm: bool = False) -> LogRecord:
         if is_dm:
             self.last_dm_message = text
-            # Connect image generation button if it's a DM message
-            entry.generate_image_btn.clicked.connect(
-                lambda: self.generate_scene_image(entry, text)
-            )
-        self.gameLogLayout.addWidget(entry)
+        record = self.log_model.append(text, is_dm)
+        self.gameLog.scroll_to_end()
+        return record
 
-    def generate_scene_image(self, entry: GameLogEntry, scene_text: str):
-        """Generate and display an image for the given scene"""
-        try:
-            entry.generate_image_btn.setEnabled(False)
-            entry.generate_image_btn.setText("Generating image...")
-            
-            # Generate the image
-            image_path = self.scene_image_handler.generate_scene_image(scene_text)
-            
+    def show_transcript(self, responses: list):
+        """Add a loaded game's responses to the log"""
+        self.log_model.extend(responses, is_dm=True)
+        if responses:
+            self.last_dm_message = responses[-1]
+        self.gameLog.scroll_to_end()
+
+    def show_game_transcript(self):
+        """Show the loaded game's transcript; the log fetches older turns from it as it scrolls up"""
+        length = self.game_manager.transcript_length()
+        self.log_model.load_transcript(self.game_manager.transcript_slice, length, is_dm=True)
+        if length:
+            self.last_dm_message = self.game_manager.transcript_slice(length - 1, length)[0]
+        self.gameLog.scroll_to_end()
+
+    def set_turn_busy(self, busy: bool, cancellable: bool = True):
+        """Lock the turn controls while the DM is thinking"""
+        for btn in (self.submitBtn, self.rollDiceBtn, self.saveGameBtn, self.loadGameBtn,
+                    self.searchSavesBtn):
+            btn.setEnabled(not busy)
+        self.inputArea.setReadOnly(busy)
+        self.cancelBtn.setVisible(busy and cancellable)
+
+    def on_turn_worker_finished(self):
+        self.turn_worker = None
+        self.set_turn_busy(False)
+
+    def request_dm_response(self, action: str, on_done=None) -> bool:
+        """Send an action to the DM on a worker thread.
+
+        Streams tokens into a new log entry when streaming is enabled. Returns
+        False (and does nothing) if a turn is already in flight.
+        """
+        if self.turn_worker:
+            return False
+
+        entry = None
+        if self.game_manager.stream_responses:
+            entry = self.add_message("", is_dm=True)
+            self.log_model.set_busy(entry, True)
+
+        def on_result(response):
+            if entry is None:
+                if response:
+                    self.add_message(response, is_dm=True)
+            else:
+                # Replace the raw stream with the post-processed text (damage notes etc.)
+                self.log_model.set_text(entry, response)
+                self.log_model.set_busy(entry, False)
+                self.last_dm_message = response
+            if on_done:
+                on_done()
+
+        def on_progress(delta):
+            self.log_model.append_text(entry, delta.replace('*', ''))
+
+        def discard_entry():
+            if entry is not None:
+                self.log_model.remove(entry)
+
+        def on_error(message):
+            discard_entry()
+            QMessageBox.warning(self, "Error", message)
+
+        def on_cancelled():
+            discard_entry()
+            self.add_message("(Turn cancelled)")
+
+        self.turn_worker = self.task_runner.submit(
+            self._run_turn, action,
+            on_result=on_result,
+            on_error=on_error,
+            on_cancelled=on_cancelled,
+            on_finished=self.on_turn_worker_finished,
+            on_progress=on_progress if entry else None
+        )
+        self.set_turn_busy(True)
+        return True
+
+    def _run_turn(self, action: str, progress_callback=None) -> str:
+        """Worker-thread body of a turn"""
+        return self.game_manager.process_player_action(action, on_token=progress_callback)
+
+    def cancel_turn(self):
+        """Cancel the DM request in flight"""
+        if self.turn_worker:
+            self.game_manager.cancel_turn()
+            self.task_runner.cancel(self.turn_worker)
+
+    def generate_scene_image(self, record: LogRecord, scene_text: str):
+        """Generate an image for the given scene on a worker thread"""
+        self.log_model.set_busy(record, True)
+
+        def on_result(image_path):
             if image_path and os.path.exists(image_path):
-                # Load and display the image
-                pixmap = QPixmap(image_path)
-                scaled_pixmap = pixmap.scaled(600, 400, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                entry.image_label.setPixmap(scaled_pixmap)
-                entry.image_label.setVisible(True)
+                self.log_model.set_image(record, image_path)
             else:
                 QMessageBox.warning(self, "Error", "Failed to generate scene image")
-                
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error generating scene image: {str(e)}")
-            
-        finally:
-            entry.generate_image_btn.setEnabled(True)
-            entry.generate_image_btn.setText("🎨 Generate Scene Image")
+
+        def on_error(message):
+            QMessageBox.warning(self, "Error", f"Error generating scene image: {message}")
+
+        self.task_runner.submit(
+            self.scene_image_handler.generate_scene_image, scene_text,
+            on_result=on_result,
+            on_error=on_error,
+            on_finished=lambda: self.log_model.set_busy(record, False)
+        )
 
     def submit_action(self):
+        if self.turn_worker:
+            return
         action = self.inputArea.toPlainText().strip()
         if action:
             self.add_message(f"Player: {action}")
-            response = self.game_manager.process_player_action(action)
-            if response:
-                self.add_message(response, is_dm=True)
-            self.inputArea.clear()
+            # Keep the text until the DM answers so a cancelled turn can be retried
+            self.request_dm_response(action, on_done=self.inputArea.clear)
 
     def speak_last_message(self):
         """Speak the last DM message using TTS"""
@@ -219,14 +241,14 @@ class PlayGameTab(QWidget):
 
     def roll_dice(self):
         """Roll a d20 and send the result as an action to the DM"""
+        if self.turn_worker:
+            return
         dice_roll = random.randint(1, 20)
         self.add_message(f"🎲 You rolled a {dice_roll}!", is_dm=False)
         
         # Send the roll as an action to the DM
         action = f"I rolled a {dice_roll} on my d20."
-        response = self.game_manager.process_player_action(action)
-        if response:
-            self.add_message(response, is_dm=True)
+        self.request_dm_response(action)
 
     def save_game(self):
         """Save current game state"""
@@ -254,6 +276,8 @@ class PlayGameTab(QWidget):
 
     def load_game(self):
         """Load a saved game state"""
+        if self.turn_worker:
+            return
         try:
             saved_games = self.game_manager.list_saved_games()
             if not saved_games:
@@ -266,7 +290,7 @@ class PlayGameTab(QWidget):
                 
             # Create list of save files with timestamps
             save_options = [
-                f"{save['name']} ({save['timestamp']})" 
+                f"{save['name']} ({save['timestamp']}) - {save['turns']} turns, {', '.join(save['party'])}"
                 for save in saved_games
             ]
             
@@ -281,29 +305,9 @@ class PlayGameTab(QWidget):
             
             if ok and selection:
                 # Find selected save file
-                selected_save = next(
-                    save for save in saved_games 
-                    if f"{save['name']} ({save['timestamp']})" == selection
-                )
+                selected_save = saved_games[save_options.index(selection)]
                 
-                # Clear existing messages before loading
-                self.clear_messages()
-                
-                # Load the save file
-                if self.game_manager.load_game_state(selected_save['filename']):
-                    # Add loading message
-                    self.add_message("Loading your saved game...", is_dm=True)
-                    
-                    # The recap will be the last response in game_state['responses']
-                    if self.game_manager.game_state and self.game_manager.game_state.get('responses'):
-                        for response in self.game_manager.game_state['responses']:
-                            self.add_message(response, is_dm=True)
-                    
-                    QMessageBox.information(
-                        self, 
-                        "Success", 
-                        "Game loaded successfully!"
-                    )
+                self.start_loading(selected_save['filename'])
                     
         except Exception as e:
             QMessageBox.warning(
@@ -312,9 +316,53 @@ class PlayGameTab(QWidget):
                 f"Failed to load game: {str(e)}"
             )
 
+    def start_loading(self, filename: str):
+        # Clear existing messages before loading
+        self.clear_messages()
+        self.add_message("Loading your saved game...", is_dm=True)
+        
+        # Loading also asks the DM for a recap, so keep it off the GUI thread
+        self.turn_worker = self.task_runner.submit(
+            self._run_load, filename,
+            on_progress=self.on_recent_turns_loaded,
+            on_result=self.on_game_loaded,
+            on_error=lambda message: QMessageBox.warning(
+                self, "Error", f"Failed to load game: {message}"
+            ),
+            on_finished=self.on_turn_worker_finished
+        )
+        self.set_turn_busy(True, cancellable=False)
+
+    def search_saves(self):
+        """Full-text search over every saved game; picking a result loads that save"""
+        if self.turn_worker:
+            return
+        dialog = SaveSearchDialog(self.game_manager, self)
+        if dialog.exec_() and dialog.selected_filename:
+            self.start_loading(dialog.selected_filename)
+
+    def _run_load(self, filename: str, progress_callback=None) -> bool:
+        """Worker-thread body of a load"""
+        return self.game_manager.load_game_state(filename, on_recent=progress_callback)
+
+    def on_recent_turns_loaded(self, responses: list):
+        """Show the save's last turns while the rest of it decodes and the DM writes the recap"""
+        self.clear_messages()
+        self.show_transcript(responses)
+        self.add_message("Recalling your adventure...", is_dm=True)
+
+    def on_game_loaded(self, loaded: bool):
+        if not loaded:
+            return
+        # The recap will be the last response in game_state['responses']
+        self.show_game_transcript()
+        
+        QMessageBox.information(
+            self, 
+            "Success", 
+            "Game loaded successfully!"
+        )
+
     def clear_messages(self):
         """Clear all messages from the game log"""
-        while self.gameLogLayout.count():
-            item = self.gameLogLayout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        self.log_model.clear()
@@ -1,73 +1,5 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, 
-                           QPushButton, QLabel, QScrollArea, QFrame, QApplication, QSizePolicy)
-from PyQt5.QtCore import Qt
-from tts_manager import TTSManager
-
-class LogEntry(QFrame):
-    def __init__(self, text, entry_type="dm", parent=None):
-        super().__init__(parent)
-        layout = QVBoxLayout(self)  # Changed to vertical layout
-        
-        self.text_area = QTextEdit()
-        self.text_area.setReadOnly(True)
-        self.text_area.setText(text)
-        self.text_area.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.text_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.text_area.setMinimumHeight(50)
-        layout.addWidget(self.text_area)
-        
-        if entry_type == "dm":
-            # Add speak button for DM messages
-            self.speak_btn = QPushButton("🔊TTS")
-            self.speak_btn.setMinimumWidth(120)
-            self.speak_btn.setStyleSheet("font-size: 20px;")
-            self.speak_btn.clicked.connect(lambda: self.speak_text(text))
-            layout.addWidget(self.speak_btn)
-            
-            self.stop_btn = QPushButton("Stop")
-            self.stop_btn.setMinimumWidth(60)
-            layout.addWidget(self.stop_btn)
-            self.stop_btn.clicked.connect(self.stop_speaking)
-            
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: #FFE0B2;
-                    border: 2px solid #325FAD;
-                }
-                QTextEdit {
-                    color: #203D72;
-                    background-color: transparent;
-                    border: none;
-                    font-size: 16px;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: #FFE0B2;
-                    border: 2px solid #203D72;
-                }
-                QTextEdit {
-                    color: #203D72;
-                    background-color: transparent;
-                    border: none;
-                    font-size: 14px;
-                }
-            """)
-        
-        self.setLayout(layout)
-        
-    def speak_text(self, text):
-        main_window = self.parentWidget().parentWidget().parentWidget().parentWidget()
-        if main_window:
-            main_window.game_manager.tts_manager.speak(text)
-        else:
-            print("Could not access main window to get game manager!")
-    
-    def stop_speaking(self):
-        main_window = self.parentWidget().parentWidget().parentWidget().parentWidget()
-        if main_window:
-            main_window.game_manager.tts_manager.stop_speaking()
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton
+from .game_log import GameLogView
 
 class PlayTab(QWidget):
     def __init__(self, game_manager):
@@ -79,13 +11,13 @@ class PlayTab(QWidget):
         layout = QVBoxLayout()
         
         # Game log area
-        scroll = QScrollArea()
-        log_container = QWidget()
-        self.log_layout = QVBoxLayout(log_container)
-        log_container.setLayout(self.log_layout)
-        scroll.setWidget(log_container)
-        scroll.setWidgetResizable(True)
-        scroll.setMinimumHeight(600)
+        self.log_view = GameLogView()
+        self.log_view.setMinimumHeight(600)
+        delegate = self.log_view.log_delegate
+        delegate.set_entry_style('dm', '#FFE0B2', '#325FAD', '#203D72', 'Poppins', 16)
+        delegate.set_entry_style('normal', '#FFE0B2', '#203D72', '#203D72', 'Poppins', 14)
+        delegate.set_action("🔊TTS")
+        self.log_view.action_clicked.connect(lambda record: self.game_manager.tts_manager.speak(record.text))
         
         # Input area at bottom
         input_area = QVBoxLayout()  # Changed to VBoxLayout
@@ -112,19 +44,13 @@ class PlayTab(QWidget):
         input_area.addWidget(self.roll_btn)        
         
         # Add everything to main layout
-        layout.addWidget(scroll, stretch=4)
+        layout.addWidget(self.log_view, stretch=4)
         layout.addLayout(input_area, stretch=1)
         self.setLayout(layout)
 
     def add_log_entry(self, text: str, entry_type: str = "normal"):
-        entry = LogEntry(text, entry_type)
-        self.log_layout.addWidget(entry)
-        # Auto scroll to bottom
-        QApplication.processEvents()
-        scroll_area = entry.parent().parent()
-        if isinstance(scroll_area, QScrollArea):
-            vsb = scroll_area.verticalScrollBar()
-            vsb.setValue(vsb.maximum())
+        self.log_view.log_model.append(text, is_dm=entry_type == "dm")
+        self.log_view.scroll_to_end()
         
     def send_action(self):
         """Send player action to DM"""
@@ -2,10 +2,11 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                            QLineEdit, QPushButton, QGroupBox, QFormLayout,
                            QComboBox, QMessageBox, QTextEdit)
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5 import uic  # Add this import
+from .ui_loader import load_ui
 from dotenv import load_dotenv, set_key, find_dotenv
 import os
 import dotenv
+from .workers import TaskRunner
 
 class SettingsTab(QWidget):  # Renamed from ModelsTab
     def __init__(self, game_manager):
@@ -24,7 +25,7 @@ class SettingsTab(QWidget):  # Renamed from ModelsTab
         ]
         
         # Load UI first
-        uic.loadUi('current/ui/designer/settings_tab.ui', self)
+        load_ui(self, 'settings_tab')
         
         # Create secure input fields
         self.env_fields = {}
@@ -67,6 +68,8 @@ class SettingsTab(QWidget):  # Renamed from ModelsTab
         self.speak_btn.clicked.connect(self.test_voice)
         self.stop_btn.clicked.connect(self.toggle_volume)
         self.saveTTSBtn.clicked.connect(self.save_tts_settings)
+        self.modelFilterEdit.textChanged.connect(self.filter_models)
+        self.freeOnlyCheck.toggled.connect(lambda _: self.filter_models(self.modelFilterEdit.text()))
         
         # Connect TTS signals
         self.tts_manager.speech_started.connect(self.on_speech_started)
@@ -76,6 +79,7 @@ class SettingsTab(QWidget):  # Renamed from ModelsTab
         self.update_button_states()
         
         # Load data
+        self.task_runner = TaskRunner(self)
         self.load_current_env()
         self.load_existing_models()
         self.apply_styles()
@@ -387,22 +391,41 @@ class SettingsTab(QWidget):  # Renamed from ModelsTab
             QMessageBox.warning(self, "Error", f"Failed to save TTS settings: {str(e)}")
 
     def load_available_models(self):
-        models = self.game_manager.list_available_models()
-        self.dm_combo.addItems(models)
-        for combo in self.npc_combos:
+        self.populate_model_combos(self.game_manager.list_available_models())
+            
+    def populate_model_combos(self, models):
+        """Replace the combo items, keeping each combo's current selection"""
+        for combo in [self.dm_combo] + self.npc_combos:
+            current = combo.currentText()
+            combo.blockSignals(True)
+            combo.clear()
             combo.addItems(models)
+            if current and current not in models:
+                combo.insertItem(0, current)
+            if current:
+                combo.setCurrentText(current)
+            combo.blockSignals(False)
             
     def filter_models(self, text):
-        # TODO: Implement model filtering
-        pass
+        """Narrow the model combos to ids/names matching the filter text"""
+        models = self.game_manager.filter_models(text, free_only=self.freeOnlyCheck.isChecked())
+        self.populate_model_combos(models)
+        
+    def refresh_models(self, force=False):
+        """Refresh the catalog off the GUI thread; combos update when it changes"""
+        self.task_runner.submit(
+            self.game_manager.refresh_model_catalog, force,
+            on_result=self.on_models_refreshed
+        )
+        
+    def on_models_refreshed(self, changed):
+        if changed:
+            self.filter_models(self.modelFilterEdit.text())
         
     def load_existing_models(self):
         """Load current model settings"""
-        # Load available models first
-        models = self.game_manager.list_available_models()
-        self.dm_combo.addItems(models)
-        for combo in self.npc_combos:
-            combo.addItems(models)
+        # Served from the on-disk catalog, so this never waits on the network
+        self.load_available_models()
         
         # Set current selections
         dm_model = self.game_manager.get_dm_model()
@@ -413,6 +436,8 @@ class SettingsTab(QWidget):  # Renamed from ModelsTab
             npc_model = self.game_manager.get_npc_model(i)
             if npc_model:
                 combo.setCurrentText(npc_model)
+        
+        self.refresh_models()
 
     def save_dm_model(self):
         """Save DM model only"""
@@ -0,0 +1,64 @@
+import os
+import sys
+import importlib.util
+from typing import Dict
+from PyQt5 import uic
+from PyQt5.QtWidgets import QWidget
+
+UI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'designer')
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'cache', 'ui')
+
+_modules: Dict[str, object] = {}
+
+
+def compile_ui(name: str) -> str:
+    """Compile designer/<name>.ui to cache/ui/<name>_ui.py unless the cached copy is current"""
+    ui_path = os.path.join(UI_DIR, f"{name}.ui")
+    py_path = os.path.join(CACHE_DIR, f"{name}_ui.py")
+    if os.path.exists(py_path) and os.path.getmtime(py_path) >= os.path.getmtime(ui_path):
+        return py_path
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{py_path}.{os.getpid()}.tmp"
+    with open(ui_path, 'r', encoding='utf-8') as ui_file, open(tmp_path, 'w', encoding='utf-8') as py_file:
+        uic.compileUi(ui_file, py_file)
+    os.replace(tmp_path, py_path)
+    return py_path
+
+
+def _module(name: str):
+    if name not in _modules:
+        py_path = compile_ui(name)
+        spec = importlib.util.spec_from_file_location(f"_ui_cache.{name}_ui", py_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[name] = module
+    return _modules[name]
+
+
+def load_ui(widget: QWidget, name: str):
+    """Drop-in for uic.loadUi(designer/<name>.ui, widget) backed by the compiled module.
+
+    The .ui file is compiled to Python once (and again only when it changes),
+    so startup imports cached bytecode instead of parsing XML for every tab.
+    Child widgets end up as attributes of widget, as with uic.loadUi.
+    """
+    module = _module(name)
+    ui_class = next(getattr(module, attr) for attr in dir(module) if attr.startswith('Ui_'))
+    ui = ui_class()
+    ui.setupUi(widget)
+    for attr, value in vars(ui).items():
+        setattr(widget, attr, value)
+    return ui
+
+
+def main():
+    """Precompile every .ui file, e.g. as part of packaging"""
+    for filename in sorted(os.listdir(UI_DIR)):
+        if filename.endswith('.ui'):
+            print(compile_ui(os.path.splitext(filename)[0]))
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    main()
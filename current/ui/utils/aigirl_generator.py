@@ -125,9 +125,8 @@ def generate_image(prompt: str, save_path: str) -> str:
     """Synchronous wrapper for generate_image_async"""
     try:
         print(f"Starting image generation with prompt: {prompt}")
-        result = asyncio.get_event_loop().run_until_complete(
-            generate_image_async(prompt, save_path)
-        )
+        # asyncio.run creates a fresh loop, so this also works from worker threads
+        result = asyncio.run(generate_image_async(prompt, save_path))
         print(f"Image generation completed: {result}")
         return result
     except Exception as e:
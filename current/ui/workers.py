@@ -0,0 +1,124 @@
+import time
+import threading
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from metrics import note_queue_wait
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by a Worker; delivered on the GUI thread via queued connections"""
+    progress = pyqtSignal(object)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """Runs a blocking callable on the thread pool and reports back through signals"""
+
+    def __init__(self, fn, *args, with_progress: bool = False, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+        self.created_at = time.perf_counter()
+        # The Python side owns the object; keep Qt from deleting it under us
+        self.setAutoDelete(False)
+
+        if with_progress:
+            self.kwargs['progress_callback'] = self.report_progress
+
+    def cancel(self):
+        """Request cancellation; a job that has not started never runs, one in flight should raise"""
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def report_progress(self, value):
+        """Forward progress to the GUI thread (no-op once cancelled)"""
+        if not self._cancelled.is_set():
+            self.signals.progress.emit(value)
+
+    def run(self):
+        try:
+            if self._cancelled.is_set():
+                self.signals.cancelled.emit()
+                return
+
+            # Queue wait is attributed to the first instrumented call in fn
+            note_queue_wait(time.perf_counter() - self.created_at)
+            result = self.fn(*self.args, **self.kwargs)
+
+            # fn returning means the job ran to completion (a turn that got past its
+            # last cancellation check is already committed), so deliver it even if
+            # cancel() arrived late; cancelling only wins when fn bailed out by raising
+            self.signals.result.emit(result)
+        except Exception as e:
+            if self._cancelled.is_set():
+                self.signals.cancelled.emit()
+            else:
+                traceback.print_exc()
+                self.signals.error.emit(str(e))
+        finally:
+            self.signals.finished.emit()
+
+
+class TaskRunner(QObject):
+    """Submits Workers to the shared thread pool and tracks which are in flight"""
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool.globalInstance()
+        self.active = set()
+
+    def is_busy(self) -> bool:
+        return bool(self.active)
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_progress=None,
+               on_cancelled=None, on_finished=None, **kwargs) -> Worker:
+        """Run fn(*args, **kwargs) off the GUI thread.
+
+        When on_progress is given, fn receives a progress_callback keyword it can
+        call from the worker thread; values arrive at on_progress on the GUI thread.
+        """
+        worker = Worker(fn, *args, with_progress=on_progress is not None, **kwargs)
+        if on_result:
+            worker.signals.result.connect(on_result)
+        if on_error:
+            worker.signals.error.connect(on_error)
+        if on_progress:
+            worker.signals.progress.connect(on_progress)
+        if on_cancelled:
+            worker.signals.cancelled.connect(on_cancelled)
+        if on_finished:
+            worker.signals.finished.connect(on_finished)
+        worker.signals.finished.connect(lambda: self._on_worker_finished(worker))
+
+        was_busy = self.is_busy()
+        self.active.add(worker)
+        if not was_busy:
+            self.busy_changed.emit(True)
+        self.pool.start(worker)
+        return worker
+
+    def cancel(self, worker: Worker):
+        """Cancel a worker; if it has not started yet, pull it off the queue"""
+        worker.cancel()
+        if self.pool.tryTake(worker):
+            # Never ran, so it will not emit finished by itself
+            worker.signals.cancelled.emit()
+            worker.signals.finished.emit()
+
+    def cancel_all(self):
+        for worker in list(self.active):
+            self.cancel(worker)
+
+    def _on_worker_finished(self, worker: Worker):
+        self.active.discard(worker)
+        if not self.active:
+            self.busy_changed.emit(False)